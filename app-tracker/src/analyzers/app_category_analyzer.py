@@ -4,15 +4,25 @@
 """
 
 import json
-from typing import Dict, List, Tuple
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict, Counter
 from datetime import datetime
 
 
+# 사용자 지정 분류 저장 위치 (app-tracker/config)
+DEFAULT_OVERRIDES_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "app_category_overrides.json"
+
+
 class AppCategoryAnalyzer:
     """앱을 카테고리별로 분류하고 사용 패턴을 분석하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, overrides_path: Optional[str] = None):
+        """
+        Args:
+            overrides_path: 사용자 지정 분류 JSON 경로. None이면 app-tracker/config/app_category_overrides.json
+        """
         # 앱 카테고리 매핑 (번들 ID 기반)
         self.category_mapping = {
             # 개발 도구
@@ -82,23 +92,140 @@ class AppCategoryAnalyzer:
             'system': ['finder', 'activity', 'console', 'preferences', 'calculator', 'textedit'],
             'gaming': ['steam', 'epic', 'blizzard', 'riot', 'game']
         }
+        
+        # 사용자 지정 분류 (번들 ID / 앱 이름 기준, 기본 규칙보다 우선)
+        self.overrides_path = Path(overrides_path) if overrides_path else DEFAULT_OVERRIDES_PATH
+        self.overrides = self._load_overrides()
+        
+        self.rebuild_index()
+    
+    def rebuild_index(self):
+        """category_mapping / name_keywords를 조회용 구조로 컴파일
+        
+        매핑을 직접 수정한 뒤에는 이 메서드를 다시 호출해야 한다.
+        """
+        # 번들 ID → 카테고리 해시 인덱스 (기존 규칙처럼 먼저 나온 카테고리가 우선)
+        self._bundle_index: Dict[str, str] = {}
+        for category, bundle_ids in self.category_mapping.items():
+            for bundle_id in bundle_ids:
+                self._bundle_index.setdefault(bundle_id, category)
+        
+        # 모든 이름 키워드를 하나의 정규식으로 컴파일
+        # 카테고리 순서대로 나열하고 lookahead로 모든 시작 위치를 검사하므로
+        # 위치마다 우선순위가 가장 높은 키워드가 잡히고, 그중 최솟값이 기존 루프의 결과와 같다
+        self._category_order = list(self.name_keywords.keys())
+        self._keyword_rank: Dict[str, int] = {}
+        for rank, category in enumerate(self._category_order):
+            for keyword in self.name_keywords[category]:
+                self._keyword_rank.setdefault(keyword.lower(), rank)
+        
+        keywords = sorted(self._keyword_rank, key=lambda k: self._keyword_rank[k])
+        self._keyword_pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))'
+        ) if keywords else None
+        
+        self._cache: Dict[Tuple[str, str], str] = {}
+    
+    def _load_overrides(self) -> Dict[str, Dict[str, str]]:
+        """저장된 사용자 지정 분류 로드"""
+        overrides = {'bundle_ids': {}, 'app_names': {}}
+        if self.overrides_path.exists():
+            try:
+                with open(self.overrides_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                overrides['bundle_ids'].update(saved.get('bundle_ids', {}))
+                overrides['app_names'].update(saved.get('app_names', {}))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 사용자 지정 분류를 읽을 수 없습니다: {e}")
+        return overrides
+    
+    def _save_overrides(self):
+        self.overrides_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.overrides_path, 'w', encoding='utf-8') as f:
+            json.dump(self.overrides, f, indent=2, ensure_ascii=False)
+    
+    def set_override(self, category: str, bundle_id: Optional[str] = None, app_name: Optional[str] = None):
+        """사용자 지정 분류 추가 후 저장 (번들 ID 또는 앱 이름 중 하나 이상 필요)"""
+        if not bundle_id and not app_name:
+            raise ValueError("bundle_id 또는 app_name 중 하나는 지정해야 합니다")
+        
+        if bundle_id:
+            self.overrides['bundle_ids'][bundle_id] = category
+        if app_name:
+            self.overrides['app_names'][app_name.lower()] = category
+        
+        self._save_overrides()
+        self._cache.clear()
+    
+    def remove_override(self, bundle_id: Optional[str] = None, app_name: Optional[str] = None):
+        """사용자 지정 분류 삭제 후 저장"""
+        if bundle_id:
+            self.overrides['bundle_ids'].pop(bundle_id, None)
+        if app_name:
+            self.overrides['app_names'].pop(app_name.lower(), None)
+        
+        self._save_overrides()
+        self._cache.clear()
     
     def categorize_app(self, bundle_id: str, app_name: str) -> str:
-        """앱을 카테고리로 분류"""
+        """앱을 카테고리로 분류 (결과는 (bundle_id, app_name)별로 메모이즈)"""
+        key = (bundle_id, app_name)
+        category = self._cache.get(key)
+        if category is None:
+            category = self._classify(bundle_id, app_name)
+            self._cache[key] = category
+        return category
+    
+    def _classify(self, bundle_id: str, app_name: str) -> str:
+        app_name_lower = (app_name or '').lower()
+        
+        # 사용자 지정 분류 (최우선)
+        override = self.overrides['bundle_ids'].get(bundle_id) or self.overrides['app_names'].get(app_name_lower)
+        if override:
+            return override
+        
         # 번들 ID 기반 분류 (우선순위)
-        for category, bundle_ids in self.category_mapping.items():
-            if bundle_id in bundle_ids:
-                return category
+        category = self._bundle_index.get(bundle_id)
+        if category:
+            return category
         
         # 앱 이름 기반 분류 (번들 ID 매칭 실패 시)
-        app_name_lower = app_name.lower()
-        for category, keywords in self.name_keywords.items():
-            for keyword in keywords:
-                if keyword in app_name_lower:
-                    return category
+        if self._keyword_pattern is not None:
+            best_rank = None
+            for match in self._keyword_pattern.finditer(app_name_lower):
+                rank = self._keyword_rank[match.group(1)]
+                if best_rank is None or rank < best_rank:
+                    best_rank = rank
+                    if rank == 0:
+                        break
+            if best_rank is not None:
+                return self._category_order[best_rank]
         
         return 'other'  # 분류되지 않은 앱
     
+    def annotate_records(self, records: List[Dict]) -> List[Dict]:
+        """카테고리가 없는 레코드에만 'category'를 채움 (이미 분류된 레코드는 건너뜀)"""
+        for record in records:
+            if 'category' not in record:
+                record['category'] = self.categorize_app(
+                    record.get('bundle_id', 'Unknown'), record.get('app_name', 'Unknown')
+                )
+        return records
+    
+    def analyze_all(self, app_data: Dict) -> Dict:
+        """실행 중인 앱 / 사용 패턴 / 생산성 분석을 한 번에 수행
+        
+        레코드당 분류는 한 번만 하고, 리포트와 요약은 이 결과를 재사용한다.
+        """
+        running_apps = self.annotate_records(app_data.get('running_apps', []))
+        app_history = self.annotate_records(app_data.get('app_history', []))
+        
+        return {
+            'running_apps': self.analyze_running_apps(running_apps),
+            'usage_patterns': self.analyze_usage_patterns(app_history),
+            'productivity_score': self.analyze_productivity_score(running_apps, app_history)
+        }
+    
     def analyze_running_apps(self, running_apps: List[Dict]) -> Dict:
         """실행 중인 앱들을 카테고리별로 분석"""
         category_stats = defaultdict(list)
@@ -107,7 +234,7 @@ class AppCategoryAnalyzer:
         for app in running_apps:
             bundle_id = app.get('bundle_id', 'Unknown')
             app_name = app.get('app_name', 'Unknown')
-            category = self.categorize_app(bundle_id, app_name)
+            category = app.get('category') or self.categorize_app(bundle_id, app_name)
             
             category_stats[category].append({
                 'app_name': app_name,
@@ -137,7 +264,7 @@ class AppCategoryAnalyzer:
             duration = record.get('duration_minutes', 0)
             timestamp = record.get('timestamp', '')
             
-            category = self.categorize_app(bundle_id, app_name)
+            category = record.get('category') or self.categorize_app(bundle_id, app_name)
             
             # 사용 시간 및 빈도 누적
             category_usage[category] += duration
@@ -177,7 +304,7 @@ class AppCategoryAnalyzer:
         
         if total_running > 0:
             for app in running_apps:
-                category = self.categorize_app(app.get('bundle_id', ''), app.get('app_name', ''))
+                category = app.get('category') or self.categorize_app(app.get('bundle_id', ''), app.get('app_name', ''))
                 weight = productivity_weights.get(category, 0.5)
                 running_score += weight
             running_score = (running_score / total_running) * 100
@@ -187,7 +314,7 @@ class AppCategoryAnalyzer:
         total_usage_time = 0
         
         for record in app_history:
-            category = self.categorize_app(record.get('bundle_id', ''), record.get('app_name', ''))
+            category = record.get('category') or self.categorize_app(record.get('bundle_id', ''), record.get('app_name', ''))
             duration = record.get('duration_minutes', 0)
             weight = productivity_weights.get(category, 0.5)
             
@@ -205,14 +332,19 @@ class AppCategoryAnalyzer:
             'productivity_weights': productivity_weights
         }
     
-    def generate_category_report(self, app_data: Dict) -> str:
-        """카테고리 분석 리포트 생성"""
-        running_analysis = self.analyze_running_apps(app_data.get('running_apps', []))
-        usage_analysis = self.analyze_usage_patterns(app_data.get('app_history', []))
-        productivity = self.analyze_productivity_score(
-            app_data.get('running_apps', []), 
-            app_data.get('app_history', [])
-        )
+    def generate_category_report(self, app_data: Dict, analysis: Optional[Dict] = None) -> str:
+        """카테고리 분석 리포트 생성
+        
+        Args:
+            app_data: 수집된 앱 데이터
+            analysis: analyze_all() 결과. 주어지면 분석을 다시 하지 않고 재사용
+        """
+        if analysis is None:
+            analysis = self.analyze_all(app_data)
+        
+        running_analysis = analysis['running_apps']
+        usage_analysis = analysis['usage_patterns']
+        productivity = analysis['productivity_score']
         
         report_lines = [
             "=" * 60,
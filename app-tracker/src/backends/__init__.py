@@ -0,0 +1,30 @@
+"""
+플랫폼 백엔드 - 실행 중인 앱 열거, 포커스 이벤트 소스, 프로세스 샘플러를 제공
+플랫폼 바인딩(PyObjC, psutil)은 백엔드를 실제로 만들 때만 import 한다
+"""
+
+import os
+import sys
+
+from .base import PlatformBackend
+
+__all__ = ['PlatformBackend', 'get_backend']
+
+
+def get_backend(name: str = None) -> PlatformBackend:
+    """플랫폼 백엔드 생성
+
+    Args:
+        name: 'macos' 또는 'linux'. None이면 APP_TRACKER_BACKEND 환경 변수, 그다음 현재 플랫폼으로 결정
+    """
+    if name is None:
+        name = os.environ.get('APP_TRACKER_BACKEND') or ('macos' if sys.platform == 'darwin' else 'linux')
+
+    if name == 'macos':
+        from .macos import MacOSBackend
+        return MacOSBackend()
+    if name == 'linux':
+        from .linux import LinuxBackend
+        return LinuxBackend()
+
+    raise ValueError(f"지원하지 않는 백엔드입니다: {name}")
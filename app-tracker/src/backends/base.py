@@ -0,0 +1,31 @@
+"""
+플랫폼 백엔드 인터페이스
+"""
+
+from typing import Callable, Optional
+
+from collectors.app_snapshot import RunningAppsSnapshot
+from collectors.focus_tracker import FocusEventSource
+from collectors.process_sampler import ProcessSampler
+
+
+class PlatformBackend:
+    """앱 추적기가 플랫폼에 의존하는 부분을 모은 인터페이스"""
+
+    platform = 'unknown'
+
+    def take_snapshot(self, categorize: Optional[Callable[[str, str], str]] = None) -> RunningAppsSnapshot:
+        """실행 중인 앱 스냅샷"""
+        raise NotImplementedError
+
+    def create_focus_source(self, use_notifications: bool = True) -> FocusEventSource:
+        """앱 활성화 이벤트 소스"""
+        raise NotImplementedError
+
+    def create_process_sampler(self) -> ProcessSampler:
+        """프로세스 CPU 샘플러 (psutil은 여기서 처음 import 됨)"""
+        return ProcessSampler()
+
+    def idle_seconds(self) -> Optional[float]:
+        """마지막 사용자 입력 이후 경과 초. 알 수 없으면 None"""
+        return None
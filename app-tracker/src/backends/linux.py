@@ -0,0 +1,119 @@
+"""
+Linux 대체 백엔드
+개발/테스트 환경에서 macOS 없이 추적기 전체 경로를 실행하기 위한 백엔드.
+현재 사용자의 최상위 프로세스를 '앱'으로 보고, xdotool이 있으면 활성 창을 폴링한다
+"""
+
+import getpass
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from collectors.app_snapshot import RunningAppsSnapshot
+from collectors.focus_tracker import FocusEventSource
+
+from .base import PlatformBackend
+
+
+class ActiveWindowPoller(FocusEventSource):
+    """xdotool로 활성 창의 pid를 확인해서 바뀐 경우에만 이벤트를 만드는 폴러 (X11 전용)"""
+
+    def __init__(self):
+        self._xdotool = shutil.which('xdotool')
+        self._last_pid = None
+
+    def poll(self, timeout: float = 0.0) -> List[Dict]:
+        if self._xdotool is None:
+            return []
+
+        try:
+            result = subprocess.run(
+                [self._xdotool, 'getactivewindow', 'getwindowpid'],
+                capture_output=True, text=True, timeout=1
+            )
+            pid = int(result.stdout.strip())
+        except (subprocess.SubprocessError, ValueError):
+            return []
+
+        if pid == self._last_pid:
+            return []
+        self._last_pid = pid
+
+        name = _process_name(pid) or 'Unknown'
+        return [{
+            'timestamp': time.time(),
+            'bundle_id': f"linux.{name}",
+            'app_name': name,
+            'pid': pid
+        }]
+
+
+def _process_name(pid: int) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/comm", encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class LinuxBackend(PlatformBackend):
+    """psutil 기반 대체 백엔드"""
+
+    platform = 'Linux'
+
+    def __init__(self):
+        self.username = getpass.getuser()
+        self._xprintidle = shutil.which('xprintidle')
+
+    def take_snapshot(self, categorize: Optional[Callable[[str, str], str]] = None) -> RunningAppsSnapshot:
+        import psutil
+
+        snapshot = RunningAppsSnapshot([])
+        timestamp = snapshot.taken_at.isoformat()
+
+        # 현재 사용자 프로세스 중 부모와 이름이 같은 헬퍼 프로세스는 제외
+        processes = {}
+        for process in psutil.process_iter(['pid', 'ppid', 'name', 'username', 'create_time', 'exe']):
+            info = process.info
+            # exe가 없는 커널 스레드 제외
+            if info['username'] == self.username and info['name'] and info['exe']:
+                processes[info['pid']] = info
+
+        for pid, info in processes.items():
+            parent = processes.get(info['ppid'])
+            if parent is not None and parent['name'] == info['name']:
+                continue
+
+            launch_timestamp = info['create_time']
+            app_info = {
+                'bundle_id': f"linux.{info['name']}",
+                'app_name': info['name'],
+                'pid': pid,
+                'is_active': False,
+                'is_frontmost': False,
+                'launch_date': datetime.fromtimestamp(launch_timestamp).isoformat() if launch_timestamp else None,
+                'launch_timestamp': launch_timestamp,
+                'timestamp': timestamp,
+                'app_path': info['exe']
+            }
+            if categorize:
+                app_info['category'] = categorize(app_info['bundle_id'], app_info['app_name'])
+            snapshot.apps.append(app_info)
+
+        return snapshot
+
+    def create_focus_source(self, use_notifications: bool = True) -> FocusEventSource:
+        # Linux에는 활성화 알림이 없으므로 항상 폴러 사용
+        return ActiveWindowPoller()
+
+    def idle_seconds(self) -> Optional[float]:
+        # xprintidle은 마지막 입력 후 경과 시간을 밀리초로 출력 (X11 전용)
+        if self._xprintidle is None:
+            return None
+        try:
+            result = subprocess.run([self._xprintidle], capture_output=True, text=True, timeout=1)
+            return int(result.stdout.strip()) / 1000
+        except (subprocess.SubprocessError, ValueError):
+            return None
@@ -0,0 +1,44 @@
+"""
+macOS 백엔드
+AppKit/Foundation(PyObjC)은 백엔드 생성 시점에 처음 import 된다
+"""
+
+from typing import Callable, Optional
+
+from collectors.app_snapshot import RunningAppsSnapshot
+from collectors.focus_tracker import FocusEventSource, FrontmostAppPoller, NSWorkspaceActivationSource
+
+from .base import PlatformBackend
+
+
+class MacOSBackend(PlatformBackend):
+    """NSWorkspace 기반 백엔드"""
+
+    platform = 'macOS'
+
+    def __init__(self):
+        try:
+            from AppKit import NSWorkspace
+        except ImportError as e:
+            raise ImportError(
+                f"macOS 전용 라이브러리를 가져올 수 없습니다: {e}\n"
+                "pip install pyobjc-framework-Cocoa pyobjc-framework-ApplicationServices psutil"
+            ) from e
+
+        self.workspace = NSWorkspace.sharedWorkspace()
+
+    def take_snapshot(self, categorize: Optional[Callable[[str, str], str]] = None) -> RunningAppsSnapshot:
+        return RunningAppsSnapshot.from_workspace(self.workspace, categorize)
+
+    def create_focus_source(self, use_notifications: bool = True) -> FocusEventSource:
+        if use_notifications:
+            return NSWorkspaceActivationSource(self.workspace)
+        return FrontmostAppPoller(self.workspace)
+
+    def idle_seconds(self) -> Optional[float]:
+        try:
+            from Quartz import CGEventSourceSecondsSinceLastEventType, kCGEventSourceStateHIDSystemState
+        except ImportError:
+            return None
+        # kCGAnyInputEventType (~0)
+        return float(CGEventSourceSecondsSinceLastEventType(kCGEventSourceStateHIDSystemState, 0xFFFFFFFF))
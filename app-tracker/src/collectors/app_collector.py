@@ -1,31 +1,62 @@
 """
 macOS 앱 사용 데이터 수집기
-NSWorkspace와 psutil을 사용하여 실행중인 앱과 과거 사용 기록을 수집
+플랫폼 백엔드(NSWorkspace/psutil)를 사용하여 실행중인 앱과 과거 사용 기록을 수집
+
+PyObjC와 psutil은 백엔드가 실제로 필요할 때만 import 한다
 """
 
 import json
-import subprocess
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional
 import logging
 
-try:
-    import psutil
-    from Foundation import NSLog
-    from AppKit import NSWorkspace, NSRunningApplication
-except ImportError as e:
-    print(f"macOS 전용 라이브러리를 가져올 수 없습니다: {e}")
-    print("pip install pyobjc-framework-Cocoa pyobjc-framework-ApplicationServices psutil")
+from backends import PlatformBackend, get_backend
+from storage.catalog_hook import register_output
+
+from .focus_tracker import FocusTracker, interval_to_record
+from .process_sampler import ProcessSampler
+from .process_tree import ProcessTreeAggregator
+from .sampling_scheduler import SamplingScheduler
+from .app_snapshot import RunningAppsSnapshot
 
 
 class AppCollector:
     """macOS 앱 사용 데이터 수집 클래스"""
     
-    def __init__(self):
-        self.workspace = NSWorkspace.sharedWorkspace()
+    def __init__(self, focus_tracker: Optional[FocusTracker] = None,
+                 categorize: Optional[Callable[[str, str], str]] = None,
+                 backend: Optional[PlatformBackend] = None):
+        """
+        Args:
+            focus_tracker: 앱 활성화 이벤트를 기록 중인 추적 엔진. 없으면 앱 히스토리는 비어 있음
+            categorize: (bundle_id, app_name) -> 카테고리 함수. 주어지면 수집 시점에 레코드마다 한 번 분류
+            backend: 플랫폼 백엔드. None이면 현재 플랫폼 기본 백엔드
+        """
+        self.backend = backend or get_backend()
         self.logger = self._setup_logger()
+        self.focus_tracker = focus_tracker
+        self.categorize = categorize
+        self.process_sampler: Optional[ProcessSampler] = None
+        self.scheduler: Optional[SamplingScheduler] = None
+        self.process_tree = ProcessTreeAggregator()
+    
+    def create_focus_tracker(self, use_notifications: bool = True, **kwargs) -> FocusTracker:
+        """이 수집기에 연결된 포커스 추적 엔진 생성
+        
+        Args:
+            use_notifications: True면 NSWorkspace 활성화 알림, False면 frontmost 폴러 사용
+        """
+        source = self.backend.create_focus_source(use_notifications)
+        self.focus_tracker = FocusTracker(source, **kwargs)
+        return self.focus_tracker
+    
+    def create_scheduler(self, **kwargs) -> SamplingScheduler:
+        """백엔드의 유휴 시간 측정을 연결한 적응형 샘플링 스케줄러 생성"""
+        kwargs.setdefault('idle_seconds', self.backend.idle_seconds)
+        self.scheduler = SamplingScheduler(**kwargs)
+        return self.scheduler
         
     def _setup_logger(self):
         """로거 설정"""
@@ -39,28 +70,22 @@ class AppCollector:
         
         return logger
     
-    def get_running_apps(self) -> List[Dict]:
-        """현재 실행 중인 앱 목록 수집"""
+    def take_snapshot(self) -> RunningAppsSnapshot:
+        """실행 중인 앱을 한 번 열거해서 수집 1회 동안 공유할 스냅샷 생성"""
+        return self.backend.take_snapshot(self.categorize)
+    
+    def get_running_apps(self, snapshot: Optional[RunningAppsSnapshot] = None) -> List[Dict]:
+        """현재 실행 중인 앱 목록 수집
+        
+        Args:
+            snapshot: 이미 만든 스냅샷. None이면 새로 열거
+        """
         apps = []
-        current_time = datetime.now()
         
         try:
-            running_apps = self.workspace.runningApplications()
-            
-            for app in running_apps:
-                # 시스템 프로세스 제외
-                if app.activationPolicy() == 0:  # NSApplicationActivationPolicyRegular
-                    app_info = {
-                        'bundle_id': str(app.bundleIdentifier()) if app.bundleIdentifier() else 'Unknown',
-                        'app_name': str(app.localizedName()) if app.localizedName() else 'Unknown',
-                        'pid': int(app.processIdentifier()),
-                        'is_active': bool(app.isActive()),
-                        'is_frontmost': bool(app.isActive() and app.isFinishedLaunching()),
-                        'launch_date': app.launchDate().description() if app.launchDate() else None,
-                        'timestamp': current_time.isoformat(),
-                        'app_path': str(app.bundleURL().path()) if app.bundleURL() else None
-                    }
-                    apps.append(app_info)
+            if snapshot is None:
+                snapshot = self.take_snapshot()
+            apps = snapshot.apps
                     
         except Exception as e:
             self.logger.error(f"실행 중인 앱 수집 중 오류: {e}")
@@ -68,28 +93,29 @@ class AppCollector:
         self.logger.info(f"현재 실행 중인 앱 {len(apps)}개 수집 완료")
         return apps
     
-    def get_process_usage(self) -> List[Dict]:
-        """psutil을 사용한 프로세스 사용량 정보 수집"""
+    def get_process_usage(self, pids: Optional[List[int]] = None, include_children: bool = True,
+                          interval: float = 0.5, helper_names: Optional[List[str]] = None) -> List[Dict]:
+        """psutil을 사용한 프로세스 사용량 정보 수집
+        
+        Args:
+            pids: 샘플링할 앱 pid 목록. None이면 전체 프로세스
+            include_children: 앱의 하위(헬퍼) 프로세스 포함 여부
+            interval: 이전 샘플이 없을 때 기준 샘플과 측정 샘플 사이 간격(초)
+            helper_names: 앱 이름 목록. 부모가 launchd인 헬퍼('<앱 이름> Helper' 등)도 함께 샘플링
+        """
+        helper_names = helper_names or []
         processes = []
         
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'create_time']):
-                try:
-                    proc_info = proc.info
-                    # 앱과 관련된 프로세스만 필터링 (.app이 포함된 경로)
-                    if proc_info['name'] and not proc_info['name'].startswith('kernel'):
-                        process_data = {
-                            'pid': proc_info['pid'],
-                            'name': proc_info['name'],
-                            'cpu_percent': proc_info['cpu_percent'],
-                            'memory_percent': proc_info['memory_percent'],
-                            'create_time': datetime.fromtimestamp(proc_info['create_time']).isoformat(),
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        processes.append(process_data)
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            if self.process_sampler is None:
+                self.process_sampler = self.backend.create_process_sampler()
+            
+            # 이전 틱이 없으면 기준 샘플을 먼저 잡아야 CPU 사용률을 계산할 수 있음
+            if not self.process_sampler.has_baseline():
+                self.process_sampler.sample(pids, include_children, helper_names)
+                time.sleep(interval)
+            
+            processes = self.process_sampler.sample(pids, include_children, helper_names)
                     
         except Exception as e:
             self.logger.error(f"프로세스 사용량 수집 중 오류: {e}")
@@ -99,39 +125,33 @@ class AppCollector:
     
     def get_frontmost_app_history(self, minutes: int = 60) -> List[Dict]:
         """
-        최근 활성화된 앱 히스토리 수집 (시뮬레이션)
-        실제로는 백그라운드 모니터링이 필요하지만, 현재 상태를 기반으로 샘플 데이터 생성
+        최근 활성화된 앱 히스토리 수집
+        포커스 추적 엔진이 기록한 실제 (앱, 시작, 끝) 구간을 반환
         """
-        history = []
-        current_time = datetime.now()
+        if self.focus_tracker is None:
+            self.logger.warning("포커스 추적 엔진이 없어 앱 히스토리를 기록하지 않습니다")
+            return []
         
+        history = []
         try:
-            # 현재 활성 앱 정보
-            frontmost_app = self.workspace.frontmostApplication()
-            if frontmost_app:
-                # 최근 1시간 동안의 사용 패턴을 시뮬레이션
-                for i in range(0, minutes, 5):  # 5분 간격으로 기록
-                    timestamp = current_time - timedelta(minutes=i)
-                    
-                    app_record = {
-                        'bundle_id': str(frontmost_app.bundleIdentifier()) if frontmost_app.bundleIdentifier() else 'Unknown',
-                        'app_name': str(frontmost_app.localizedName()) if frontmost_app.localizedName() else 'Unknown',
-                        'timestamp': timestamp.isoformat(),
-                        'duration_minutes': 5,  # 5분간 사용으로 가정
-                        'is_active': True,
-                        'window_title': None  # 향후 확장 가능
-                    }
-                    history.append(app_record)
-                    
+            since = time.time() - minutes * 60
+            history = [interval_to_record(interval)
+                       for interval in self.focus_tracker.get_intervals(since=since)]
+            if self.categorize:
+                for record in history:
+                    record['category'] = self.categorize(record['bundle_id'], record['app_name'])
         except Exception as e:
             self.logger.error(f"앱 히스토리 수집 중 오류: {e}")
             
-        self.logger.info(f"앱 사용 히스토리 {len(history)}개 기록 생성")
+        self.logger.info(f"앱 사용 히스토리 {len(history)}개 구간 수집")
         return history
     
-    def get_app_usage_stats(self) -> Dict:
+    def get_app_usage_stats(self, snapshot: Optional[RunningAppsSnapshot] = None) -> Dict:
         """
         macOS 시스템 로그에서 앱 사용 통계 수집 시도
+        
+        Args:
+            snapshot: 이미 만든 스냅샷. None이면 새로 열거
         """
         stats = {
             'daily_app_launches': {},
@@ -142,14 +162,14 @@ class AppCollector:
         
         try:
             # 실행 중인 앱들의 실행 시간 계산
-            running_apps = self.get_running_apps()
+            if snapshot is None:
+                snapshot = self.take_snapshot()
             
-            for app in running_apps:
-                if app['launch_date']:
+            for app in snapshot.apps:
+                if app['launch_timestamp']:
                     app_name = app['app_name']
-                    # 실행 시간 계산 (시뮬레이션)
-                    launch_time = datetime.fromisoformat(app['launch_date'].replace(' +0000', ''))
-                    running_time = (datetime.now() - launch_time).total_seconds() / 60  # 분 단위
+                    # 실행 시간 계산 (실행 후 경과 시간)
+                    running_time = (snapshot.taken_at_epoch - app['launch_timestamp']) / 60  # 분 단위
                     
                     stats['total_usage_time'][app_name] = round(running_time, 2)
                     stats['daily_app_launches'][app_name] = stats['daily_app_launches'].get(app_name, 0) + 1
@@ -170,18 +190,38 @@ class AppCollector:
     def collect_all_data(self) -> Dict:
         """모든 앱 데이터를 수집하여 통합 딕셔너리로 반환"""
         self.logger.info("앱 데이터 수집 시작...")
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        
+        # runningApplications() 열거와 브리지 변환은 수집 1회당 한 번만
+        snapshot = self.take_snapshot()
+        running_apps = self.get_running_apps(snapshot)
+        # 실행 중인 앱과 그 하위 프로세스, launchd 아래의 앱 헬퍼만 샘플링
+        process_usage = self.get_process_usage(snapshot.pids(),
+                                               helper_names=[app['app_name'] for app in running_apps])
         
         data = {
             'collection_info': {
                 'timestamp': datetime.now().isoformat(),
                 'collector': 'AppCollector',
-                'platform': 'macOS',
+                'platform': self.backend.platform,
                 'version': '1.0.0'
             },
-            'running_apps': self.get_running_apps(),
-            'process_usage': self.get_process_usage(),
+            'running_apps': running_apps,
+            'process_usage': process_usage,
+            # 헬퍼 프로세스 사용량을 소유 앱으로 귀속시킨 앱별 비용
+            'app_resource_usage': self.process_tree.aggregate(process_usage, running_apps),
             'app_history': self.get_frontmost_app_history(60),  # 최근 1시간
-            'usage_stats': self.get_app_usage_stats()
+            'usage_stats': self.get_app_usage_stats(snapshot)
+        }
+        
+        # 추적기 자신의 비용 - 이번 수집 1회와 (있으면) 실시간 추적 구간
+        data['tracker_overhead'] = {
+            'collection': {
+                'cpu_seconds': round(time.process_time() - cpu_start, 4),
+                'wall_seconds': round(time.perf_counter() - wall_start, 4)
+            },
+            'tracking': self.scheduler.overhead() if self.scheduler else None
         }
         
         self.logger.info("앱 데이터 수집 완료!")
@@ -200,6 +240,7 @@ class AppCollector:
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             
+            register_output(str(filepath), rows=len(data.get('running_apps', [])))
             self.logger.info(f"앱 사용 데이터가 저장되었습니다: {filepath}")
             return str(filepath)
             
@@ -0,0 +1,91 @@
+"""
+실행 중인 앱 스냅샷
+한 번의 수집 동안 runningApplications()를 한 번만 열거하고
+PyObjC 브리지 속성을 한 번에 파이썬 값으로 변환해서 모든 소비자가 공유
+
+이 모듈은 PyObjC를 import 하지 않으며 workspace 객체는 백엔드가 넘겨준다
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# NSApplicationActivationPolicyRegular
+ACTIVATION_POLICY_REGULAR = 0
+
+
+class RunningAppsSnapshot:
+    """수집 1회분의 실행 중인 앱 목록"""
+
+    def __init__(self, apps: List[Dict], taken_at: Optional[datetime] = None,
+                 taken_at_epoch: Optional[float] = None):
+        """
+        Args:
+            apps: 앱 레코드 목록 (백엔드가 만든 파이썬 dict)
+            taken_at: 스냅샷 시각. None이면 현재 시각
+        """
+        self.taken_at_epoch = taken_at_epoch if taken_at_epoch is not None else time.time()
+        self.taken_at = taken_at or datetime.fromtimestamp(self.taken_at_epoch)
+        self.apps = apps
+
+    @classmethod
+    def from_workspace(cls, workspace, categorize: Optional[Callable[[str, str], str]] = None) -> 'RunningAppsSnapshot':
+        """NSWorkspace에서 스냅샷 생성
+
+        Args:
+            workspace: NSWorkspace.sharedWorkspace()
+            categorize: (bundle_id, app_name) -> 카테고리 함수. 주어지면 변환 시 함께 분류
+        """
+        snapshot = cls([])
+        snapshot.apps = snapshot._capture(workspace, categorize)
+        return snapshot
+
+    def _capture(self, workspace, categorize) -> List[Dict]:
+        apps = []
+        timestamp = self.taken_at.isoformat()
+
+        for app in workspace.runningApplications():
+            # 시스템 프로세스 제외
+            if app.activationPolicy() != ACTIVATION_POLICY_REGULAR:
+                continue
+
+            # 브리지 호출은 속성마다 한 번씩만
+            bundle_id = app.bundleIdentifier()
+            app_name = app.localizedName()
+            is_active = bool(app.isActive())
+            launch_date = app.launchDate()
+            bundle_url = app.bundleURL()
+
+            # NSDate는 문자열로 바꿔 파싱하지 않고 epoch 초로 바로 변환
+            launch_timestamp = float(launch_date.timeIntervalSince1970()) if launch_date else None
+
+            app_info = {
+                'bundle_id': str(bundle_id) if bundle_id else 'Unknown',
+                'app_name': str(app_name) if app_name else 'Unknown',
+                'pid': int(app.processIdentifier()),
+                'is_active': is_active,
+                'is_frontmost': bool(is_active and app.isFinishedLaunching()),
+                'launch_date': datetime.fromtimestamp(launch_timestamp).isoformat() if launch_timestamp else None,
+                'launch_timestamp': launch_timestamp,
+                'timestamp': timestamp,
+                'app_path': str(bundle_url.path()) if bundle_url else None
+            }
+            if categorize:
+                app_info['category'] = categorize(app_info['bundle_id'], app_info['app_name'])
+            apps.append(app_info)
+
+        return apps
+
+    def pids(self) -> List[int]:
+        """스냅샷에 포함된 앱 pid 목록"""
+        return [app['pid'] for app in self.apps]
+
+    def frontmost(self) -> Optional[Dict]:
+        """스냅샷 시점의 활성 앱"""
+        for app in self.apps:
+            if app['is_frontmost']:
+                return app
+        return None
+
+    def __len__(self) -> int:
+        return len(self.apps)
@@ -0,0 +1,283 @@
+"""
+앱 포커스 추적 엔진
+앱 활성화 이벤트를 실시간으로 받아 (앱, 시작, 끝) 포커스 구간으로 합치고 배치 단위로 내보냄
+
+이벤트 소스는 교체 가능한 인터페이스로 분리되어 있어
+macOS에서는 NSWorkspace 알림이나 폴러를, Linux 테스트/벤치마크에서는 합성 소스를 사용할 수 있음
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+
+class FocusEventSource:
+    """앱 활성화 이벤트 소스 인터페이스
+
+    poll()은 마지막 호출 이후 발생한 활성화 이벤트 목록을 반환한다.
+    이벤트 형식: {'timestamp': epoch 초, 'bundle_id': str, 'app_name': str, 'pid': int}
+    blocking이 True인 소스는 poll(timeout) 안에서 직접 대기한다.
+    """
+
+    blocking = False
+
+    def poll(self, timeout: float = 0.0) -> List[Dict]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FrontmostAppPoller(FocusEventSource):
+    """frontmostApplication()을 주기적으로 확인해서 바뀐 경우에만 이벤트를 만드는 저비용 폴러"""
+
+    def __init__(self, workspace):
+        self.workspace = workspace
+        self._last_key = None
+
+    def poll(self, timeout: float = 0.0) -> List[Dict]:
+        app = self.workspace.frontmostApplication()
+        if app is None:
+            return []
+
+        pid = int(app.processIdentifier())
+        bundle_id = str(app.bundleIdentifier()) if app.bundleIdentifier() else 'Unknown'
+        key = (bundle_id, pid)
+        if key == self._last_key:
+            return []
+
+        self._last_key = key
+        return [{
+            'timestamp': time.time(),
+            'bundle_id': bundle_id,
+            'app_name': str(app.localizedName()) if app.localizedName() else 'Unknown',
+            'pid': pid
+        }]
+
+
+_observer_class = None
+
+
+def _get_observer_class():
+    """NSWorkspace 알림 옵저버 클래스를 한 번만 정의 (PyObjC 클래스 이름은 프로세스 내에서 유일해야 함)"""
+    global _observer_class
+    if _observer_class is None:
+        import objc
+        from Foundation import NSObject
+
+        class FocusActivationObserver(NSObject):
+            def initWithQueue_(self, queue):
+                self = objc.super(FocusActivationObserver, self).init()
+                if self is None:
+                    return None
+                self.queue = queue
+                return self
+
+            def appActivated_(self, notification):
+                app = notification.userInfo().get('NSWorkspaceApplicationKey')
+                if app is None:
+                    return
+                self.queue.append({
+                    'timestamp': time.time(),
+                    'bundle_id': str(app.bundleIdentifier()) if app.bundleIdentifier() else 'Unknown',
+                    'app_name': str(app.localizedName()) if app.localizedName() else 'Unknown',
+                    'pid': int(app.processIdentifier())
+                })
+
+        _observer_class = FocusActivationObserver
+    return _observer_class
+
+
+class NSWorkspaceActivationSource(FocusEventSource):
+    """NSWorkspaceDidActivateApplicationNotification을 구독하는 이벤트 기반 소스
+
+    앱 전환이 없으면 아무 일도 하지 않으므로 폴링보다 비용이 낮음.
+    알림 전달을 위해 poll()에서 현재 스레드의 런루프를 timeout 만큼 돌린다.
+    """
+
+    blocking = True
+
+    def __init__(self, workspace):
+        from AppKit import NSWorkspaceDidActivateApplicationNotification
+
+        self.workspace = workspace
+        self._queue: List[Dict] = []
+        self._observer = _get_observer_class().alloc().initWithQueue_(self._queue)
+        self._center = workspace.notificationCenter()
+        self._center.addObserver_selector_name_object_(
+            self._observer, 'appActivated:', NSWorkspaceDidActivateApplicationNotification, None
+        )
+
+        # 구독 시점의 활성 앱을 첫 이벤트로 기록
+        initial = FrontmostAppPoller(workspace).poll()
+        self._queue.extend(initial)
+
+    def poll(self, timeout: float = 0.0) -> List[Dict]:
+        from Foundation import NSDate, NSRunLoop
+
+        NSRunLoop.currentRunLoop().runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(timeout))
+        events = self._queue[:]
+        del self._queue[:]
+        return events
+
+    def close(self):
+        self._center.removeObserver_(self._observer)
+
+
+class SyntheticEventSource(FocusEventSource):
+    """미리 준비한 이벤트를 순서대로 내보내는 합성 소스 (Linux 테스트/벤치마크용)"""
+
+    def __init__(self, events: List[Dict], events_per_poll: int = 1):
+        self._events = list(events)
+        self._position = 0
+        self.events_per_poll = events_per_poll
+
+    def poll(self, timeout: float = 0.0) -> List[Dict]:
+        batch = self._events[self._position:self._position + self.events_per_poll]
+        self._position += len(batch)
+        return batch
+
+    def exhausted(self) -> bool:
+        return self._position >= len(self._events)
+
+
+class FocusTracker:
+    """활성화 이벤트를 포커스 구간으로 합치고 배치 단위로 내보내는 추적 엔진"""
+
+    def __init__(self, source: FocusEventSource, flush_batch_size: int = 50,
+                 on_flush: Optional[Callable[[List[Dict]], None]] = None, max_intervals: int = 2000):
+        """
+        Args:
+            source: 활성화 이벤트 소스
+            flush_batch_size: 완료된 구간이 이만큼 쌓이면 on_flush 호출
+            on_flush: 완료된 구간 배치를 받는 콜백 (저장소 등)
+            max_intervals: 메모리에 남길 최근 완료 구간 수 (오래된 구간은 on_flush로 저장된 뒤 버려짐)
+        """
+        self.source = source
+        self.flush_batch_size = flush_batch_size
+        self.on_flush = on_flush
+
+        # 최근 구간 조회(get_intervals)용 - 데몬이 오래 실행돼도 메모리가 늘지 않도록 개수 제한
+        self.intervals: Deque[Dict] = deque(maxlen=max_intervals)
+        self._pending: List[Dict] = []
+        self._current: Optional[Dict] = None
+        self.event_count = 0
+
+    def handle_event(self, event: Dict):
+        """활성화 이벤트 1건 처리 - 같은 앱이 다시 활성화되면 현재 구간을 이어감"""
+        self.event_count += 1
+        current = self._current
+
+        if current is not None:
+            if current['bundle_id'] == event['bundle_id'] and current['pid'] == event.get('pid'):
+                return
+            self._close_current(event['timestamp'])
+
+        self._current = {
+            'bundle_id': event['bundle_id'],
+            'app_name': event['app_name'],
+            'pid': event.get('pid'),
+            'start': event['timestamp']
+        }
+
+    def _close_current(self, end: float):
+        current = self._current
+        self._current = None
+        if current is None or end <= current['start']:
+            return
+
+        interval = dict(current)
+        interval['end'] = end
+        interval['duration_seconds'] = round(end - current['start'], 3)
+        self.intervals.append(interval)
+        self._pending.append(interval)
+
+        if len(self._pending) >= self.flush_batch_size:
+            self.flush()
+
+    def pump(self, timeout: float = 0.0) -> int:
+        """이벤트 소스에서 새 이벤트를 가져와 처리하고 처리한 개수를 반환"""
+        events = self.source.poll(timeout)
+        for event in events:
+            self.handle_event(event)
+        return len(events)
+
+    def flush(self) -> List[Dict]:
+        """쌓인 완료 구간을 on_flush로 내보냄"""
+        batch = self._pending
+        self._pending = []
+        if batch and self.on_flush is not None:
+            self.on_flush(batch)
+        return batch
+
+    def current_app(self) -> Optional[Dict]:
+        """현재 포커스 중인 앱 정보"""
+        return dict(self._current) if self._current else None
+
+    def get_intervals(self, since: Optional[float] = None, now: Optional[float] = None) -> List[Dict]:
+        """완료된 구간과 진행 중인 구간을 시간순으로 반환
+
+        Args:
+            since: 이 시각(epoch 초) 이후와 겹치는 구간만 반환하고 앞부분은 잘라냄
+            now: 진행 중 구간의 끝 시각. None이면 현재 시각
+        """
+        if now is None:
+            now = time.time()
+
+        intervals = list(self.intervals)
+        if self._current is not None and now > self._current['start']:
+            open_interval = dict(self._current)
+            open_interval['end'] = now
+            open_interval['duration_seconds'] = round(now - open_interval['start'], 3)
+            intervals.append(open_interval)
+
+        if since is None:
+            return intervals
+
+        clipped = []
+        for interval in intervals:
+            if interval['end'] <= since:
+                continue
+            if interval['start'] < since:
+                interval = dict(interval)
+                interval['start'] = since
+                interval['duration_seconds'] = round(interval['end'] - since, 3)
+            clipped.append(interval)
+        return clipped
+
+    def run(self, duration: float, poll_interval: float = 1.0, scheduler=None):
+        """duration 초 동안 이벤트를 받아 추적
+
+        Args:
+            poll_interval: 고정 폴링 간격(초). scheduler가 있으면 무시
+            scheduler: SamplingScheduler. 주어지면 앱 전환 여부와 자기 오버헤드에 따라 간격을 조절
+        """
+        if scheduler is not None:
+            scheduler.run(lambda timeout: self.pump(timeout) > 0, duration, blocking=self.source.blocking)
+            return
+
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            self.pump(timeout=poll_interval)
+            if not self.source.blocking:
+                time.sleep(poll_interval)
+
+    def stop(self, now: Optional[float] = None):
+        """진행 중인 구간을 닫고 남은 배치를 내보냄"""
+        self._close_current(now if now is not None else time.time())
+        self.flush()
+        self.source.close()
+
+
+def interval_to_record(interval: Dict) -> Dict:
+    """포커스 구간을 app_history 레코드 형식으로 변환"""
+    return {
+        'bundle_id': interval['bundle_id'],
+        'app_name': interval['app_name'],
+        'timestamp': datetime.fromtimestamp(interval['start']).isoformat(),
+        'end_timestamp': datetime.fromtimestamp(interval['end']).isoformat(),
+        'duration_minutes': round(interval['duration_seconds'] / 60, 2),
+        'is_active': True,
+        'window_title': None  # 향후 확장 가능
+    }
@@ -0,0 +1,159 @@
+"""
+프로세스 CPU 샘플러
+psutil.Process 객체를 (pid, create_time) 기준으로 캐시해 두고
+두 샘플 사이의 CPU 시간 차이로 정확한 CPU 사용률을 계산
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# psutil은 첫 ProcessSampler 생성 시 import (분석/리포트 전용 실행의 시작 비용 절감)
+psutil = None
+
+
+def _import_psutil():
+    global psutil
+    if psutil is None:
+        try:
+            import psutil as _psutil
+        except ImportError:
+            raise ImportError("psutil이 필요합니다: pip install psutil")
+        psutil = _psutil
+    return psutil
+
+
+class ProcessSampler:
+    """틱 사이에 Process 객체와 CPU 시간을 유지하는 2-샘플 CPU 측정기
+
+    psutil의 첫 cpu_percent() 값은 항상 0.0이므로, 이전 틱의 누적 CPU 시간과
+    현재 누적 CPU 시간의 차이를 경과 시간으로 나눠 사용률을 직접 계산한다.
+    """
+
+    def __init__(self):
+        _import_psutil()
+
+        # (pid, create_time) -> {'process', 'cpu_time', 'sampled_at'}
+        self._cache: Dict[Tuple[int, float], Dict] = {}
+        self._by_pid: Dict[int, Tuple[int, float]] = {}
+
+    def has_baseline(self) -> bool:
+        """이전 샘플이 있어서 CPU 사용률을 계산할 수 있는지 여부"""
+        return bool(self._cache)
+
+    def _get_process(self, pid: int):
+        """캐시된 Process 객체 반환 (pid가 재사용된 경우 새로 생성)"""
+        key = self._by_pid.get(pid)
+        if key is not None:
+            entry = self._cache[key]
+            process = entry['process']
+            try:
+                if process.is_running():
+                    return process
+            except psutil.Error:
+                pass
+            self._forget(key)
+
+        return psutil.Process(pid)
+
+    def _forget(self, key: Tuple[int, float]):
+        self._cache.pop(key, None)
+        if self._by_pid.get(key[0]) == key:
+            del self._by_pid[key[0]]
+
+    def _target_processes(self, pids: Optional[Iterable[int]], include_children: bool,
+                          helper_names: Iterable[str] = ()) -> List:
+        """샘플링 대상 Process 목록 - pids가 없으면 전체 프로세스"""
+        if pids is None:
+            return list(psutil.process_iter())
+
+        targets = {}
+        for pid in pids:
+            try:
+                process = self._get_process(pid)
+                targets[process.pid] = process
+                if include_children:
+                    for child in process.children(recursive=True):
+                        if child.pid not in targets:
+                            targets[child.pid] = self._get_process(child.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        # launchd로 재부모화된 XPC 헬퍼는 children()에 보이지 않으므로 이름으로 찾음 ('Code Helper' 등)
+        helper_names = [name for name in helper_names if name]
+        if helper_names:
+            from .process_tree import is_helper_name
+            for process in psutil.process_iter(['name', 'ppid']):
+                info = process.info
+                if process.pid in targets or info.get('ppid') != 1 or not info.get('name'):
+                    continue
+                if any(is_helper_name(info['name'], app_name) for app_name in helper_names):
+                    try:
+                        targets[process.pid] = self._get_process(process.pid)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
+        return list(targets.values())
+
+    def sample(self, pids: Optional[Iterable[int]] = None, include_children: bool = True,
+               helper_names: Iterable[str] = ()) -> List[Dict]:
+        """한 틱 샘플링
+
+        Args:
+            pids: 샘플링할 pid 목록 (추적 중인 앱). None이면 전체 프로세스
+            include_children: pids의 하위 프로세스(헬퍼 등)도 포함할지 여부
+            helper_names: 앱 이름 목록. 주어지면 부모가 launchd인 '<앱 이름> ...' 헬퍼도 포함
+
+        Returns:
+            프로세스별 사용량 목록. 이전 샘플이 없는 프로세스의 cpu_percent는 None
+        """
+        now = time.monotonic()
+        timestamp = datetime.now().isoformat()
+        seen = set()
+        samples = []
+
+        for process in self._target_processes(pids, include_children, helper_names):
+            try:
+                # oneshot()으로 한 번의 시스템 콜에서 여러 속성을 함께 읽음
+                with process.oneshot():
+                    name = process.name()
+                    ppid = process.ppid()
+                    create_time = process.create_time()
+                    cpu_times = process.cpu_times()
+                    memory_info = process.memory_info()
+                    memory_percent = process.memory_percent()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+            if not name or name.startswith('kernel'):
+                continue
+
+            key = (process.pid, create_time)
+            cpu_time = cpu_times.user + cpu_times.system
+            previous = self._cache.get(key)
+
+            cpu_percent = None
+            if previous is not None:
+                elapsed = now - previous['sampled_at']
+                if elapsed > 0:
+                    cpu_percent = round(max(0.0, cpu_time - previous['cpu_time']) / elapsed * 100, 2)
+
+            self._cache[key] = {'process': process, 'cpu_time': cpu_time, 'sampled_at': now}
+            self._by_pid[process.pid] = key
+            seen.add(key)
+
+            samples.append({
+                'pid': process.pid,
+                'ppid': ppid,
+                'name': name,
+                'cpu_percent': cpu_percent,
+                'memory_percent': round(memory_percent, 3),
+                'memory_rss': memory_info.rss,
+                'create_time': datetime.fromtimestamp(create_time).isoformat(),
+                'timestamp': timestamp
+            })
+
+        # 이번 틱에 보이지 않은 (종료된) 프로세스는 캐시에서 제거
+        for key in [key for key in self._cache if key not in seen]:
+            self._forget(key)
+
+        return samples
@@ -0,0 +1,197 @@
+"""
+프로세스 트리 집계기
+브라우저/Electron 앱/IDE의 헬퍼 프로세스 사용량을 소유 앱으로 귀속시켜
+앱별 실제 CPU/메모리 비용을 계산
+
+pid → 부모 pid, pid → 소유 앱 맵을 틱 사이에 유지하므로
+트리는 새로 나타난 pid에 대해서만 거슬러 올라간다
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# 이 pid까지 올라가면 소유 앱이 없는 것으로 판단 (launchd/init)
+_ROOT_PIDS = (0, 1)
+
+
+def is_helper_name(name: str, app_name: str) -> bool:
+    """프로세스 이름이 앱 이름이거나 '앱 이름 + 공백'으로 시작하는지 ('Code Helper (Renderer)' → Code)"""
+    return bool(app_name) and (name == app_name or name.startswith(app_name + ' '))
+
+
+class ProcessTreeAggregator:
+    """헬퍼 프로세스 → 소유 앱 귀속 및 앱별 자원 사용량 집계"""
+
+    def __init__(self):
+        self._parent: Dict[int, int] = {}
+        self._owner: Dict[int, Optional[str]] = {}
+        self._create_time: Dict[int, str] = {}
+        self._app_pids: Dict[int, str] = {}
+        self._app_names: Dict[str, str] = {}
+        self.walks = 0  # 트리를 거슬러 올라간 횟수 (새 pid 수)
+
+    def update_apps(self, running_apps: List[Dict]):
+        """실행 중인 앱(트리의 루트)의 pid → 번들 ID 갱신"""
+        app_pids = {app['pid']: app['bundle_id'] for app in running_apps}
+        if app_pids != self._app_pids:
+            # 앱 구성이 바뀌면 그 앱을 거쳐 귀속된 결과만 다시 계산
+            changed = set(self._app_pids.items()) ^ set(app_pids.items())
+            changed_bundles = {bundle_id for _, bundle_id in changed}
+            self._owner = {pid: owner for pid, owner in self._owner.items()
+                           if owner is not None and owner not in changed_bundles}
+            self._app_pids = app_pids
+        self._app_names = {app['bundle_id']: app['app_name'] for app in running_apps}
+
+    def _observe(self, samples: List[Dict]):
+        """샘플의 pid/ppid/생성 시각으로 부모 맵 갱신 (pid 재사용 감지 포함)"""
+        alive = set()
+        replaced = set()
+        for sample in samples:
+            pid = sample['pid']
+            alive.add(pid)
+            create_time = sample.get('create_time')
+            if self._create_time.get(pid) != create_time:
+                # 새 pid 또는 재사용된 pid - 이전 프로세스로 캐시된 부모/소유 앱이 남아 있으면 버림
+                if pid in self._owner or pid in self._parent:
+                    replaced.add(pid)
+                self._create_time[pid] = create_time
+            if sample.get('ppid') is not None:
+                self._parent[pid] = sample['ppid']
+        if replaced:
+            self._invalidate_through(replaced)
+
+        # 종료된 프로세스 정리
+        for pid in [pid for pid in self._create_time if pid not in alive]:
+            del self._create_time[pid]
+            self._parent.pop(pid, None)
+            self._owner.pop(pid, None)
+
+    def _invalidate_through(self, pids: set):
+        """pids와, 이 pid들을 거쳐 소유 앱이 캐시된 자손의 소유 앱 캐시 제거"""
+        stale = []
+        for pid in self._owner:
+            current: Optional[int] = pid
+            seen = set()
+            while current is not None and current not in seen:
+                if current in pids:
+                    stale.append(pid)
+                    break
+                seen.add(current)
+                current = self._parent.get(current)
+        for pid in stale:
+            del self._owner[pid]
+
+    def _parent_of(self, pid: int) -> Optional[int]:
+        parent = self._parent.get(pid)
+        if parent is None:
+            # 샘플에 없는 중간 조상만 직접 조회
+            from .process_sampler import _import_psutil
+            psutil = _import_psutil()
+            try:
+                parent = psutil.Process(pid).ppid()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+            self._parent[pid] = parent
+        return parent
+
+    def _match_by_name(self, name: str) -> Optional[str]:
+        """부모가 launchd인 XPC 헬퍼 등은 이름 접두어로 소유 앱 추정 ('Code Helper' → Code)"""
+        best, best_len = None, 0
+        for bundle_id, app_name in self._app_names.items():
+            if len(app_name) > best_len and is_helper_name(name, app_name):
+                best, best_len = bundle_id, len(app_name)
+        return best
+
+    def owner_of(self, pid: int, name: str = '') -> Optional[str]:
+        """pid의 소유 앱 번들 ID (캐시된 결과가 없을 때만 트리를 거슬러 올라감)"""
+        if pid in self._app_pids:
+            return self._app_pids[pid]
+        if pid in self._owner:
+            return self._owner[pid]
+
+        self.walks += 1
+        path = []
+        owner = None
+        current: Optional[int] = pid
+        while current is not None and current not in _ROOT_PIDS and current not in path:
+            if current in self._app_pids:
+                owner = self._app_pids[current]
+                break
+            if current in self._owner:
+                owner = self._owner[current]
+                break
+            path.append(current)
+            current = self._parent_of(current)
+
+        if owner is None and name:
+            owner = self._match_by_name(name)
+
+        for visited in path:
+            self._owner[visited] = owner
+        return owner
+
+    def aggregate(self, samples: List[Dict], running_apps: Optional[List[Dict]] = None) -> Dict:
+        """프로세스 샘플을 앱별로 집계
+
+        Args:
+            samples: ProcessSampler.sample() 결과 (pid, ppid, name, cpu_percent, memory_rss, memory_percent)
+            running_apps: 실행 중인 앱 목록. 주어지면 트리 루트를 갱신
+
+        Returns:
+            {
+              'apps': {bundle_id: {'app_name', 'cpu_percent', 'memory_rss', 'memory_percent',
+                                   'process_count', 'helper_count'}},
+              'unattributed': {'cpu_percent', 'memory_rss', 'process_count'},
+              'new_pids_walked': 이번 집계에서 트리를 거슬러 올라간 pid 수
+            }
+        """
+        if running_apps is not None:
+            self.update_apps(running_apps)
+        self._observe(samples)
+
+        walks_before = self.walks
+        apps: Dict[str, Dict] = {}
+        unattributed = {'cpu_percent': 0.0, 'memory_rss': 0, 'process_count': 0}
+
+        for sample in samples:
+            owner = self.owner_of(sample['pid'], sample.get('name', ''))
+            cpu = sample.get('cpu_percent') or 0.0
+
+            if owner is None:
+                unattributed['cpu_percent'] += cpu
+                unattributed['memory_rss'] += sample.get('memory_rss', 0)
+                unattributed['process_count'] += 1
+                continue
+
+            usage = apps.get(owner)
+            if usage is None:
+                usage = apps[owner] = {
+                    'app_name': self._app_names.get(owner, owner),
+                    'cpu_percent': 0.0,
+                    'memory_rss': 0,
+                    'memory_percent': 0.0,
+                    'process_count': 0,
+                    'helper_count': 0
+                }
+            usage['cpu_percent'] += cpu
+            usage['memory_rss'] += sample.get('memory_rss', 0)
+            usage['memory_percent'] += sample.get('memory_percent', 0.0)
+            usage['process_count'] += 1
+            if self._app_pids.get(sample['pid']) != owner:
+                usage['helper_count'] += 1
+
+        for usage in apps.values():
+            usage['cpu_percent'] = round(usage['cpu_percent'], 2)
+            usage['memory_percent'] = round(usage['memory_percent'], 3)
+        unattributed['cpu_percent'] = round(unattributed['cpu_percent'], 2)
+
+        return {
+            'apps': dict(sorted(apps.items(), key=lambda item: item[1]['cpu_percent'], reverse=True)),
+            'unattributed': unattributed,
+            'new_pids_walked': self.walks - walks_before
+        }
+
+
+def top_apps_by_cpu(resource_usage: Dict, limit: int = 5) -> List[Tuple[str, float]]:
+    """집계 결과에서 CPU 사용률 상위 앱 (앱 이름, CPU%) 목록"""
+    return [(usage['app_name'], usage['cpu_percent'])
+            for usage in list(resource_usage.get('apps', {}).values())[:limit]]
@@ -0,0 +1,154 @@
+"""
+적응형 샘플링 스케줄러
+틱마다 추적기 자신의 CPU/벽시계 시간을 측정해서 CPU 예산(기본 0.5%)을 넘지 않도록
+폴링 간격을 조절하고, 사용자가 유휴 상태이거나 활성 앱이 바뀌지 않으면 간격을 늘림
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+
+class SamplingScheduler:
+    """자기 오버헤드 예산을 지키는 폴링 간격 조절기
+
+    다음 간격 = max(예산 간격, 활동 간격)을 [min_interval, max_interval]로 제한
+      - 예산 간격: 틱 1회 CPU 시간(EWMA) / 예산 비율. 이보다 자주 돌면 예산 초과
+      - 활동 간격: 변화가 있으면 min_interval로 복귀, 없으면 backoff_factor 배씩 증가
+      - 유휴: idle_seconds()가 idle_threshold 이상이면 max_interval
+    """
+
+    def __init__(self, cpu_budget_percent: float = 0.5, min_interval: float = 1.0,
+                 max_interval: float = 30.0, backoff_factor: float = 1.5,
+                 idle_threshold: float = 300.0,
+                 idle_seconds: Optional[Callable[[], Optional[float]]] = None,
+                 on_idle_span: Optional[Callable[[float, float], None]] = None):
+        """
+        Args:
+            cpu_budget_percent: 추적기가 쓸 수 있는 CPU 비율(%)
+            min_interval: 가장 짧은 폴링 간격(초)
+            max_interval: 가장 긴 폴링 간격(초)
+            backoff_factor: 변화가 없을 때 간격을 늘리는 배율
+            idle_threshold: 이 시간(초) 이상 입력이 없으면 유휴로 판단
+            idle_seconds: 마지막 사용자 입력 후 경과 초를 반환하는 함수 (None 반환 시 판단 불가)
+            on_idle_span: 유휴 구간(start, end epoch 초)이 끝날 때 호출되는 콜백 (분 그리드 등)
+        """
+        self.cpu_budget_percent = cpu_budget_percent
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.idle_threshold = idle_threshold
+        self.idle_seconds = idle_seconds
+        self.on_idle_span = on_idle_span
+
+        self.interval = min_interval
+        self.ticks = 0
+        self.idle_ticks = 0
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._tick_cpu_ewma: Optional[float] = None
+        self._started_cpu: Optional[float] = None
+        self._started_wall: Optional[float] = None
+        self._idle_since: Optional[float] = None
+
+    def _is_idle(self) -> bool:
+        if self.idle_seconds is None:
+            return False
+        try:
+            idle = self.idle_seconds()
+        except Exception:
+            return False
+
+        if idle is not None and idle >= self.idle_threshold:
+            if self._idle_since is None:
+                self._idle_since = time.time() - idle
+            return True
+
+        self._end_idle_span()
+        return False
+
+    def _end_idle_span(self):
+        if self._idle_since is not None:
+            start, self._idle_since = self._idle_since, None
+            if self.on_idle_span is not None:
+                self.on_idle_span(start, time.time())
+
+    def next_interval(self, tick_cpu: float, changed: bool) -> float:
+        """측정한 틱 CPU 시간과 변화 여부로 다음 간격 계산"""
+        if self._tick_cpu_ewma is None:
+            self._tick_cpu_ewma = tick_cpu
+        else:
+            self._tick_cpu_ewma = 0.8 * self._tick_cpu_ewma + 0.2 * tick_cpu
+
+        budget_interval = self._tick_cpu_ewma / (self.cpu_budget_percent / 100)
+
+        if self._is_idle():
+            self.idle_ticks += 1
+            activity_interval = self.max_interval
+        elif changed:
+            activity_interval = self.min_interval
+        else:
+            activity_interval = self.interval * self.backoff_factor
+
+        self.interval = min(self.max_interval, max(self.min_interval, budget_interval, activity_interval))
+        return self.interval
+
+    def tick(self, fn: Callable[[float], bool], timeout: float = 0.0) -> bool:
+        """fn(timeout)을 한 번 실행하고 CPU/벽시계 시간을 측정해서 다음 간격을 갱신
+
+        Args:
+            fn: 변화(앱 전환 등)가 있었으면 True를 반환하는 틱 함수
+            timeout: fn에 넘길 대기 시간 (블로킹 이벤트 소스용)
+        """
+        if self._started_cpu is None:
+            self._started_cpu = time.process_time()
+            self._started_wall = time.monotonic()
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        changed = bool(fn(timeout))
+        tick_cpu = time.process_time() - cpu_start
+
+        self.ticks += 1
+        self.cpu_seconds += tick_cpu
+        self.wall_seconds += time.perf_counter() - wall_start
+        self.next_interval(tick_cpu, changed)
+        return changed
+
+    def run(self, fn: Callable[[float], bool], duration: float, blocking: bool = False):
+        """duration 초 동안 fn을 적응형 간격으로 실행
+
+        Args:
+            blocking: True면 fn이 timeout 동안 직접 대기하므로 스케줄러는 sleep 하지 않음
+        """
+        deadline = time.monotonic() + duration
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait = min(self.interval, remaining)
+            if blocking:
+                self.tick(fn, wait)
+            else:
+                self.tick(fn)
+                time.sleep(max(0.0, min(self.interval, deadline - time.monotonic())))
+
+        # 실행이 끝날 때 진행 중인 유휴 구간도 내보냄
+        self._end_idle_span()
+
+    def overhead(self) -> Dict:
+        """측정된 자기 오버헤드 요약 (수집 데이터의 tracker_overhead에 포함)"""
+        elapsed = time.monotonic() - self._started_wall if self._started_wall is not None else 0.0
+        process_cpu = time.process_time() - self._started_cpu if self._started_cpu is not None else 0.0
+
+        return {
+            'ticks': self.ticks,
+            'idle_ticks': self.idle_ticks,
+            'elapsed_seconds': round(elapsed, 3),
+            'tick_cpu_seconds': round(self.cpu_seconds, 6),
+            'tick_wall_seconds': round(self.wall_seconds, 6),
+            'avg_tick_ms': round(self.cpu_seconds / self.ticks * 1000, 3) if self.ticks else None,
+            # 틱 안팎을 포함한 프로세스 전체 CPU 사용률
+            'cpu_percent': round(process_cpu / elapsed * 100, 4) if elapsed > 0 else None,
+            'cpu_budget_percent': self.cpu_budget_percent,
+            'current_interval': round(self.interval, 3)
+        }
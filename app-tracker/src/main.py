@@ -3,20 +3,105 @@
 macOS 앱 사용 데이터 수집 및 분석을 통합 실행
 """
 
+import argparse
 import json
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # 프로젝트 루트를 파이썬 경로에 추가
 sys.path.append(str(Path(__file__).parent))
 
-from collectors.app_collector import AppCollector
+# 수집기(PyObjC/psutil)는 수집할 때만 import - 분석/리포트 전용 실행은 플랫폼 바인딩을 로드하지 않음
 from analyzers.app_category_analyzer import AppCategoryAnalyzer
+from storage.catalog_hook import register_output
+from storage.event_log import AppEventLog
+from storage.minute_grid import MinuteGridStore
+from storage.rollup import EventRollup
 
+# 실행 위치와 관계없이 app-tracker/src/output에 저장 (데이터 통합기 카탈로그가 읽는 위치)
+OUTPUT_DIR = Path(__file__).parent / "output"
 
-def main():
-    """앱 추적기 메인 실행 함수"""
+
+def write_analysis(app_data: dict, analyzer: AppCategoryAnalyzer, output_dir: str = str(OUTPUT_DIR)):
+    """카테고리 분석 후 요약 JSON과 카테고리 리포트 저장
+
+    Returns:
+        (analysis, summary_path, report_path)
+    """
+    analysis = analyzer.analyze_all(app_data)
+    
+    summary_data = {
+        'collection_info': app_data['collection_info'],
+        'summary': {
+            'total_running_apps': len(app_data['running_apps']),
+            'total_processes': len(app_data['process_usage']),
+            'total_history_records': len(app_data['app_history']),
+            'analysis_timestamp': datetime.now().isoformat()
+        },
+        'category_analysis': analysis,
+        'top_apps': {
+            'most_used': app_data['usage_stats']['most_used_apps'][:5],
+            'currently_running': [
+                {'name': app['app_name'], 'category': app['category']}
+                for app in app_data['running_apps'][:10]
+            ]
+        }
+    }
+    
+    # 요약 파일 저장 - 파일 날짜는 수집 시각 기준 (--report-only로 지난 데이터를 다시 분석해도 그 날짜에 저장)
+    collected_at = app_data.get('collection_info', {}).get('timestamp')
+    timestamp = (datetime.fromisoformat(collected_at) if collected_at else datetime.now()).strftime("%Y%m%d")
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    summary_path = output_path / f"app_summary_{timestamp}.json"
+    
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary_data, f, indent=2, ensure_ascii=False)
+    
+    register_output(str(summary_path), rows=len(app_data['running_apps']))
+    
+    # 카테고리 리포트
+    report_content = analyzer.generate_category_report(app_data, analysis)
+    report_path = output_path / f"app_category_report_{timestamp}.txt"
+    
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(report_content)
+    
+    register_output(str(report_path))
+    return analysis, summary_path, report_path
+
+
+def report_only(complete_file: str) -> bool:
+    """이미 저장된 완전 데이터 파일로 분석/리포트만 다시 생성 (수집기를 import 하지 않음)"""
+    print(f"📋 리포트 전용 실행: {complete_file}")
+    
+    try:
+        with open(complete_file, 'r', encoding='utf-8') as f:
+            app_data = json.load(f)
+        
+        analysis, summary_path, report_path = write_analysis(app_data, AppCategoryAnalyzer())
+        
+        print(f"   ✅ 요약 데이터: {summary_path}")
+        print(f"   ✅ 카테고리 리포트: {report_path}")
+        print(f"   • 생산성 점수: {analysis['productivity_score']['overall_score']}/100")
+        return True
+        
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        print(f"❌ 리포트 생성 실패: {e}")
+        return False
+
+
+def main(track_minutes: float = 0, use_poller: bool = False, backend_name: str = None,
+         cpu_budget: float = 0.5):
+    """앱 추적기 메인 실행 함수
+    
+    Args:
+        track_minutes: 수집 전에 앱 전환을 실시간 추적할 시간(분). 0이면 추적 없이 현재 상태만 수집
+        use_poller: True면 NSWorkspace 알림 대신 frontmost 앱 폴러로 추적
+        backend_name: 플랫폼 백엔드 이름 ('macos', 'linux'). None이면 현재 플랫폼 기본값
+        cpu_budget: 실시간 추적 중 추적기가 쓸 수 있는 CPU 비율(%)
+    """
     print("🚀 Personal Logging Platform - App Tracker")
     print("=" * 50)
     print("macOS 앱 사용 패턴을 수집하고 분석합니다.\n")
@@ -24,8 +109,43 @@ def main():
     try:
         # 1. 앱 데이터 수집
         print("📱 1단계: 앱 사용 데이터 수집 중...")
-        collector = AppCollector()
+        from backends import get_backend
+        from collectors.app_collector import AppCollector
+        from collectors.process_tree import top_apps_by_cpu
+        
+        # 수집 시점에 레코드마다 한 번만 분류하도록 분석기의 분류 함수를 연결
+        analyzer = AppCategoryAnalyzer()
+        collector = AppCollector(categorize=analyzer.categorize_app, backend=get_backend(backend_name))
+        event_log = AppEventLog(str(OUTPUT_DIR / "events"))
+        started_at = datetime.now()
+        
+        if track_minutes > 0:
+            print(f"   ⏱️ {track_minutes}분 동안 앱 전환을 추적합니다...")
+            # 완료된 포커스 구간은 이벤트 로그와 분 그리드에 함께 반영
+            grid_store = MinuteGridStore(str(OUTPUT_DIR / "grids"))
+            
+            def on_flush(intervals):
+                event_log.append_focus_intervals(intervals)
+                grid_store.add_intervals(intervals)
+            
+            tracker = collector.create_focus_tracker(
+                use_notifications=not use_poller,
+                on_flush=on_flush
+            )
+            scheduler = collector.create_scheduler(
+                cpu_budget_percent=cpu_budget,
+                on_idle_span=grid_store.mark_idle
+            )
+            tracker.run(track_minutes * 60, scheduler=scheduler)
+            tracker.stop()
+            
+            overhead = scheduler.overhead()
+            print(f"   ⚙️ 추적기 오버헤드: CPU {overhead['cpu_percent']}% "
+                  f"(예산 {cpu_budget}%, 틱 {overhead['ticks']}회)")
+        
         app_data = collector.collect_all_data()
+        event_log.append_process_samples(app_data['process_usage'])
+        event_log.close()
         
         print(f"   ✅ 실행 중인 앱: {len(app_data['running_apps'])}개")
         print(f"   ✅ 프로세스 정보: {len(app_data['process_usage'])}개")
@@ -33,66 +153,25 @@ def main():
         
         # 2. 완전한 데이터 저장
         print("\n💾 2단계: 완전한 데이터 저장 중...")
-        complete_file = collector.save_data(app_data, "output")
+        complete_file = collector.save_data(app_data, str(OUTPUT_DIR))
         if complete_file:
             print(f"   ✅ 완전 데이터: {complete_file}")
         
-        # 3. 카테고리 분석
-        print("\n📊 3단계: 앱 카테고리 분석 중...")
-        analyzer = AppCategoryAnalyzer()
+        # 이벤트 로그 → 분/시간 단위 롤업 갱신 (추적이 자정을 넘겼으면 지난 날짜도 다시 집계)
+        rollup = EventRollup(event_log, str(OUTPUT_DIR))
+        day = started_at.date()
+        while day <= datetime.now().date():
+            rollup_file = rollup.save(day.strftime("%Y%m%d"))
+            print(f"   ✅ 앱 사용 롤업: {rollup_file}")
+            day += timedelta(days=1)
         
-        # 실행 중인 앱 분석
-        running_analysis = analyzer.analyze_running_apps(app_data['running_apps'])
-        usage_analysis = analyzer.analyze_usage_patterns(app_data['app_history'])
-        productivity = analyzer.analyze_productivity_score(
-            app_data['running_apps'], 
-            app_data['app_history']
-        )
-        
-        # 4. 요약 데이터 생성 및 저장
-        print("\n📝 4단계: 요약 데이터 생성 중...")
-        summary_data = {
-            'collection_info': app_data['collection_info'],
-            'summary': {
-                'total_running_apps': len(app_data['running_apps']),
-                'total_processes': len(app_data['process_usage']),
-                'total_history_records': len(app_data['app_history']),
-                'analysis_timestamp': datetime.now().isoformat()
-            },
-            'category_analysis': {
-                'running_apps': running_analysis,
-                'usage_patterns': usage_analysis,
-                'productivity_score': productivity
-            },
-            'top_apps': {
-                'most_used': app_data['usage_stats']['most_used_apps'][:5],
-                'currently_running': [
-                    {'name': app['app_name'], 'category': analyzer.categorize_app(app['bundle_id'], app['app_name'])}
-                    for app in app_data['running_apps'][:10]
-                ]
-            }
-        }
-        
-        # 요약 파일 저장
-        timestamp = datetime.now().strftime("%Y%m%d")
-        summary_filename = f"app_summary_{timestamp}.json"
-        summary_path = Path("output") / summary_filename
-        
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(summary_data, f, indent=2, ensure_ascii=False)
+        # 3~5. 카테고리 분석, 요약 데이터, 카테고리 리포트
+        print("\n📊 3단계: 앱 카테고리 분석 및 리포트 생성 중...")
+        analysis, summary_path, report_path = write_analysis(app_data, analyzer)
+        running_analysis = analysis['running_apps']
+        productivity = analysis['productivity_score']
         
         print(f"   ✅ 요약 데이터: {summary_path}")
-        
-        # 5. 카테고리 리포트 생성
-        print("\n📋 5단계: 카테고리 리포트 생성 중...")
-        report_content = analyzer.generate_category_report(app_data)
-        
-        report_filename = f"app_category_report_{timestamp}.txt"
-        report_path = Path("output") / report_filename
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
-        
         print(f"   ✅ 카테고리 리포트: {report_path}")
         
         # 6. 최종 결과 요약 출력
@@ -120,10 +199,18 @@ def main():
             for i, (app_name, minutes) in enumerate(app_data['usage_stats']['most_used_apps'][:3]):
                 print(f"   {i+1}. {app_name}: {minutes:.1f}분")
         
+        # 헬퍼 프로세스를 포함한 앱별 CPU 비용
+        top_cpu = top_apps_by_cpu(app_data['app_resource_usage'], 3)
+        if top_cpu:
+            print(f"\n⚙️ CPU 사용량 상위 앱 (헬퍼 프로세스 포함):")
+            for i, (app_name, cpu) in enumerate(top_cpu):
+                print(f"   {i+1}. {app_name}: {cpu:.1f}%")
+        
         print(f"\n📁 생성된 파일:")
         print(f"   • 완전 데이터: {complete_file}")
         print(f"   • 요약 데이터: {summary_path}")
         print(f"   • 카테고리 리포트: {report_path}")
+        print(f"   • 앱 사용 롤업: {rollup_file}")
         
         print(f"\n💡 다음 단계: 브라우저 데이터와 통합하여 종합 분석 가능")
         
@@ -142,6 +229,43 @@ def main():
         return False
 
 
+def create_argument_parser():
+    """명령행 인수 파서 생성"""
+    parser = argparse.ArgumentParser(description="Personal Logging Platform - App Tracker")
+    parser.add_argument(
+        '--track-minutes',
+        type=float,
+        default=0,
+        help='수집 전에 앱 전환을 실시간으로 추적할 시간(분)'
+    )
+    parser.add_argument(
+        '--poller',
+        action='store_true',
+        help='NSWorkspace 활성화 알림 대신 frontmost 앱 폴러 사용'
+    )
+    parser.add_argument(
+        '--cpu-budget',
+        type=float,
+        default=0.5,
+        help='실시간 추적 중 추적기 자신의 CPU 예산(%%, 기본 0.5)'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['macos', 'linux'],
+        help='플랫폼 백엔드 (기본: 현재 플랫폼)'
+    )
+    parser.add_argument(
+        '--report-only',
+        metavar='COMPLETE_FILE',
+        help='수집 없이 저장된 app_usage_complete JSON으로 분석/리포트만 생성'
+    )
+    return parser
+
+
 if __name__ == "__main__":
-    success = main()
+    args = create_argument_parser().parse_args()
+    if args.report_only:
+        success = report_only(args.report_only)
+    else:
+        success = main(args.track_minutes, args.poller, args.backend, args.cpu_budget)
     sys.exit(0 if success else 1)
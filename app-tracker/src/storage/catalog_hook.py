@@ -0,0 +1,15 @@
+"""
+데이터 통합기 출력 카탈로그 연동
+프로젝트 공용 훅(common/catalog_hook.py)을 앱 추적기에서 쓸 수 있게 연결
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.catalog_hook import register_output  # noqa: E402
+
+__all__ = ['register_output']
@@ -0,0 +1,194 @@
+"""
+앱 이벤트 로그
+포커스 구간과 프로세스 샘플을 날짜별 JSONL 세그먼트에 그룹 커밋(write + fsync 1회)으로 append하고,
+크기/날짜 기준으로 세그먼트를 교체하면서 닫힌 세그먼트는 gzip으로 압축
+"""
+
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .write_ahead import WriteAheadBuffer, recover_jsonl_tail
+
+
+def split_at_midnight(interval: Dict) -> List[Dict]:
+    """자정을 넘는 포커스 구간을 날짜별 조각으로 나눔 (각 조각은 시작 날짜의 세그먼트에 기록됨)"""
+    pieces = []
+    start = interval['start']
+    while True:
+        next_day = datetime.fromtimestamp(start).date() + timedelta(days=1)
+        midnight = datetime.combine(next_day, datetime.min.time()).timestamp()
+        if interval['end'] <= midnight:
+            break
+        piece = dict(interval, start=start, end=midnight)
+        piece['duration_seconds'] = round(midnight - start, 3)
+        pieces.append(piece)
+        start = midnight
+
+    if not pieces:
+        return [interval]
+    last = dict(interval, start=start)
+    last['duration_seconds'] = round(interval['end'] - start, 3)
+    pieces.append(last)
+    return pieces
+
+
+class AppEventLog:
+    """append-only 앱 이벤트 로그
+
+    세그먼트 파일: events_YYYYMMDD_NNN.jsonl (닫힌 세그먼트는 .jsonl.gz)
+    이벤트 형식: {'type': 'focus' | 'process', 'ts': epoch 초, ...원본 필드}
+    """
+
+    SEGMENT_PREFIX = "events_"
+
+    def __init__(self, log_dir: str, max_segment_bytes: int = 8 * 1024 * 1024, batch_size: int = 100,
+                 commit_interval: float = 2.0):
+        """
+        Args:
+            log_dir: 세그먼트를 저장할 디렉토리
+            max_segment_bytes: 세그먼트가 이 크기를 넘으면 새 세그먼트로 교체
+            batch_size: 대기 중인 이벤트가 이만큼 쌓이면 그룹 커밋
+            commit_interval: 마지막 커밋 후 이 시간(초)이 지나면 다음 append/poll 때 그룹 커밋
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+
+        self._wal = WriteAheadBuffer(group_size=batch_size, group_interval=commit_interval)
+        self._active: Dict[str, Path] = {}  # YYYYMMDD -> 현재 세그먼트 경로
+        self.recovered_bytes = self._recover()
+
+    def _recover(self) -> int:
+        """이전 실행이 비정상 종료되며 남긴 열린 세그먼트의 잘린 꼬리 복구"""
+        dropped = 0
+        for segment in self.log_dir.glob(f"{self.SEGMENT_PREFIX}*.jsonl"):
+            dropped += recover_jsonl_tail(segment)
+        return dropped
+
+    def append(self, event_type: str, record: Dict, ts: float):
+        """이벤트 1건 추가 (그룹 조건을 채우면 커밋)"""
+        event = {'type': event_type, 'ts': ts}
+        event.update(record)
+
+        day = datetime.fromtimestamp(ts).strftime('%Y%m%d')
+        segment = self._active.get(day) or self._segment_for(day)
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+        if self._wal.add(segment, line):
+            self._rotate_full_segments()
+
+    def append_focus_intervals(self, intervals: List[Dict]):
+        """포커스 추적 엔진의 완료 구간 배치 추가 (FocusTracker.on_flush로 연결 가능)
+
+        자정을 넘는 구간은 날짜별로 나눠서 기록하므로 하루치 롤업은 그 날짜의 로그만 읽으면 된다.
+        """
+        for interval in intervals:
+            for piece in split_at_midnight(interval):
+                self.append('focus', piece, piece['start'])
+
+    def append_process_samples(self, samples: List[Dict]):
+        """프로세스 샘플 배치 추가"""
+        for sample in samples:
+            ts = datetime.fromisoformat(sample['timestamp']).timestamp()
+            self.append('process', sample, ts)
+
+    def poll(self) -> bool:
+        """commit_interval이 지났으면 대기 중인 이벤트를 커밋 (장시간 실행 루프에서 주기적으로 호출)"""
+        if self._wal.poll():
+            self._rotate_full_segments()
+            return True
+        return False
+
+    def flush(self) -> int:
+        """대기 중인 이벤트를 모두 커밋하고 기록한 개수를 반환"""
+        count = self._wal.commit()
+        self._rotate_full_segments()
+        return count
+
+    def _rotate_full_segments(self):
+        """커밋 후 크기를 넘은 활성 세그먼트를 닫음 (다음 append 때 새 세그먼트 생성)"""
+        for day, segment in list(self._active.items()):
+            if segment.exists() and segment.stat().st_size >= self.max_segment_bytes:
+                self._wal.commit(segment)
+                self._close_segment(segment)
+                del self._active[day]
+
+    def stats(self) -> Dict:
+        """그룹 커밋 통계 (커밋 수, fsync 수, 기록한 이벤트 수, 대기 중 이벤트 수)"""
+        return self._wal.stats()
+
+    def _segment_for(self, day: str) -> Path:
+        """쓰기 대상 세그먼트 결정 - 날짜가 바뀌면 이전 날짜 세그먼트를 닫음"""
+        # 날짜가 지난 활성 세그먼트는 닫고 압축
+        for active_day in [d for d in self._active if d < day]:
+            segment = self._active.pop(active_day)
+            self._wal.commit(segment)
+            self._close_segment(segment)
+
+        segment = self._active.get(day)
+        if segment is None:
+            segment = self._latest_open_segment(day)
+            if segment is None or segment.stat().st_size >= self.max_segment_bytes:
+                if segment is not None:
+                    self._close_segment(segment)
+                segment = self._new_segment(day)
+            self._active[day] = segment
+
+        return segment
+
+    def _segments(self, day: str) -> List[Path]:
+        """해당 날짜의 세그먼트 목록 (순번 순)"""
+        pattern = f"{self.SEGMENT_PREFIX}{day}_*.jsonl*"
+        return sorted(self.log_dir.glob(pattern), key=lambda p: p.name.split('.')[0])
+
+    def _latest_open_segment(self, day: str) -> Optional[Path]:
+        segments = self._segments(day)
+        if segments and segments[-1].suffix == '.jsonl':
+            return segments[-1]
+        return None
+
+    def _new_segment(self, day: str) -> Path:
+        segments = self._segments(day)
+        next_no = int(segments[-1].name.split('.')[0].split('_')[-1]) + 1 if segments else 1
+        return self.log_dir / f"{self.SEGMENT_PREFIX}{day}_{next_no:03d}.jsonl"
+
+    def _close_segment(self, segment: Path):
+        """닫힌 세그먼트를 gzip으로 압축"""
+        if not segment.exists():
+            return
+
+        compressed = segment.with_suffix('.jsonl.gz')
+        with open(segment, 'rb') as src, gzip.open(compressed, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(segment)
+
+    def compact(self, before_day: Optional[str] = None):
+        """before_day(YYYYMMDD) 이전 날짜의 열린 세그먼트를 모두 압축 (기본: 오늘 이전)"""
+        if before_day is None:
+            before_day = datetime.now().strftime('%Y%m%d')
+
+        for segment in self.log_dir.glob(f"{self.SEGMENT_PREFIX}*.jsonl"):
+            day = segment.name[len(self.SEGMENT_PREFIX):].split('_')[0]
+            if day < before_day and self._active.get(day) != segment:
+                self._close_segment(segment)
+
+    def iter_events(self, day: str, event_type: Optional[str] = None) -> Iterator[Dict]:
+        """해당 날짜(YYYYMMDD)의 이벤트를 기록 순서대로 읽기"""
+        self.flush()
+        for segment in self._segments(day):
+            opener = gzip.open if segment.suffix == '.gz' else open
+            with opener(segment, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    if event_type is None or event['type'] == event_type:
+                        yield event
+
+    def close(self):
+        """남은 버퍼를 기록"""
+        self.flush()
@@ -0,0 +1,266 @@
+"""
+하루 1440분 앱 사용 그리드
+분마다 전면 앱 ID(array 'H')와 활성/유휴 상태(bytearray)를 기록하는 압축 표현.
+JSON 레코드를 파싱하는 대신 몇 KB 배열을 훑어서 일/시간/주 단위 앱 사용 시간을 구함
+
+파일 형식 (grid_YYYYMMDD.bin):
+    b'DMG1' + 헤더 길이(uint32 LE) + 헤더 JSON + 앱 ID 배열(1440 x uint16) + 상태(1440) + 점유 초(1440)
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+MINUTES_PER_DAY = 1440
+
+# 분 상태
+STATE_NONE = 0
+STATE_ACTIVE = 1
+STATE_IDLE = 2
+
+_MAGIC = b'DMG1'
+
+
+class DailyMinuteGrid:
+    """하루치 분 단위 전면 앱/상태 그리드
+
+    app ID 0은 '기록 없음'이고, 1부터 apps 목록의 인덱스+1에 대응한다.
+    한 분에 여러 앱이 걸치면 그 분을 가장 오래 점유한 앱을 기록한다.
+    """
+
+    def __init__(self, day: str):
+        """
+        Args:
+            day: YYYYMMDD
+        """
+        self.day = day
+        self.day_start = datetime.strptime(day, '%Y%m%d').timestamp()
+        self.apps: List[List[str]] = []  # [bundle_id, app_name]
+        self.app_ids: Dict[str, int] = {}
+        self.grid = array('H', bytes(MINUTES_PER_DAY * 2))
+        self.state = bytearray(MINUTES_PER_DAY)
+        self._seconds = bytearray(MINUTES_PER_DAY)  # 기록된 앱이 그 분을 점유한 초
+
+    def app_id(self, bundle_id: str, app_name: str) -> int:
+        """앱 ID 조회 (없으면 새로 할당)"""
+        app_id = self.app_ids.get(bundle_id)
+        if app_id is None:
+            self.apps.append([bundle_id, app_name])
+            app_id = len(self.apps)
+            self.app_ids[bundle_id] = app_id
+        return app_id
+
+    def _minutes(self, start: float, end: float):
+        """[start, end) 구간이 걸치는 (분 인덱스, 점유 초) 목록 (이 날짜 범위로 잘라냄)"""
+        start = max(start, self.day_start)
+        end = min(end, self.day_start + MINUTES_PER_DAY * 60)
+        while start < end:
+            minute = int((start - self.day_start) // 60)
+            minute_end = min(end, self.day_start + (minute + 1) * 60)
+            yield minute, minute_end - start
+            start = minute_end
+
+    def add_interval(self, interval: Dict):
+        """포커스 구간 1개 반영 ({'bundle_id', 'app_name', 'start', 'end'})"""
+        app_id = self.app_id(interval['bundle_id'], interval.get('app_name', interval['bundle_id']))
+        grid, seconds, state = self.grid, self._seconds, self.state
+
+        for minute, covered in self._minutes(interval['start'], interval['end']):
+            covered = max(1, int(round(covered)))
+            if grid[minute] == app_id:
+                seconds[minute] = min(60, seconds[minute] + covered)
+            elif covered > seconds[minute]:
+                grid[minute] = app_id
+                seconds[minute] = min(60, covered)
+            if state[minute] == STATE_NONE:
+                state[minute] = STATE_ACTIVE
+
+    def mark_idle(self, start: float, end: float):
+        """[start, end) 구간을 유휴 상태로 표시"""
+        for minute, _ in self._minutes(start, end):
+            self.state[minute] = STATE_IDLE
+
+    # ---- 조회 ----
+
+    def app_minutes(self, active_only: bool = False) -> Dict[str, int]:
+        """앱별 전면 사용 분 {bundle_id: 분}"""
+        if active_only:
+            counts = Counter(app_id for app_id, state in zip(self.grid, self.state) if state == STATE_ACTIVE)
+        else:
+            counts = Counter(self.grid)
+        return {self.apps[app_id - 1][0]: minutes for app_id, minutes in counts.items() if app_id}
+
+    def hourly_app_minutes(self, active_only: bool = False) -> Dict[str, Dict[str, int]]:
+        """시간대별 앱 사용 분 {'HH': {bundle_id: 분}}"""
+        result = {}
+        for hour in range(24):
+            lo, hi = hour * 60, (hour + 1) * 60
+            if active_only:
+                counts = Counter(app_id for app_id, state in zip(self.grid[lo:hi], self.state[lo:hi])
+                                 if state == STATE_ACTIVE)
+            else:
+                counts = Counter(self.grid[lo:hi])
+            counts.pop(0, None)
+            if counts:
+                result[f"{hour:02d}"] = {self.apps[app_id - 1][0]: minutes for app_id, minutes in counts.items()}
+        return result
+
+    def state_minutes(self) -> Dict[str, int]:
+        """상태별 분 {'active', 'idle', 'none'}"""
+        return {
+            'active': self.state.count(STATE_ACTIVE),
+            'idle': self.state.count(STATE_IDLE),
+            'none': self.state.count(STATE_NONE)
+        }
+
+    def app_at(self, moment: datetime) -> Optional[Dict]:
+        """특정 시각의 전면 앱 {'bundle_id', 'app_name', 'state'}"""
+        minute = int((moment.timestamp() - self.day_start) // 60)
+        if not 0 <= minute < MINUTES_PER_DAY or not self.grid[minute]:
+            return None
+        bundle_id, app_name = self.apps[self.grid[minute] - 1]
+        return {
+            'bundle_id': bundle_id,
+            'app_name': app_name,
+            'state': 'idle' if self.state[minute] == STATE_IDLE else 'active'
+        }
+
+    # ---- 직렬화 ----
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps({'day': self.day, 'apps': self.apps}, ensure_ascii=False).encode('utf-8')
+        grid = self.grid
+        if sys.byteorder != 'little':
+            grid = array('H', grid)
+            grid.byteswap()
+        return b''.join([
+            _MAGIC, struct.pack('<I', len(header)), header,
+            grid.tobytes(), bytes(self.state), bytes(self._seconds)
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'DailyMinuteGrid':
+        if data[:4] != _MAGIC:
+            raise ValueError("분 그리드 파일 형식이 아닙니다")
+
+        header_len = struct.unpack_from('<I', data, 4)[0]
+        offset = 8 + header_len
+        header = json.loads(data[8:offset].decode('utf-8'))
+
+        grid = cls(header['day'])
+        grid.apps = header['apps']
+        grid.app_ids = {bundle_id: index + 1 for index, (bundle_id, _) in enumerate(grid.apps)}
+
+        grid.grid = array('H')
+        grid.grid.frombytes(data[offset:offset + MINUTES_PER_DAY * 2])
+        if sys.byteorder != 'little':
+            grid.grid.byteswap()
+        offset += MINUTES_PER_DAY * 2
+        grid.state = bytearray(data[offset:offset + MINUTES_PER_DAY])
+        offset += MINUTES_PER_DAY
+        grid._seconds = bytearray(data[offset:offset + MINUTES_PER_DAY])
+        return grid
+
+
+class MinuteGridStore:
+    """날짜별 분 그리드 파일 저장소 (grid_YYYYMMDD.bin)
+
+    포커스 추적 엔진의 on_flush 배치를 받아 해당 날짜 그리드를 갱신하고 바로 저장한다.
+    """
+
+    def __init__(self, grid_dir: str):
+        self.grid_dir = Path(grid_dir)
+        self.grid_dir.mkdir(parents=True, exist_ok=True)
+        self._grids: Dict[str, DailyMinuteGrid] = {}
+
+    def path_for(self, day: str) -> Path:
+        return self.grid_dir / f"grid_{day}.bin"
+
+    def load(self, day: str) -> Optional[DailyMinuteGrid]:
+        """파일 한 번 읽기로 그리드 로드. 없으면 None"""
+        path = self.path_for(day)
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            return DailyMinuteGrid.from_bytes(f.read())
+
+    def get(self, day: str) -> DailyMinuteGrid:
+        """갱신용 그리드 (메모리 캐시 → 파일 → 새 그리드 순)"""
+        grid = self._grids.get(day)
+        if grid is None:
+            grid = self.load(day) or DailyMinuteGrid(day)
+            self._grids[day] = grid
+        return grid
+
+    def save(self, grid: DailyMinuteGrid):
+        path = self.path_for(grid.day)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(grid.to_bytes())
+        os.replace(tmp_path, path)
+
+    def _days(self, start: float, end: float) -> List[str]:
+        days = []
+        moment = datetime.fromtimestamp(start).replace(hour=0, minute=0, second=0, microsecond=0)
+        while moment.timestamp() < end:
+            days.append(moment.strftime('%Y%m%d'))
+            moment += timedelta(days=1)
+        return days
+
+    def add_intervals(self, intervals: Iterable[Dict]):
+        """포커스 구간 배치 반영 (FocusTracker.on_flush로 연결 가능)"""
+        touched = set()
+        for interval in intervals:
+            for day in self._days(interval['start'], interval['end']):
+                self.get(day).add_interval(interval)
+                touched.add(day)
+        for day in touched:
+            self.save(self._grids[day])
+
+    def mark_idle(self, start: float, end: float):
+        """유휴 구간 반영"""
+        for day in self._days(start, end):
+            grid = self.get(day)
+            grid.mark_idle(start, end)
+            self.save(grid)
+
+    def weekly_app_minutes(self, end_day: str, days: int = 7, active_only: bool = False) -> Dict[str, int]:
+        """end_day(YYYYMMDD)까지 days일 동안 앱별 사용 분 합계"""
+        totals = Counter()
+        end = datetime.strptime(end_day, '%Y%m%d')
+        for offset in range(days):
+            grid = self.load((end - timedelta(days=offset)).strftime('%Y%m%d'))
+            if grid is not None:
+                totals.update(grid.app_minutes(active_only))
+        return dict(totals)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    # 간단한 동작 확인
+    base = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0).timestamp()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MinuteGridStore(tmp)
+        store.add_intervals([
+            {'bundle_id': 'com.microsoft.VSCode', 'app_name': 'Code', 'start': base, 'end': base + 3000},
+            {'bundle_id': 'com.google.Chrome', 'app_name': 'Chrome', 'start': base + 3000, 'end': base + 4200}
+        ])
+        store.mark_idle(base + 3600, base + 4200)
+
+        day = datetime.fromtimestamp(base).strftime('%Y%m%d')
+        started = time.perf_counter()
+        grid = store.load(day)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        print(f"📦 그리드 파일 크기: {store.path_for(day).stat().st_size} bytes, 로드 {elapsed:.2f}ms")
+        print(f"📊 앱별 사용 분: {grid.app_minutes()}")
+        print(f"🕘 시간대별: {grid.hourly_app_minutes()}")
+        print(f"💤 상태별: {grid.state_minutes()}")
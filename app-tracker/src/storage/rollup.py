@@ -0,0 +1,117 @@
+"""
+앱 이벤트 롤업
+원시 이벤트 로그를 분/시간 단위, 앱별 버킷으로 집계해서
+데이터 통합기가 원시 스냅샷 대신 작은 롤업 파일만 읽을 수 있게 함
+"""
+
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+from .catalog_hook import register_output
+from .event_log import AppEventLog
+
+
+class EventRollup:
+    """이벤트 로그 → 분/시간 단위 앱별 버킷 집계"""
+
+    def __init__(self, event_log: AppEventLog, output_dir: str = "output"):
+        self.event_log = event_log
+        self.output_dir = Path(output_dir)
+
+    def build(self, day: str) -> Dict:
+        """하루(YYYYMMDD)치 롤업 생성
+
+        Returns:
+            {
+              'date': 'YYYY-MM-DD',
+              'apps': {bundle_id: app_name},
+              'focus_minutely': {'HH:MM': {bundle_id: 초}},
+              'focus_hourly': {'HH': {bundle_id: 초}},
+              'focus_total_seconds': {bundle_id: 초},
+              'process_minutely': {'HH:MM': {프로세스명: {'cpu_avg', 'memory_rss_avg', 'samples'}}},
+              'process_hourly': {'HH': {프로세스명: {...}}}
+            }
+        """
+        apps = {}
+        focus_minutely = defaultdict(lambda: defaultdict(float))
+        focus_hourly = defaultdict(lambda: defaultdict(float))
+        focus_total = defaultdict(float)
+        process_minutely = defaultdict(lambda: defaultdict(lambda: [0.0, 0, 0, 0]))
+        process_hourly = defaultdict(lambda: defaultdict(lambda: [0.0, 0, 0, 0]))
+
+        day_start = datetime.strptime(day, '%Y%m%d').timestamp()
+        day_end = day_start + 86400
+
+        for event in self.event_log.iter_events(day):
+            if event['type'] == 'focus':
+                bundle_id = event['bundle_id']
+                apps[bundle_id] = event.get('app_name', bundle_id)
+
+                # 구간을 분 경계로 잘라서 각 분 버킷에 초 단위로 누적
+                start = max(event['start'], day_start)
+                end = min(event['end'], day_end)
+                while start < end:
+                    minute_end = min(end, (int(start) // 60 + 1) * 60)
+                    seconds = minute_end - start
+                    moment = datetime.fromtimestamp(start)
+                    focus_minutely[moment.strftime('%H:%M')][bundle_id] += seconds
+                    focus_hourly[moment.strftime('%H')][bundle_id] += seconds
+                    focus_total[bundle_id] += seconds
+                    start = minute_end
+
+            elif event['type'] == 'process':
+                moment = datetime.fromtimestamp(event['ts'])
+                cpu = event.get('cpu_percent')
+                for buckets, key in ((process_minutely, moment.strftime('%H:%M')),
+                                     (process_hourly, moment.strftime('%H'))):
+                    bucket = buckets[key][event['name']]
+                    # CPU는 기준 샘플이 있는 경우만 평균에 포함
+                    if cpu is not None:
+                        bucket[0] += cpu
+                        bucket[1] += 1
+                    bucket[2] += event.get('memory_rss', 0)
+                    bucket[3] += 1
+
+        return {
+            'date': datetime.strptime(day, '%Y%m%d').strftime('%Y-%m-%d'),
+            'generated_at': datetime.now().isoformat(),
+            'apps': apps,
+            'focus_minutely': self._round_buckets(focus_minutely),
+            'focus_hourly': self._round_buckets(focus_hourly),
+            'focus_total_seconds': {app: round(seconds, 1) for app, seconds in focus_total.items()},
+            'process_minutely': self._finish_process_buckets(process_minutely),
+            'process_hourly': self._finish_process_buckets(process_hourly)
+        }
+
+    def _round_buckets(self, buckets) -> Dict:
+        return {
+            key: {app: round(seconds, 1) for app, seconds in apps.items()}
+            for key, apps in sorted(buckets.items())
+        }
+
+    def _finish_process_buckets(self, buckets) -> Dict:
+        result = {}
+        for key, names in sorted(buckets.items()):
+            result[key] = {}
+            for name, (cpu_sum, cpu_samples, rss_sum, samples) in names.items():
+                result[key][name] = {
+                    'cpu_avg': round(cpu_sum / cpu_samples, 2) if cpu_samples else None,
+                    'memory_rss_avg': int(rss_sum / samples),
+                    'samples': samples
+                }
+        return result
+
+    def save(self, day: str) -> str:
+        """롤업을 app_rollup_YYYYMMDD.json으로 저장"""
+        rollup = self.build(day)
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = self.output_dir / f"app_rollup_{day}.json"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(rollup, f, ensure_ascii=False, separators=(',', ':'))
+
+        register_output(str(filepath), rows=len(rollup['focus_minutely']))
+        return str(filepath)
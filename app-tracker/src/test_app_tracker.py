@@ -11,6 +11,10 @@ sys.path.append(str(Path(__file__).parent))
 
 from collectors.app_collector import AppCollector
 from analyzers.app_category_analyzer import AppCategoryAnalyzer
+from collectors.focus_tracker import FocusTracker, SyntheticEventSource
+from collectors.sampling_scheduler import SamplingScheduler
+from storage.event_log import AppEventLog
+from storage.rollup import EventRollup
 
 
 def test_app_collector():
@@ -79,6 +83,88 @@ def test_category_analyzer():
         return False
 
 
+def test_focus_tracker():
+    """포커스 추적 엔진 테스트 (합성 이벤트 소스 - macOS 불필요)"""
+    print("\n🧪 포커스 추적 엔진 테스트 시작...")
+    
+    try:
+        events = [
+            {'timestamp': 1000.0, 'bundle_id': 'com.microsoft.VSCode', 'app_name': 'Code', 'pid': 10},
+            {'timestamp': 1300.0, 'bundle_id': 'com.microsoft.VSCode', 'app_name': 'Code', 'pid': 10},
+            {'timestamp': 1600.0, 'bundle_id': 'com.google.Chrome', 'app_name': 'Google Chrome', 'pid': 20},
+            {'timestamp': 1700.0, 'bundle_id': 'com.microsoft.VSCode', 'app_name': 'Code', 'pid': 10},
+        ]
+        flushed = []
+        tracker = FocusTracker(SyntheticEventSource(events), flush_batch_size=2, on_flush=flushed.extend)
+        while not tracker.source.exhausted():
+            tracker.pump()
+        tracker.stop(now=1900.0)
+        
+        durations = [(i['bundle_id'], i['duration_seconds']) for i in tracker.intervals]
+        assert durations == [
+            ('com.microsoft.VSCode', 600.0),
+            ('com.google.Chrome', 100.0),
+            ('com.microsoft.VSCode', 200.0)
+        ], durations
+        assert len(flushed) == 3
+
+        # 오래 실행돼도 메모리에는 최근 구간만 남음 (저장은 on_flush로 전부 전달)
+        switches = [{'timestamp': float(i), 'bundle_id': f'app{i % 2}', 'app_name': f'App {i % 2}', 'pid': i % 2}
+                    for i in range(1000)]
+        saved = []
+        capped = FocusTracker(SyntheticEventSource(switches, events_per_poll=100), on_flush=saved.extend,
+                              max_intervals=50)
+        while not capped.source.exhausted():
+            capped.pump()
+        capped.stop(now=1000.0)
+        assert len(capped.intervals) == 50 and len(saved) == 1000, (len(capped.intervals), len(saved))
+        assert capped.intervals[-1]['start'] == 999.0
+
+        # 앱 전환이 없으면 적응형 스케줄러가 폴링 간격을 늘림
+        scheduler = SamplingScheduler(min_interval=1.0, max_interval=8.0)
+        scheduler.tick(lambda timeout: True)
+        assert scheduler.interval == 1.0
+        for _ in range(10):
+            scheduler.tick(lambda timeout: False)
+        assert scheduler.interval == 8.0, scheduler.interval
+        
+        print(f"   ✅ 포커스 구간 {len(tracker.intervals)}개 생성 (이벤트 {tracker.event_count}개)")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ 포커스 추적 엔진 테스트 실패: {e}")
+        return False
+
+
+def test_event_log_rollup():
+    """이벤트 로그 롤업 테스트 - 자정을 넘는 구간이 두 날짜에 나뉘어 집계되는지"""
+    print("\n🧪 이벤트 로그 롤업 테스트 시작...")
+    
+    try:
+        import tempfile
+        from datetime import datetime
+        
+        log_dir = tempfile.mkdtemp()
+        event_log = AppEventLog(log_dir)
+        start = datetime(2025, 8, 17, 23, 50).timestamp()
+        end = datetime(2025, 8, 18, 0, 20).timestamp()
+        event_log.append_focus_intervals([{'bundle_id': 'com.microsoft.VSCode', 'app_name': 'Code',
+                                           'start': start, 'end': end, 'duration_seconds': end - start}])
+        
+        rollup = EventRollup(event_log, log_dir)
+        before = rollup.build('20250817')['focus_total_seconds']
+        after = rollup.build('20250818')['focus_total_seconds']
+        assert before == {'com.microsoft.VSCode': 600.0}, before
+        assert after == {'com.microsoft.VSCode': 1200.0}, after
+        
+        print("   ✅ 자정 전 10분 / 자정 후 20분으로 나뉘어 집계")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ 이벤트 로그 롤업 테스트 실패: {e}")
+        return False
+
+
 def test_integration():
     """통합 테스트"""
     print("\n🧪 통합 테스트 시작...")
@@ -117,6 +203,8 @@ def main():
     tests = [
         ("앱 수집기", test_app_collector),
         ("카테고리 분석기", test_category_analyzer),
+        ("포커스 추적 엔진", test_focus_tracker),
+        ("이벤트 로그 롤업", test_event_log_rollup),
         ("통합 기능", test_integration)
     ]
     
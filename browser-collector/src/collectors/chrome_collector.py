@@ -42,12 +42,21 @@ class ChromeCollector:
         
         try:
             shutil.copy2(self.chrome_history_path, temp_db_path)
+            # 아직 체크포인트되지 않은 최근 방문은 WAL 파일에 있으므로 함께 복사
+            wal_path = self.chrome_history_path + "-wal"
+            if os.path.exists(wal_path):
+                shutil.copy2(wal_path, temp_db_path + "-wal")
             return temp_db_path
         except Exception as e:
             raise Exception(f"Chrome 히스토리 DB 복사 실패: {e}")
     
-    def get_today_history(self, date: Optional[datetime] = None) -> List[Dict]:
-        """오늘의 브라우징 히스토리를 가져오기"""
+    def get_today_history(self, date: Optional[datetime] = None, since: Optional[datetime] = None) -> List[Dict]:
+        """오늘의 브라우징 히스토리를 가져오기
+
+        Args:
+            date: 수집할 날짜. None이면 오늘
+            since: 지정하면 이 시각 이후의 방문만 가져옴 (증분 수집용)
+        """
         if not self.is_chrome_available():
             raise Exception("Chrome 히스토리 DB를 찾을 수 없습니다.")
         
@@ -63,6 +72,10 @@ class ChromeCollector:
         start_webkit = int((start_of_day - self.webkit_epoch).total_seconds() * 1_000_000)
         end_webkit = int((end_of_day - self.webkit_epoch).total_seconds() * 1_000_000)
         
+        # 증분 수집: 마지막으로 본 방문 이후만 조회
+        if since is not None and since > start_of_day:
+            start_webkit = int((since - self.webkit_epoch).total_seconds() * 1_000_000) + 1
+        
         # 임시 DB 복사
         temp_db_path = self._copy_history_db()
         
@@ -111,8 +124,9 @@ class ChromeCollector:
             raise Exception(f"Chrome 히스토리 읽기 실패: {e}")
         finally:
             # 임시 파일 정리
-            if os.path.exists(temp_db_path):
-                os.remove(temp_db_path)
+            for path in (temp_db_path, temp_db_path + "-wal", temp_db_path + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
     
     def extract_search_queries(self, history_data: List[Dict]) -> List[Dict]:
         """브라우징 데이터에서 검색어 추출"""
@@ -41,12 +41,21 @@ class SafariCollector:
         
         try:
             shutil.copy2(self.safari_history_path, temp_db_path)
+            # Safari는 WAL 모드를 사용하므로 최근 방문이 담긴 WAL 파일도 함께 복사
+            wal_path = self.safari_history_path + "-wal"
+            if os.path.exists(wal_path):
+                shutil.copy2(wal_path, temp_db_path + "-wal")
             return temp_db_path
         except Exception as e:
             raise Exception(f"Safari 히스토리 DB 복사 실패: {e}")
     
-    def get_today_history(self, date: Optional[datetime] = None) -> List[Dict]:
-        """오늘의 브라우징 히스토리를 가져오기"""
+    def get_today_history(self, date: Optional[datetime] = None, since: Optional[datetime] = None) -> List[Dict]:
+        """오늘의 브라우징 히스토리를 가져오기
+
+        Args:
+            date: 수집할 날짜. None이면 오늘
+            since: 지정하면 이 시각 이후의 방문만 가져옴 (증분 수집용)
+        """
         if not self.is_safari_available():
             raise Exception("Safari 히스토리 DB를 찾을 수 없습니다.")
         
@@ -62,6 +71,10 @@ class SafariCollector:
         start_core_data = (start_of_day - self.core_data_epoch).total_seconds()
         end_core_data = (end_of_day - self.core_data_epoch).total_seconds()
         
+        # 증분 수집: 마지막으로 본 방문 이후만 조회
+        if since is not None and since > start_of_day:
+            start_core_data = (since - self.core_data_epoch).total_seconds() + 0.000001
+        
         # 임시 DB 복사
         temp_db_path = self._copy_history_db()
         
@@ -113,8 +126,9 @@ class SafariCollector:
             raise Exception(f"Safari 히스토리 읽기 실패: {e}")
         finally:
             # 임시 파일 정리
-            if os.path.exists(temp_db_path):
-                os.remove(temp_db_path)
+            for path in (temp_db_path, temp_db_path + "-wal", temp_db_path + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
     
     def extract_search_queries(self, history_data: List[Dict]) -> List[Dict]:
         """브라우징 데이터에서 검색어 추출"""
@@ -0,0 +1,291 @@
+"""
+브라우저 수집 데몬
+History DB와 WAL 파일의 stat만 가볍게 폴링하다가 변경이 감지되면
+디바운스 후 증분 수집을 수행하고, 분석 집계를 메모리에 유지한 채 주기적으로 요약 파일을 저장
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from collectors.browser_collector import BrowserCollector
+from analyzers.search_analyzer import SearchAnalyzer
+from analyzers.category_analyzer import CategoryAnalyzer
+from reports import save_to_json, save_text, build_complete_data, build_summary_report
+from search_index import update_search_index
+
+
+# DB 본체와 함께 변경 여부를 확인할 SQLite 부속 파일
+SIDECAR_SUFFIXES = ('', '-wal', '-journal')
+
+
+class DailyBrowsingState:
+    """하루치 브라우징 데이터와 분석 집계를 메모리에 유지하는 클래스"""
+
+    def __init__(self, day, category_analyzer: CategoryAnalyzer):
+        self.day = day
+        self.category_analyzer = category_analyzer
+        self.all_history: Dict[str, List[Dict]] = {}
+        self.merged_history: List[Dict] = []
+        self.search_queries: List[Dict] = []
+        self.categories: Dict[str, List[Dict]] = category_analyzer.categorize_websites([])
+        self.last_visit: Dict[str, datetime] = {}
+        self._seen = set()
+        self.dirty = False
+
+    def apply(self, browser: str, entries: List[Dict], new_searches: List[Dict]) -> int:
+        """새로 수집된 방문 기록을 반영하고 실제로 추가된 개수를 반환"""
+        added = []
+        for entry in entries:
+            key = (browser, entry['url'], entry['visit_time'])
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            added.append(entry)
+
+        if not added:
+            return 0
+
+        history = self.all_history.setdefault(browser, [])
+        history.extend(added)
+        history.sort(key=lambda x: x['visit_time'], reverse=True)
+
+        for entry in added:
+            entry_with_browser = entry.copy()
+            entry_with_browser['browser'] = browser
+            self.merged_history.append(entry_with_browser)
+
+            # 새 방문만 분류해서 카테고리 버킷에 추가
+            category = self.category_analyzer.categorize_website(entry['url'], entry.get('title', ''))
+            self.categories[category].append(entry_with_browser)
+
+        # 거의 정렬된 상태라 재정렬 비용은 선형에 가까움
+        self.merged_history.sort(key=lambda x: x['visit_time'], reverse=True)
+
+        added_urls = {(entry['url'], entry['visit_time']) for entry in added}
+        for search in new_searches:
+            if (search['url'], search['visit_time']) in added_urls:
+                self.search_queries.append(search)
+        self.search_queries.sort(key=lambda x: x['visit_time'], reverse=True)
+
+        newest = max(datetime.fromisoformat(entry['visit_time']) for entry in added)
+        if browser not in self.last_visit or newest > self.last_visit[browser]:
+            self.last_visit[browser] = newest
+
+        self.dirty = True
+        return len(added)
+
+
+class BrowserCollectorDaemon:
+    """변경 감지 기반으로 브라우저 히스토리를 계속 수집하는 데몬"""
+
+    def __init__(self, poll_interval: float = 5.0, debounce_seconds: float = 10.0,
+                 flush_interval: float = 300.0):
+        """
+        Args:
+            poll_interval: History 파일 stat 확인 주기(초)
+            debounce_seconds: 마지막 변경 후 이 시간 동안 조용해야 수집 시작
+            flush_interval: 요약 파일 저장 주기(초)
+        """
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.flush_interval = flush_interval
+
+        self.browser_collector = BrowserCollector()
+        self.search_analyzer = SearchAnalyzer()
+        self.category_analyzer = CategoryAnalyzer()
+
+        self.sources = {
+            'chrome': (self.browser_collector.chrome_collector,
+                       self.browser_collector.chrome_collector.chrome_history_path),
+            'safari': (self.browser_collector.safari_collector,
+                       self.browser_collector.safari_collector.safari_history_path)
+        }
+
+        self.state = DailyBrowsingState(datetime.now().date(), self.category_analyzer)
+        self._signatures: Dict[str, Tuple] = {}
+        self._pending_since: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self._running = False
+
+    def _stat_signature(self, history_path: str) -> Tuple:
+        """History DB와 부속 파일의 (mtime, size) 묶음 - 내용을 읽지 않는 저비용 변경 감지"""
+        signature = []
+        for suffix in SIDECAR_SUFFIXES:
+            try:
+                st = os.stat(history_path + suffix)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _changed_browsers(self, now: float) -> List[str]:
+        """변경 후 디바운스 시간이 지난 브라우저 목록 반환"""
+        ready = []
+        for browser, (_, history_path) in self.sources.items():
+            if not os.path.exists(history_path):
+                continue
+
+            signature = self._stat_signature(history_path)
+            if self._signatures.get(browser) != signature:
+                # 변경이 계속되는 동안은 디바운스 타이머를 다시 시작
+                self._signatures[browser] = signature
+                self._pending_since[browser] = now
+                continue
+
+            pending = self._pending_since.get(browser)
+            if pending is not None and now - pending >= self.debounce_seconds:
+                del self._pending_since[browser]
+                ready.append(browser)
+
+        return ready
+
+    def collect_incremental(self, browser: str, date: Optional[datetime] = None) -> int:
+        """한 브라우저의 마지막 방문 이후 기록만 수집해서 메모리 상태에 반영
+
+        Args:
+            date: 수집할 날짜 (기본값: 지금). 자정 처리 시 이전 날짜의 남은 기록을 가져올 때 지정
+        """
+        collector, _ = self.sources[browser]
+        since = self.state.last_visit.get(browser)
+
+        try:
+            entries = collector.get_today_history(date or datetime.now(), since=since)
+        except Exception as e:
+            print(f"❌ {browser.title()} 증분 수집 실패: {e}")
+            return 0
+
+        new_searches = self.browser_collector.extract_all_search_queries({browser: entries})
+        added = self.state.apply(browser, entries, new_searches)
+        if added:
+            print(f"✅ {browser.title()}: {added}개 새 기록 반영 (오늘 누적 {len(self.state.merged_history)}개)")
+            # 전문 검색 색인은 이미 색인된 기록을 건너뛰므로 수집분을 그대로 넘김
+            update_search_index({browser: entries}, new_searches)
+        return added
+
+    def _analyze(self) -> Dict:
+        """메모리에 유지 중인 데이터로 분석 결과 생성 (DB 재조회 없음)"""
+        state = self.state
+        search_queries = state.search_queries
+
+        if search_queries:
+            search_analysis = self.search_analyzer.analyze_search_patterns(search_queries)
+            search_insights = self.search_analyzer.get_search_insights(search_queries)
+        else:
+            search_analysis = {}
+            search_insights = []
+
+        return {
+            'search_analysis': search_analysis,
+            'search_insights': search_insights,
+            'category_analysis': self.category_analyzer.analyze_category_patterns(state.categories),
+            'category_insights': self.category_analyzer.get_category_insights(state.categories),
+            'comprehensive_stats': self.browser_collector.get_comprehensive_stats(
+                state.all_history, state.merged_history
+            )
+        }
+
+    def flush_summary(self):
+        """요약 리포트와 카테고리 리포트 저장"""
+        state = self.state
+        if not state.dirty or not state.merged_history:
+            return
+
+        collection_time = datetime.now()
+        analysis = self._analyze()
+
+        summary_report = build_summary_report(
+            collection_time, state.search_queries, analysis['search_insights'],
+            analysis['category_analysis'], analysis['category_insights'],
+            analysis['comprehensive_stats']
+        )
+        # 데몬이 하루를 넘겨 실행되는 경우에도 수집 대상 날짜로 저장
+        summary_report['date'] = state.day.strftime('%Y-%m-%d')
+
+        date_str = state.day.strftime('%Y%m%d')
+        save_to_json(summary_report, f"browser_summary_{date_str}.json",
+                     rows=summary_report['summary']['total_visits'])
+        save_text(self.category_analyzer.generate_category_report(state.categories),
+                  f"category_report_{date_str}.txt")
+
+        state.dirty = False
+        self._last_flush = time.monotonic()
+
+    def flush_complete(self):
+        """하루치 완전한 데이터 세트 저장 (날짜 변경 및 종료 시)"""
+        state = self.state
+        if not state.merged_history:
+            return
+
+        collection_time = datetime.now()
+        analysis = self._analyze()
+        complete_data = build_complete_data(
+            collection_time, list(state.all_history.keys()), state.all_history, state.merged_history,
+            state.search_queries, analysis['search_analysis'], analysis['search_insights'],
+            state.categories, analysis['category_analysis'], analysis['category_insights'],
+            analysis['comprehensive_stats']
+        )
+        complete_data['metadata']['collection_date'] = state.day.strftime('%Y-%m-%d')
+
+        save_to_json(complete_data, f"browser_complete_{state.day.strftime('%Y%m%d')}_{collection_time.strftime('%H%M%S')}.json",
+                     rows=len(state.merged_history))
+
+    def _rollover_if_needed(self):
+        """자정이 지나면 이전 날짜를 마무리하고 상태 초기화"""
+        today = datetime.now().date()
+        if today == self.state.day:
+            return
+
+        print(f"📅 날짜 변경 감지: {self.state.day} → {today}")
+        # 마지막 폴링 이후 자정 전까지의 방문은 새 날짜 상태로는 조회되지 않으므로 이전 날짜로 한 번 더 수집
+        previous_day = datetime.combine(self.state.day, datetime.min.time())
+        for browser, (_, history_path) in self.sources.items():
+            if os.path.exists(history_path):
+                self.collect_incremental(browser, previous_day)
+        self.state.dirty = True
+        self.flush_summary()
+        self.flush_complete()
+        self.state = DailyBrowsingState(today, self.category_analyzer)
+
+    def tick(self, now: Optional[float] = None):
+        """폴링 1회: 변경 감지 → 증분 수집 → 필요 시 요약 저장"""
+        if now is None:
+            now = time.monotonic()
+
+        self._rollover_if_needed()
+
+        for browser in self._changed_browsers(now):
+            self.collect_incremental(browser)
+
+        if self.state.dirty and now - self._last_flush >= self.flush_interval:
+            self.flush_summary()
+
+    def run(self):
+        """데몬 메인 루프 (Ctrl+C로 종료)"""
+        available = self.browser_collector.get_available_browsers()
+        print(f"🛰️ 브라우저 수집 데몬 시작 (브라우저: {', '.join(available) or '없음'})")
+        print(f"   • 폴링: {self.poll_interval}초, 디바운스: {self.debounce_seconds}초, 저장 주기: {self.flush_interval}초")
+
+        # 시작 시 오늘 기록 전체를 한 번 수집해서 집계를 채움
+        for browser in available:
+            self.collect_incremental(browser)
+            self._signatures[browser] = self._stat_signature(self.sources[browser][1])
+        self.flush_summary()
+
+        self._running = True
+        try:
+            while self._running:
+                self.tick()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("\n🛑 데몬 종료 요청")
+        finally:
+            self.state.dirty = True
+            self.flush_summary()
+            self.flush_complete()
+            print("👋 브라우저 수집 데몬 종료")
+
+    def stop(self):
+        """메인 루프 중지"""
+        self._running = False
@@ -6,8 +6,8 @@ Personal Logging Platform - Browser Collector (Enhanced)
 
 import sys
 import os
+import argparse
 from datetime import datetime
-import json
 
 # 현재 디렉토리를 Python path에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,18 +15,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from collectors.browser_collector import BrowserCollector
 from analyzers.search_analyzer import SearchAnalyzer
 from analyzers.category_analyzer import CategoryAnalyzer
-
-
-def save_to_json(data: dict, filename: str):
-    """데이터를 JSON 파일로 저장"""
-    output_dir = os.path.join(os.path.dirname(__file__), "..", "output")
-    os.makedirs(output_dir, exist_ok=True)
-    
-    filepath = os.path.join(output_dir, filename)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"💾 데이터 저장됨: {filepath}")
+from reports import save_to_json, save_text, build_complete_data, build_summary_report
+from search_index import HistorySearchIndex, update_search_index
 
 
 def main():
@@ -178,69 +168,32 @@ def main():
         date_str = today.strftime('%Y%m%d_%H%M%S')
         
         # 완전한 데이터 세트 저장
-        complete_data = {
-            'metadata': {
-                'collection_date': today.strftime('%Y-%m-%d'),
-                'collection_timestamp': today.isoformat(),
-                'available_browsers': available_browsers,
-                'total_records': len(merged_history),
-                'version': '1.0'
-            },
-            'raw_data': {
-                'history_by_browser': all_history,
-                'merged_history': merged_history
-            },
-            'search_analysis': {
-                'queries': search_queries,
-                'analysis': search_analysis,
-                'insights': search_insights
-            },
-            'category_analysis': {
-                'categories': categories,
-                'analysis': category_analysis,
-                'insights': category_insights
-            },
-            'comprehensive_stats': comprehensive_stats
-        }
-        
-        save_to_json(complete_data, f"browser_complete_{date_str}.json")
+        complete_data = build_complete_data(
+            today, available_browsers, all_history, merged_history,
+            search_queries, search_analysis, search_insights,
+            categories, category_analysis, category_insights,
+            comprehensive_stats
+        )
+        
+        save_to_json(complete_data, f"browser_complete_{date_str}.json", rows=len(merged_history))
         
         # 요약 리포트 저장
-        summary_report = {
-            'date': today.strftime('%Y-%m-%d'),
-            'summary': {
-                'total_visits': comprehensive_stats.get('total_visits', 0),
-                'unique_domains': comprehensive_stats.get('unique_domains', 0),
-                'browsers_used': list(browser_stats.keys()) if browser_stats else [],
-                'search_count': len(search_queries),
-                'category_count': category_analysis.get('active_categories', 0)
-            },
-            'highlights': {
-                'top_domains': top_domains[:5] if top_domains else [],
-                'top_searches': [q['query'] for q in search_queries[:5]] if search_queries else [],
-                'top_categories': [(cat, count) for cat, count in top_categories[:5]] if top_categories else [],
-                'peak_hour': peak_hour[0] if hourly_dist else None
-            },
-            'insights': {
-                'search': search_insights[:3] if search_insights else [],
-                'category': category_insights[:3] if category_insights else [],
-                'general': [
-                    f"총 {comprehensive_stats.get('total_visits', 0)}회 웹사이트 방문",
-                    f"{comprehensive_stats.get('unique_domains', 0)}개의 고유 도메인 접속",
-                    f"{len(search_queries)}개의 검색어 사용" if search_queries else "검색 활동 없음"
-                ]
-            }
-        }
-        
-        save_to_json(summary_report, f"browser_summary_{today.strftime('%Y%m%d')}.json")
+        summary_report = build_summary_report(
+            today, search_queries, search_insights,
+            category_analysis, category_insights, comprehensive_stats
+        )
+        
+        save_to_json(summary_report, f"browser_summary_{today.strftime('%Y%m%d')}.json",
+                     rows=summary_report['summary']['total_visits'])
         
         # 카테고리 리포트 텍스트 파일로 저장
         category_report_text = category_analyzer.generate_category_report(categories)
-        report_filepath = os.path.join(os.path.dirname(__file__), "..", "output", f"category_report_{today.strftime('%Y%m%d')}.txt")
-        with open(report_filepath, 'w', encoding='utf-8') as f:
-            f.write(category_report_text)
+        report_filepath = save_text(category_report_text, f"category_report_{today.strftime('%Y%m%d')}.txt")
         print(f"📄 카테고리 리포트 저장됨: {report_filepath}")
         
+        # 전문 검색 색인에 새 기록만 추가
+        update_search_index(all_history, search_queries)
+        
         # === 최종 요약 ===
         print(f"\n" + "=" * 60)
         print("🎉 브라우저 데이터 수집 및 분석 완료!")
@@ -275,5 +228,112 @@ def main():
         print(f"  • 터미널에서 'python3 main.py' 명령어로 실행해보세요")
 
 
+def run_daemon(args):
+    """변경 감지 기반 데몬 모드 실행"""
+    from daemon import BrowserCollectorDaemon
+    
+    daemon = BrowserCollectorDaemon(
+        poll_interval=args.poll_interval,
+        debounce_seconds=args.debounce,
+        flush_interval=args.flush_interval
+    )
+    daemon.run()
+
+
+def run_search(args):
+    """전문 검색 색인에서 방문/검색어 찾기"""
+    with HistorySearchIndex() as index:
+        if args.reindex:
+            result = index.reindex_outputs()
+            print(f"🔄 색인 재구성: complete 파일 {result['files']}개에서 {result['added']}개 기록 추가")
+        
+        if not args.search:
+            stats = index.stats()
+            print(f"📊 색인: 방문 {stats['visits']}개, 검색어 {stats['searches']}개 ({stats['first']} ~ {stats['last']})")
+            return
+        
+        started = datetime.now()
+        results = index.search(args.search, limit=args.limit, browser=args.browser,
+                               since=args.since, until=args.until)
+        elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    
+    print(f"🔎 '{args.search}': {len(results)}건 ({elapsed_ms:.1f}ms)")
+    for result in results:
+        visit_time = result['visit_time'][:19].replace('T', ' ')
+        if result['kind'] == 'search':
+            print(f"  • {visit_time} [{result['browser']}] 🔍 {result['query']} ({result['engine']})")
+        else:
+            print(f"  • {visit_time} [{result['browser']}] {result['title']}")
+            print(f"      {result['url']}")
+
+
+def create_argument_parser():
+    """명령행 인수 파서 생성"""
+    parser = argparse.ArgumentParser(
+        description="Personal Logging Platform - Browser Collector"
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='History 파일 변경을 감시하며 증분 수집하는 데몬 모드로 실행'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=5.0,
+        help='데몬 모드: History 파일 stat 확인 주기(초, 기본값: 5)'
+    )
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=10.0,
+        help='데몬 모드: 변경이 멈춘 뒤 수집까지 기다리는 시간(초, 기본값: 10)'
+    )
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=300.0,
+        help='데몬 모드: 요약 파일 저장 주기(초, 기본값: 300)'
+    )
+    parser.add_argument(
+        '--search',
+        type=str,
+        help='방문 제목/URL/도메인과 검색어에서 찾기 (부분 일치, 한국어 지원)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='검색: 최대 결과 수 (기본값: 20)'
+    )
+    parser.add_argument(
+        '--browser',
+        type=str,
+        help='검색: 특정 브라우저만 (chrome, safari)'
+    )
+    parser.add_argument(
+        '--since',
+        type=str,
+        help='검색: 이 시각 이후 방문만 (YYYY-MM-DD[THH:MM])'
+    )
+    parser.add_argument(
+        '--until',
+        type=str,
+        help='검색: 이 시각까지의 방문만 (YYYY-MM-DD면 그 날 전체 포함)'
+    )
+    parser.add_argument(
+        '--reindex',
+        action='store_true',
+        help='output/의 기존 browser_complete_*.json을 검색 색인에 추가 (이미 색인된 기록은 건너뜀)'
+    )
+    return parser
+
+
 if __name__ == "__main__":
-    main()
+    args = create_argument_parser().parse_args()
+    if args.search or args.reindex:
+        run_search(args)
+    elif args.daemon:
+        run_daemon(args)
+    else:
+        main()
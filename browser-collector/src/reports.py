@@ -0,0 +1,122 @@
+"""
+브라우저 수집 결과 리포트 생성 및 저장
+일회성 실행(main.py)과 데몬 모드(daemon.py)가 같은 출력 형식을 사용하도록 공유하는 모듈
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from typing import List, Dict, Optional
+
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# 출력 카탈로그 등록은 앱 추적기와 같은 공용 훅(common/catalog_hook.py) 사용
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+from common.catalog_hook import register_output  # noqa: E402
+
+
+def save_to_json(data: dict, filename: str, rows: Optional[int] = None) -> str:
+    """데이터를 JSON 파일로 저장하고 출력 카탈로그에 등록"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    register_output(filepath, rows)
+    print(f"💾 데이터 저장됨: {filepath}")
+    return filepath
+
+
+def save_text(content: str, filename: str) -> str:
+    """텍스트 리포트를 파일로 저장하고 출력 카탈로그에 등록"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    register_output(filepath)
+    return filepath
+
+
+def build_complete_data(collection_time: datetime,
+                        available_browsers: List[str],
+                        all_history: Dict[str, List[Dict]],
+                        merged_history: List[Dict],
+                        search_queries: List[Dict],
+                        search_analysis: Dict,
+                        search_insights: List[str],
+                        categories: Dict[str, List[Dict]],
+                        category_analysis: Dict,
+                        category_insights: List[str],
+                        comprehensive_stats: Dict) -> Dict:
+    """browser_complete_*.json 형식의 완전한 데이터 세트 생성"""
+    return {
+        'metadata': {
+            'collection_date': collection_time.strftime('%Y-%m-%d'),
+            'collection_timestamp': collection_time.isoformat(),
+            'available_browsers': available_browsers,
+            'total_records': len(merged_history),
+            'version': '1.0'
+        },
+        'raw_data': {
+            'history_by_browser': all_history,
+            'merged_history': merged_history
+        },
+        'search_analysis': {
+            'queries': search_queries,
+            'analysis': search_analysis,
+            'insights': search_insights
+        },
+        'category_analysis': {
+            'categories': categories,
+            'analysis': category_analysis,
+            'insights': category_insights
+        },
+        'comprehensive_stats': comprehensive_stats
+    }
+
+
+def build_summary_report(collection_time: datetime,
+                         search_queries: List[Dict],
+                         search_insights: List[str],
+                         category_analysis: Dict,
+                         category_insights: List[str],
+                         comprehensive_stats: Dict) -> Dict:
+    """browser_summary_*.json 형식의 일일 요약 리포트 생성"""
+    browser_stats = comprehensive_stats.get('browser_stats', {})
+    top_domains = comprehensive_stats.get('top_domains', [])
+    top_categories = category_analysis.get('top_categories', [])
+    hourly_dist = comprehensive_stats.get('hourly_distribution', {})
+    peak_hour = max(hourly_dist.items(), key=lambda x: x[1]) if hourly_dist else None
+
+    return {
+        'date': collection_time.strftime('%Y-%m-%d'),
+        'summary': {
+            'total_visits': comprehensive_stats.get('total_visits', 0),
+            'unique_domains': comprehensive_stats.get('unique_domains', 0),
+            'browsers_used': list(browser_stats.keys()) if browser_stats else [],
+            'search_count': len(search_queries),
+            'category_count': category_analysis.get('active_categories', 0)
+        },
+        'highlights': {
+            'top_domains': top_domains[:5] if top_domains else [],
+            'top_searches': [q['query'] for q in search_queries[:5]] if search_queries else [],
+            'top_categories': [(cat, count) for cat, count in top_categories[:5]] if top_categories else [],
+            'peak_hour': peak_hour[0] if peak_hour else None
+        },
+        'insights': {
+            'search': search_insights[:3] if search_insights else [],
+            'category': category_insights[:3] if category_insights else [],
+            'general': [
+                f"총 {comprehensive_stats.get('total_visits', 0)}회 웹사이트 방문",
+                f"{comprehensive_stats.get('unique_domains', 0)}개의 고유 도메인 접속",
+                f"{len(search_queries)}개의 검색어 사용" if search_queries else "검색 활동 없음"
+            ]
+        }
+    }
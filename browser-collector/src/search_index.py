@@ -0,0 +1,300 @@
+"""
+방문 기록 전문 검색 색인 (SQLite FTS5)
+방문 제목/URL/도메인과 추출된 검색어를 output/history_index.db에 색인하고,
+수집기(main.py)와 데몬(daemon.py)이 새 기록만 증분으로 추가한다.
+
+한국어 단어는 두 음절인 경우가 많아서 trigram 토크나이저로는 짧은 검색어를 찾을 수 없으므로,
+텍스트를 글자 bigram 토큰으로 바꿔서 색인하고 검색어도 같은 bigram 구(phrase)로 바꿔 찾는다.
+연속된 bigram 구가 일치하면 원문에 그 부분 문자열이 있다는 뜻이라 언어와 관계없이 부분 일치 검색이 된다.
+색인 테이블은 내용을 저장하지 않는(contentless) FTS5 테이블이라 원문은 entries 테이블에만 한 벌 있다.
+"""
+
+import glob
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlparse
+
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output")
+DEFAULT_INDEX_PATH = os.path.join(OUTPUT_DIR, "history_index.db")
+
+# 토큰으로 쓸 글자 묶음 (unicode61 토크나이저와 같게 밑줄은 구분자로 취급)
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# 같은 밀리초에 기록될 수 있는 최대 행 수 (행 id = 방문 시각 밀리초 × 슬롯 수 + 순번)
+_ROWID_SLOTS = 100
+
+# 행 id 계산 방식 버전 (PRAGMA user_version) - 1: 방문 시각을 로컬 시각으로 읽음, 2: UTC로 읽음
+INDEX_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    visit_time TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    domain TEXT,
+    query TEXT,
+    engine TEXT,
+    UNIQUE (kind, browser, url, visit_time)
+);
+CREATE INDEX IF NOT EXISTS entries_visit_time ON entries (visit_time);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (terms, content='', tokenize='unicode61');
+"""
+
+
+def epoch_rowid(epoch: float) -> int:
+    """epoch 초 → 행 id 시작값 (밀리초 × 슬롯 수). 검색 결과를 행 id 역순으로 읽으면 최근 방문 순이 됨"""
+    return int(epoch * 1000) * _ROWID_SLOTS
+
+
+def time_rowid(visit_time: str) -> int:
+    """저장된 방문 시각 → 행 id 시작값
+
+    수집기는 방문 시각을 시간대 없는 UTC로 저장하므로 시간대가 없으면 UTC로 읽는다
+    (로컬 시각으로 읽으면 서머타임이 끝나는 날 한 시간이 겹쳐서 행 id 순서가 뒤집힘).
+    """
+    moment = datetime.fromisoformat(visit_time)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return epoch_rowid(moment.timestamp())
+
+
+def _local_rowid(local_time: str) -> int:
+    """검색 범위로 받은 시각(시간대가 없으면 로컬 시각) → 행 id 시작값"""
+    return epoch_rowid(datetime.fromisoformat(local_time).timestamp())
+
+
+def bigram_terms(text: str) -> str:
+    """텍스트 → 공백으로 구분한 글자 bigram 토큰 (한 글자 단어는 그대로)"""
+    tokens = []
+    for word in _WORD_PATTERN.findall((text or '').lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return ' '.join(tokens)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """검색어 → FTS5 MATCH 식 (단어마다 bigram 구, 단어끼리는 AND). 단어가 없으면 None"""
+    clauses = []
+    for word in _WORD_PATTERN.findall((query or '').lower()):
+        if len(word) == 1:
+            # 한 글자는 그 글자로 시작하는 bigram 접두어로 찾음
+            clauses.append(f'"{word}"*')
+        else:
+            clauses.append('"' + ' '.join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    return ' AND '.join(clauses) if clauses else None
+
+
+class HistorySearchIndex:
+    """방문/검색어 전문 검색 색인"""
+
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        """
+        Args:
+            db_path: 색인 DB 경로 (기본값: browser-collector/output/history_index.db)
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < INDEX_VERSION:
+            self._renumber()
+
+    def _renumber(self):
+        """이전 버전 색인의 행 id를 현재 방식으로 다시 계산 (원문은 entries에 있으므로 수집 파일 없이 재구성)"""
+        rows = [dict(row) for row in self.conn.execute(
+            "SELECT kind, browser, visit_time, url, title, domain, query, engine FROM entries ORDER BY id"
+        )]
+        with self.conn:
+            cursor = self.conn.cursor()
+            if rows:
+                cursor.execute("DELETE FROM entries")
+                cursor.execute("INSERT INTO entries_fts (entries_fts) VALUES ('delete-all')")
+                for row in rows:
+                    self._insert(cursor, row['kind'], row['browser'], row, self._terms(row['kind'], row))
+                print(f"🔎 검색 색인 {len(rows)}개 기록의 행 id를 다시 계산 (색인 버전 {INDEX_VERSION})")
+            cursor.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- 색인 추가 ----
+
+    @staticmethod
+    def _terms(kind: str, record: Dict) -> str:
+        if kind == 'search':
+            return bigram_terms(record.get('query') or '')
+        domain = record.get('domain') or urlparse(record['url']).netloc
+        # URL은 퍼센트 인코딩을 풀어서 색인 (URL 속 한국어도 찾을 수 있게)
+        return bigram_terms(f"{record.get('title') or ''} {unquote(record['url'])} {domain}")
+
+    def _insert(self, cursor: sqlite3.Cursor, kind: str, browser: str, record: Dict, terms: str) -> bool:
+        visit_time = record['visit_time']
+        if cursor.execute(
+            "SELECT 1 FROM entries WHERE kind = ? AND browser = ? AND url = ? AND visit_time = ?",
+            (kind, browser, record['url'], visit_time)
+        ).fetchone():
+            return False
+
+        # 같은 밀리초의 기록끼리만 순번으로 구분 - 행 id가 방문 시각 순서가 됨
+        base = time_rowid(visit_time)
+        last = cursor.execute("SELECT MAX(id) FROM entries WHERE id BETWEEN ? AND ?",
+                              (base, base + _ROWID_SLOTS - 1)).fetchone()[0]
+        rowid = base if last is None else last + 1
+        cursor.execute(
+            "INSERT INTO entries (id, kind, browser, visit_time, url, title, domain, query, engine) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (rowid, kind, browser, visit_time, record['url'], record.get('title'),
+             record.get('domain') or urlparse(record['url']).netloc, record.get('query'), record.get('engine'))
+        )
+        cursor.execute("INSERT INTO entries_fts (rowid, terms) VALUES (?, ?)", (rowid, terms))
+        return True
+
+    def add_visits(self, browser: str, entries: Iterable[Dict]) -> int:
+        """방문 기록 추가 (이미 색인된 (브라우저, URL, 방문 시각)은 건너뜀). 새로 추가된 수 반환"""
+        added = 0
+        with self.conn:
+            cursor = self.conn.cursor()
+            for entry in entries:
+                added += self._insert(cursor, 'visit', entry.get('browser') or browser, entry,
+                                      self._terms('visit', entry))
+        return added
+
+    def add_searches(self, searches: Iterable[Dict]) -> int:
+        """추출된 검색어 추가. 새로 추가된 수 반환"""
+        added = 0
+        with self.conn:
+            cursor = self.conn.cursor()
+            for search in searches:
+                added += self._insert(cursor, 'search', search.get('browser') or 'unknown', search,
+                                      self._terms('search', search))
+        return added
+
+    def add_collection(self, all_history: Dict[str, List[Dict]], search_queries: Iterable[Dict]) -> int:
+        """수집 결과(브라우저별 히스토리 + 검색어)를 한 번에 추가"""
+        added = sum(self.add_visits(browser, entries) for browser, entries in all_history.items())
+        return added + self.add_searches(search_queries)
+
+    def index_complete_file(self, path: str) -> int:
+        """저장된 browser_complete_*.json 하나를 색인 (기존 출력 백필용)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        raw = data.get('raw_data', {})
+        queries = data.get('search_analysis', {}).get('queries', [])
+        return self.add_collection(raw.get('history_by_browser', {}), queries)
+
+    def reindex_outputs(self, output_dir: str = OUTPUT_DIR) -> Dict:
+        """출력 디렉토리의 모든 complete 파일 색인 (이미 색인된 기록은 건너뜀)"""
+        files = sorted(glob.glob(os.path.join(output_dir, "browser_complete_*.json")))
+        added = 0
+        for path in files:
+            added += self.index_complete_file(path)
+        return {'files': len(files), 'added': added}
+
+    # ---- 검색 ----
+
+    def search(self, query: str, limit: int = 20, kind: Optional[str] = None, browser: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """제목/URL/도메인/검색어 부분 일치 검색 (최근 방문 순)
+
+        Args:
+            kind: 'visit' 또는 'search'만 (None이면 둘 다)
+            since/until: 방문 시각 범위 (ISO 형식 로컬 시각, 날짜만 쓰면 until은 그 날 끝까지 포함)
+
+        Returns:
+            [{'kind', 'browser', 'visit_time', 'url', 'title', 'domain', 'query', 'engine'}]
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+
+        # 행 id가 방문 시각 순이므로 시각 범위는 FTS 행 id 범위로 바꾸고, 행 id 역순으로 읽다가
+        # limit개를 채우면 멈춘다 (일치하는 기록 전체를 정렬하지 않음). 범위는 로컬 시각이라
+        # epoch로 바꾼 뒤 행 id를 계산하므로 날짜 범위가 사용자의 로컬 하루와 맞음
+        conditions = ["entries_fts MATCH ?"]
+        params: List = [match]
+        if since:
+            conditions.append("entries_fts.rowid >= ?")
+            params.append(_local_rowid(since))
+        if until:
+            # 날짜만 주면 그 날 전체를 포함
+            until_day = len(until) == 10
+            conditions.append("entries_fts.rowid < ?" if until_day else "entries_fts.rowid <= ?")
+            if until_day:
+                params.append(_local_rowid((datetime.fromisoformat(until) + timedelta(days=1)).isoformat()))
+            else:
+                params.append(_local_rowid(until) + _ROWID_SLOTS - 1)
+        if kind:
+            conditions.append("e.kind = ?")
+            params.append(kind)
+        if browser:
+            conditions.append("e.browser = ?")
+            params.append(browser)
+
+        sql = (
+            "SELECT e.kind, e.browser, e.visit_time, e.url, e.title, e.domain, e.query, e.engine "
+            "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+            f"WHERE {' AND '.join(conditions)} ORDER BY entries_fts.rowid DESC LIMIT ?"
+        )
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def stats(self) -> Dict:
+        """색인된 방문/검색어 수와 기간"""
+        row = self.conn.execute(
+            "SELECT SUM(kind = 'visit'), SUM(kind = 'search'), MIN(visit_time), MAX(visit_time) FROM entries"
+        ).fetchone()
+        return {'visits': row[0] or 0, 'searches': row[1] or 0, 'first': row[2], 'last': row[3]}
+
+
+def update_search_index(all_history: Dict[str, List[Dict]], search_queries: Iterable[Dict],
+                        db_path: str = DEFAULT_INDEX_PATH) -> int:
+    """수집 결과를 색인에 증분 추가 (색인 실패는 수집을 막지 않음). 새로 추가된 수 반환"""
+    try:
+        with HistorySearchIndex(db_path) as index:
+            added = index.add_collection(all_history, search_queries)
+    except sqlite3.Error as e:
+        print(f"⚠️ 검색 색인 갱신 실패: {e}")
+        return 0
+    if added:
+        print(f"🔎 검색 색인에 {added}개 기록 추가")
+    return added
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 임시 DB에 한국어/영어 기록을 넣고 검색
+    import tempfile
+
+    # 수집기처럼 방문 시각은 시간대 없는 UTC로 넣음
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    with HistorySearchIndex(os.path.join(tempfile.mkdtemp(), "history_index.db")) as index:
+        index.add_visits('chrome', [
+            {'url': 'https://github.com/culonculon/personal-logging-platform', 'title': '깃허브 로컬 레포 올리기',
+             'visit_time': now.isoformat()},
+            {'url': 'https://docs.python.org/3/library/bisect.html', 'title': 'bisect — Array bisection algorithm',
+             'visit_time': now.replace(hour=0).isoformat()},
+        ])
+        index.add_searches([{'url': 'https://www.google.com/search?q=sqlite', 'query': 'sqlite 전문 검색',
+                             'engine': 'google', 'browser': 'chrome', 'visit_time': now.isoformat()}])
+
+        for term in ('로컬', '레포 올리', 'bisection', 'python.org', '검색'):
+            results = index.search(term)
+            print(f"🔎 '{term}': {len(results)}건 {[r['title'] or r['query'] for r in results]}")
+        print(f"📊 {index.stats()}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+방문 기록 전문 검색 색인 테스트 (임시 DB 사용)
+"""
+
+import sys
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+# 현재 디렉토리를 Python path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from search_index import HistorySearchIndex, bigram_terms, build_match_query
+
+
+@contextmanager
+def local_timezone(name):
+    """테스트 동안만 로컬 시간대 변경 (TZ 환경 변수 + time.tzset)"""
+    previous = os.environ.get('TZ')
+    os.environ['TZ'] = name
+    time.tzset()
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = previous
+        time.tzset()
+
+
+def test_korean_bigram_search():
+    """한국어 bigram 부분 일치 검색 테스트"""
+    print("🧪 검색 색인 테스트 시작")
+
+    assert bigram_terms('깃허브 로컬') == '깃허 허브 로컬'
+    assert build_match_query('레포 올리') == '"레포" AND "올리"'
+    assert build_match_query('깃') == '"깃"*'
+
+    db_path = os.path.join(tempfile.mkdtemp(), "history_index.db")
+    with HistorySearchIndex(db_path) as index:
+        index.add_visits('chrome', [
+            {'url': 'https://github.com/culonculon/personal-logging-platform', 'title': '깃허브 로컬 레포 올리기',
+             'visit_time': '2025-08-17T01:00:00'},
+            {'url': 'https://www.youtube.com/watch?v=1', 'title': '로컬푸드 레시피',
+             'visit_time': '2025-08-17T02:00:00'},
+            {'url': 'https://docs.python.org/3/library/bisect.html', 'title': 'bisect — Array bisection',
+             'visit_time': '2025-08-16T23:00:00'},
+        ])
+        index.add_searches([{'url': 'https://www.google.com/search?q=x', 'query': '파이썬 정렬 알고리즘',
+                             'engine': 'google', 'browser': 'chrome', 'visit_time': '2025-08-17T03:00:00'}])
+
+        def titles(query, **options):
+            return [r['title'] or r['query'] for r in index.search(query, **options)]
+
+        # 두 음절 단어, 단어 중간 부분 문자열, 최근 방문 순
+        assert titles('로컬') == ['로컬푸드 레시피', '깃허브 로컬 레포 올리기'], titles('로컬')
+        assert titles('허브') == ['깃허브 로컬 레포 올리기']
+        assert titles('레포 올리') == ['깃허브 로컬 레포 올리기']
+        # bigram 구가 연속해야 일치 ('로컬레포'는 원문에 없음)
+        assert titles('로컬레포') == []
+        assert titles('정렬', kind='search') == ['파이썬 정렬 알고리즘']
+        assert titles('깃') == ['깃허브 로컬 레포 올리기']
+        assert titles('bisection') == ['bisect — Array bisection']
+
+        # 저장된 방문 시각은 UTC, since/until은 로컬 시각 (KST = UTC+9)
+        with local_timezone('Asia/Seoul'):
+            assert titles('로컬', since='2025-08-17T10:30:00') == ['로컬푸드 레시피']
+            # UTC 8월 16일 23시 방문은 로컬 날짜로 8월 17일
+            assert titles('bisection', since='2025-08-17') == ['bisect — Array bisection']
+            assert titles('bisection', until='2025-08-16') == []
+
+        # 같은 기록을 다시 넣어도 중복 색인되지 않음
+        assert index.add_visits('chrome', [{'url': 'https://www.youtube.com/watch?v=1', 'title': '로컬푸드 레시피',
+                                            'visit_time': '2025-08-17T02:00:00'}]) == 0
+        assert index.stats()['visits'] == 3
+
+        # 이전 버전 색인(로컬 시각 기준 행 id)은 열 때 행 id를 다시 계산
+        index.conn.execute("PRAGMA user_version = 1")
+        index.conn.commit()
+
+    with HistorySearchIndex(db_path) as index:
+        assert index.conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        assert index.stats()['visits'] == 3 and index.stats()['searches'] == 1
+        assert [r['title'] for r in index.search('로컬')] == ['로컬푸드 레시피', '깃허브 로컬 레포 올리기']
+
+    print("✅ 한국어 bigram 검색 테스트 통과")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        success = test_korean_bigram_search()
+    except AssertionError as e:
+        print(f"❌ 테스트 실패: {e}")
+        success = False
+    sys.exit(0 if success else 1)
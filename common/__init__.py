@@ -0,0 +1 @@
+# 수집기(browser-collector, app-tracker)가 함께 쓰는 모듈
@@ -0,0 +1,32 @@
+"""
+데이터 통합기 출력 카탈로그 연동 (수집기 공용)
+브라우저 수집기와 앱 추적기가 출력 파일을 쓸 때 data-aggregator의 카탈로그
+(output/catalog/catalog.json)에 등록해서 통합기가 디렉토리를 glob 하지 않고 날짜별 파일을 바로 찾을 수 있게 함
+
+카탈로그 모듈은 data-aggregator 패키지를 import 하지 않고 파일 경로로 한 번만 로드한다.
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CATALOG_MODULE = PROJECT_ROOT / "data-aggregator" / "src" / "catalog" / "output_catalog.py"
+
+_catalog_module = None
+
+
+def register_output(filepath: str, rows: Optional[int] = None):
+    """출력 파일을 카탈로그에 등록 (data-aggregator가 없으면 건너뜀)"""
+    global _catalog_module
+    try:
+        if _catalog_module is None:
+            if not CATALOG_MODULE.exists():
+                return
+            spec = importlib.util.spec_from_file_location("plp_output_catalog", CATALOG_MODULE)
+            _catalog_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(_catalog_module)
+        _catalog_module.register_output(str(PROJECT_ROOT), filepath, rows)
+    except Exception as e:
+        # 카탈로그는 통합기가 refresh()로 다시 만들 수 있으므로 수집은 계속 진행
+        print(f"⚠️ 출력 카탈로그 등록 실패: {e}")
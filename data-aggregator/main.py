@@ -15,10 +15,13 @@ Author: Personal Data Engineer
 
 import argparse
 import json
+import os
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
 # 프로젝트 루트 추가
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -28,6 +31,60 @@ sys.path.append(str(DATA_AGGREGATOR_ROOT))
 
 from src.integrators.data_integrator import DataIntegrator
 from src.generators.obsidian_generator import ObsidianNoteGenerator
+from src.catalog import OutputCatalog, RetentionJob, StageCache
+from src.catalog.stage_cache import file_sha256
+from src.analyzers.period_rollup import PERIOD_KINDS, day_contribution
+
+
+# 병렬 작업자 프로세스마다 한 번 만들어서 재사용하는 컴포넌트 (_init_range_worker에서 설정)
+_worker_components = None
+
+
+def _init_range_worker(project_root: str, catalog_snapshot: Dict, templates: Dict[str, str]):
+    """프로세스 풀 작업자 초기화 - 부모가 갱신한 카탈로그와 읽어 둔 템플릿을 공유받음"""
+    global _worker_components
+    catalog = OutputCatalog(project_root, snapshot=catalog_snapshot)
+    integrator = DataIntegrator(project_root, catalog=catalog)
+    template_dir = Path(project_root) / "data-aggregator" / "templates"
+    output_dir = Path(project_root) / "data-aggregator" / "output"
+    generator = ObsidianNoteGenerator(str(template_dir), str(output_dir), templates=templates)
+    _worker_components = (integrator, generator)
+
+
+def _process_day(date: str, vault_path: Optional[str], template: str) -> Dict:
+    """작업자에서 하루치 통합 → 저장 → 노트 생성 (단계별 소요 시간 포함)
+
+    카탈로그 등록과 기간 롤업 반영은 부모 프로세스가 결과를 모아 한 번에 한다
+    (카탈로그/롤업 파일 동시 쓰기 방지).
+    """
+    integrator, generator = _worker_components
+    result = {'date': date, 'success': False, 'outputs': {}, 'timings': {}, 'error': None}
+    started = time.perf_counter()
+    
+    try:
+        step = time.perf_counter()
+        integrated_data = integrator.integrate_daily_data(date)
+        result['timings']['integrate'] = round(time.perf_counter() - step, 4)
+        
+        step = time.perf_counter()
+        result['outputs']['integration_file'] = integrator.save_integrated_data(integrated_data, register=False)
+        result['timings']['save'] = round(time.perf_counter() - step, 4)
+        result['rollup_contribution'] = day_contribution(integrated_data)
+        
+        step = time.perf_counter()
+        result['outputs']['daily_note'] = generator.generate_daily_note(integrated_data, template)
+        if vault_path:
+            result['outputs']['vault_note'] = generator.create_obsidian_vault_note(
+                integrated_data, vault_path, template
+            )
+        result['timings']['note'] = round(time.perf_counter() - step, 4)
+        
+        result['success'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    
+    result['timings']['total'] = round(time.perf_counter() - started, 4)
+    return result
 
 
 class PersonalLoggingPlatform:
@@ -50,16 +107,33 @@ class PersonalLoggingPlatform:
         output_dir = self.project_root / "data-aggregator" / "output"
         self.note_generator = ObsidianNoteGenerator(str(template_dir), str(output_dir))
         
+        # 단계 캐시 - 단계별 코드 버전은 그 단계를 구현한 소스 파일 해시
+        src_dir = DATA_AGGREGATOR_ROOT / "src"
+        self.stage_cache = StageCache(
+            str(output_dir / "catalog" / "stage_cache.json"),
+            stage_code={
+                'integrate': [src_dir / "integrators"],
+                'analyze': [src_dir / "integrators", src_dir / "analyzers"],
+                'render': [src_dir / "generators"],
+                'vault-write': [src_dir / "generators"]
+            }
+        )
+        
         print(f"🚀 Personal Logging Platform 초기화 완료")
         print(f"📁 프로젝트 루트: {self.project_root}")
     
-    def run_full_pipeline(self, target_date: str = None, vault_path: str = None, template: str = "daily_note_template.md") -> Dict:
+    def run_full_pipeline(self, target_date: str = None, vault_path: str = None,
+                          template: str = "daily_note_template.md", force: bool = False) -> Dict:
         """전체 파이프라인 실행
         
+        단계(integrate → analyze → render → vault-write)마다 입력 해시, 템플릿 해시, 코드 버전이
+        지난 실행과 같고 출력 파일이 그대로면 건너뛴다.
+        
         Args:
             target_date: YYYY-MM-DD 형식 날짜. None이면 최신 데이터
             vault_path: 옵시디언 Vault 경로. None이면 일반 출력만
             template: 사용할 템플릿 파일명
+            force: True면 단계 캐시를 무시하고 모든 단계를 다시 실행
             
         Returns:
             실행 결과 딕셔너리
@@ -78,26 +152,67 @@ class PersonalLoggingPlatform:
             'errors': []
         }
         
+        cache = self.stage_cache
+        cache.results.clear()
+        integrated_data = None
+        
         try:
-            # Step 1: 데이터 통합
+            # Step 1: 데이터 통합 (소스 로드) - 입력 파일 해시는 카탈로그에서 가져옴
             print("\n🔄 Step 1: 데이터 통합")
             print("-" * 30)
-            integrated_data = self.data_integrator.integrate_daily_data(target_date)
+            fingerprint = self.data_integrator.source_fingerprint(target_date)
+            scope = fingerprint['date']
             
-            if not integrated_data:
-                raise Exception("데이터 통합 실패")
+            key = cache.key('integrate', inputs=fingerprint['inputs'])
+            hit = cache.lookup('integrate', scope, key, force)
+            sources = None
+            if hit:
+                sources_digest = hit['outputs']['sources']
+                print(f"♻️  소스 변경 없음 - 캐시 사용 ({scope})")
+            else:
+                sources = self.data_integrator.load_sources(target_date)
+                sources_digest = self.data_integrator.store_sources(sources)
+                cache.store('integrate', scope, key, {'sources': sources_digest})
+            
+            # Step 1b: 통합 분석 + 통합 데이터 저장
+            key = cache.key('analyze', sources=sources_digest)
+            hit = cache.lookup('analyze', scope, key, force)
+            if hit:
+                integration_output_path = hit['outputs']['integration_file']
+                content_digest = hit['outputs']['content_sha256']
+                print(f"♻️  분석 결과 변경 없음 - 캐시 사용: {integration_output_path}")
+            else:
+                if sources is None:
+                    sources = self.data_integrator.load_stored_sources(sources_digest)
+                integrated_data = self.data_integrator.analyze(sources)
+                integration_output_path = self.data_integrator.save_integrated_data(integrated_data)
+                content_digest = self.data_integrator.load_content_hash(integration_output_path)
+                files = {'integration_file': integration_output_path}
+                if integrated_data.get('timeline_index'):
+                    files['timeline_index'] = str(self.data_integrator.timeline_index_path(integrated_data['date']))
+                cache.store('analyze', scope, key,
+                            {'integration_file': integration_output_path, 'content_sha256': content_digest},
+                            files=files)
             
             results['steps']['data_integration'] = '✅ 완료'
             results['outputs']['integrated_data'] = integrated_data
-            
-            # 통합 데이터 저장
-            integration_output_path = self.data_integrator.save_integrated_data(integrated_data)
             results['outputs']['integration_file'] = integration_output_path
             
             # Step 2: Daily Note 생성
             print(f"\n📝 Step 2: Daily Note 생성")
             print("-" * 30)
-            note_path = self.note_generator.generate_daily_note(integrated_data, template)
+            template_hash = file_sha256(str(self.note_generator.template_dir / template))
+            key = cache.key('render', content=content_digest, template=template, template_sha256=template_hash)
+            hit = cache.lookup('render', scope, key, force)
+            if hit:
+                note_path = hit['outputs']['daily_note']
+                print(f"♻️  노트 변경 없음 - 캐시 사용: {note_path}")
+            else:
+                if integrated_data is None:
+                    integrated_data = self.data_integrator.load_integrated_data(integration_output_path)
+                note_path = self.note_generator.generate_daily_note(integrated_data, template)
+                cache.store('render', scope, key, {'daily_note': note_path, 'note_sha256': file_sha256(note_path)},
+                            files={'daily_note': note_path}, hash_files=True)
             
             results['steps']['note_generation'] = '✅ 완료'
             results['outputs']['daily_note'] = note_path
@@ -106,9 +221,21 @@ class PersonalLoggingPlatform:
             if vault_path:
                 print(f"\n📓 Step 3: 옵시디언 Vault 연동")
                 print("-" * 30)
-                vault_note_path = self.note_generator.create_obsidian_vault_note(
-                    integrated_data, vault_path, template
-                )
+                note_hash = cache.entries[f"render:{scope}"]['outputs']['note_sha256']
+                key = cache.key('vault-write', note_sha256=note_hash,
+                                vault_path=str(Path(vault_path).expanduser().resolve()))
+                hit = cache.lookup('vault-write', scope, key, force)
+                if hit:
+                    vault_note_path = hit['outputs']['vault_note']
+                    print(f"♻️  Vault 노트 변경 없음 - 캐시 사용: {vault_note_path}")
+                else:
+                    if integrated_data is None:
+                        integrated_data = self.data_integrator.load_integrated_data(integration_output_path)
+                    vault_note_path = self.note_generator.create_obsidian_vault_note(
+                        integrated_data, vault_path, template
+                    )
+                    cache.store('vault-write', scope, key, {'vault_note': vault_note_path},
+                                files={'vault_note': vault_note_path}, hash_files=True)
                 results['steps']['vault_integration'] = '✅ 완료'
                 results['outputs']['vault_note'] = vault_note_path
             else:
@@ -116,14 +243,21 @@ class PersonalLoggingPlatform:
             
             results['success'] = True
             
-            # 결과 요약 출력
-            self._print_pipeline_summary(results, integrated_data)
-            
         except Exception as e:
             error_msg = f"파이프라인 실행 실패: {str(e)}"
             print(f"❌ {error_msg}")
             results['errors'].append(error_msg)
             results['success'] = False
+        finally:
+            cache.save()
+        
+        results['cache'] = cache.report()
+        
+        if results['success']:
+            # 결과 요약 출력 (모든 단계가 캐시 적중이면 저장된 통합 문서로 요약)
+            if integrated_data is None:
+                integrated_data = self.data_integrator.load_integrated_data(results['outputs']['integration_file'])
+            self._print_pipeline_summary(results, integrated_data)
         
         return results
     
@@ -166,6 +300,12 @@ class PersonalLoggingPlatform:
                 if focus_areas:
                     print(f"   🎯 주요 집중 영역: {', '.join(focus_areas)}")
         
+        # 단계 캐시 적중 정보
+        cache_report = results.get('cache')
+        if cache_report and cache_report['total']:
+            stages = ', '.join(f"{stage} {result}" for stage, result in cache_report['stages'].items())
+            print(f"\n♻️  단계 캐시: {cache_report['hits']}/{cache_report['total']} 적중 ({stages})")
+        
         # 출력 파일 정보
         print(f"\n📁 생성된 파일:")
         for key, path in results['outputs'].items():
@@ -181,6 +321,306 @@ class PersonalLoggingPlatform:
         
         print("\n✨ 수고하셨습니다! 내일도 좋은 하루 되세요! 🌟")
     
+    def run_date_range(self, start_date: str, end_date: str, vault_path: str = None,
+                       template: str = "daily_note_template.md", workers: int = None) -> Dict:
+        """기간 내 날짜들을 프로세스 풀에서 병렬로 통합하고 노트 생성 (백필)
+        
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD, 포함)
+            end_date: 끝 날짜 (YYYY-MM-DD, 포함)
+            vault_path: 옵시디언 Vault 경로. None이면 일반 출력만
+            template: 사용할 템플릿 파일명
+            workers: 작업자 프로세스 수. None이면 CPU 코어 수
+            
+        Returns:
+            실행 보고서 (날짜별 결과와 단계별 소요 시간, 보고서 파일 경로)
+        """
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if start > end:
+            raise ValueError(f"시작 날짜가 끝 날짜보다 늦습니다: {start_date} > {end_date}")
+        
+        # 카탈로그는 부모에서 한 번만 갱신하고 작업자들은 그 스냅샷을 공유
+        catalog = self.data_integrator.catalog
+        catalog.refresh()
+        
+        dates: List[str] = []
+        skipped: List[str] = []
+        day = start
+        while day <= end:
+            date = day.strftime('%Y-%m-%d')
+            if catalog.latest(date, 'browser', 'summary') or catalog.latest(date, 'app', 'summary'):
+                dates.append(date)
+            else:
+                skipped.append(date)
+            day += timedelta(days=1)
+        
+        workers = max(1, min(workers or os.cpu_count() or 1, len(dates) or 1))
+        templates = {template: self.note_generator.load_template(template)}
+        
+        print(f"\n🎯 기간 통합 시작: {start_date} ~ {end_date}")
+        print(f"📅 처리할 날짜: {len(dates)}일 (데이터 없음: {len(skipped)}일), 작업자: {workers}개")
+        print("=" * 60)
+        
+        started = time.perf_counter()
+        day_results: List[Dict] = []
+        if dates:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_range_worker,
+                                     initargs=(str(self.project_root), catalog.snapshot(), templates)) as pool:
+                futures = {pool.submit(_process_day, date, vault_path, template): date for date in dates}
+                for future in as_completed(futures):
+                    result = future.result()
+                    day_results.append(result)
+                    status = '✅' if result['success'] else f"❌ {result['error']}"
+                    print(f"   {status} {result['date']} ({result['timings']['total']:.2f}초)")
+        wall_seconds = time.perf_counter() - started
+        
+        # 작업자가 쓴 통합 파일은 부모가 한 번에 카탈로그에 등록하고 기간 롤업에 반영
+        contributions = []
+        for result in day_results:
+            integration_file = result['outputs'].get('integration_file')
+            if integration_file:
+                catalog.register(integration_file)
+            contribution = result.pop('rollup_contribution', None)
+            if contribution:
+                contributions.append(contribution)
+        catalog.save()
+        updated_rows = self.data_integrator.rollups.apply_days(contributions)
+        
+        day_results.sort(key=lambda r: r['date'])
+        busy_seconds = sum(r['timings']['total'] for r in day_results)
+        report = {
+            'from': start_date,
+            'to': end_date,
+            'timestamp': datetime.now().isoformat(),
+            'workers': workers,
+            'template': template,
+            'vault_path': vault_path,
+            'days': day_results,
+            'skipped_dates': skipped,
+            'updated_rollups': [f"{row['kind']} {row['period']}" for row in updated_rows],
+            'totals': {
+                'processed': len(day_results),
+                'succeeded': sum(1 for r in day_results if r['success']),
+                'failed': sum(1 for r in day_results if not r['success']),
+                'skipped': len(skipped),
+                'wall_seconds': round(wall_seconds, 4),
+                'busy_seconds': round(busy_seconds, 4),
+                # 날짜별 처리 시간 합 / 벽시계 시간 (병렬화 효과)
+                'speedup': round(busy_seconds / wall_seconds, 2) if wall_seconds > 0 else None
+            }
+        }
+        
+        runs_dir = self.project_root / "data-aggregator" / "output" / "runs"
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        report_path = runs_dir / (f"range_run_{start_date.replace('-', '')}_{end_date.replace('-', '')}_"
+                                  f"{datetime.now().strftime('%H%M%S')}.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        report['report_path'] = str(report_path)
+        
+        totals = report['totals']
+        print("\n" + "=" * 60)
+        print(f"🎉 기간 통합 완료: 성공 {totals['succeeded']}일, 실패 {totals['failed']}일, 건너뜀 {totals['skipped']}일")
+        print(f"⏱️  벽시계 {totals['wall_seconds']:.2f}초, 날짜별 합계 {totals['busy_seconds']:.2f}초")
+        print(f"📄 실행 보고서: {report_path}")
+        
+        return report
+    
+    def render_notes_range(self, start_date: str, end_date: str,
+                           template: str = "daily_note_template.md") -> Dict:
+        """기간 내 저장된 통합 데이터로 Daily Note를 일괄 재생성 (다시 통합하지 않음)
+        
+        템플릿은 한 번만 컴파일하고, 렌더링 결과가 같은 노트는 다시 쓰지 않는다.
+        """
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if start > end:
+            raise ValueError(f"시작 날짜가 끝 날짜보다 늦습니다: {start_date} > {end_date}")
+        
+        self.data_integrator.catalog.refresh()
+        integration_files = []
+        day = start
+        while day <= end:
+            integration_file = self.data_integrator.latest_integration_file(day.strftime('%Y-%m-%d'))
+            if integration_file:
+                integration_files.append(integration_file)
+            day += timedelta(days=1)
+        
+        print(f"📝 노트 일괄 재생성: {start_date} ~ {end_date} (통합 데이터 {len(integration_files)}일)")
+        
+        # 통합 문서는 하나씩 로드해서 바로 렌더링 (전체를 메모리에 올리지 않음)
+        integrated_docs = (self.data_integrator.load_integrated_data(path) for path in integration_files)
+        return self.note_generator.render_daily_notes(integrated_docs, template)
+    
+    def backfill_vault(self, vault_path: str, start_date: str, end_date: str,
+                       template: str = "daily_note_template.md", concurrency: int = 4) -> Dict:
+        """기간 내 Vault의 빠졌거나 오래된 Daily Note를 채우기 (동시 작업 수 제한)
+        
+        노트가 없거나 통합 파일/템플릿보다 오래된 날짜만 렌더링하고,
+        렌더링 결과가 기존 노트와 같으면 쓰지 않는다.
+        
+        Args:
+            concurrency: 동시에 렌더링/쓰기 할 최대 작업 수
+            
+        Returns:
+            {'written', 'unchanged', 'up_to_date', 'no_data', 'failed', 'elapsed_seconds'}
+        """
+        vault = Path(vault_path).expanduser()
+        if not vault.exists():
+            raise FileNotFoundError(f"옵시디언 Vault를 찾을 수 없습니다: {vault}")
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if start > end:
+            raise ValueError(f"시작 날짜가 끝 날짜보다 늦습니다: {start_date} > {end_date}")
+        
+        self.data_integrator.catalog.refresh()
+        template_path = self.note_generator.template_dir / template
+        template_mtime = template_path.stat().st_mtime if template_path.exists() else 0
+        
+        report = {'written': [], 'unchanged': [], 'up_to_date': [], 'no_data': [], 'failed': []}
+        pending = []
+        day = start
+        while day <= end:
+            date = day.strftime('%Y-%m-%d')
+            day += timedelta(days=1)
+            integration_file = self.data_integrator.latest_integration_file(date)
+            if integration_file is None:
+                report['no_data'].append(date)
+                continue
+            
+            note_path = self.note_generator.vault_note_path(str(vault), date)
+            try:
+                note_mtime = note_path.stat().st_mtime
+            except OSError:
+                note_mtime = None
+            if note_mtime is not None and note_mtime >= max(Path(integration_file).stat().st_mtime, template_mtime):
+                report['up_to_date'].append(date)
+                continue
+            pending.append((date, integration_file))
+        
+        print(f"📓 Vault 백필: {start_date} ~ {end_date} - 대상 {len(pending)}일, "
+              f"최신 {len(report['up_to_date'])}일, 데이터 없음 {len(report['no_data'])}일 (동시 {concurrency}개)")
+        
+        def fill(integration_file: str) -> str:
+            integrated_data = self.data_integrator.load_integrated_data(integration_file)
+            _, written = self.note_generator.write_vault_note(integrated_data, str(vault), template)
+            return 'written' if written else 'unchanged'
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {pool.submit(fill, integration_file): date for date, integration_file in pending}
+            for future in as_completed(futures):
+                date = futures[future]
+                try:
+                    report[future.result()].append(date)
+                except Exception as e:
+                    report['failed'].append(date)
+                    print(f"   ❌ {date}: {str(e)}")
+        report['elapsed_seconds'] = round(time.perf_counter() - started, 4)
+        
+        for key in ('written', 'unchanged', 'failed'):
+            report[key].sort()
+        print(f"✅ Vault 백필 완료: 작성 {len(report['written'])}개, 변경 없음 {len(report['unchanged'])}개, "
+              f"실패 {len(report['failed'])}개 ({report['elapsed_seconds']:.2f}초)")
+        return report
+    
+    def show_period_rollups(self, kind: str, start_date: str = None, end_date: str = None) -> List[Dict]:
+        """미리 계산된 주간/월간 롤업 행 표시 (기간을 생략하면 저장된 전체 기간)"""
+        rollups = self.data_integrator.rollups
+        if start_date or end_date:
+            rows = rollups.rows_between(kind, start_date or end_date, end_date or start_date)
+        else:
+            rows = [rollups.get(kind, period) for period in rollups.periods(kind)]
+            rows = [row for row in rows if row]
+        
+        label = '주간' if kind == 'weekly' else '월간'
+        print(f"\n📆 {label} 롤업: {len(rows)}개 기간")
+        print("-" * 40)
+        for row in rows:
+            totals = row['totals']
+            print(f"🗓️  {row['period']} ({row['start']} ~ {row['end']}, 데이터 {row['day_count']}일)")
+            print(f"   🌐 방문 {totals['browser_visits']}회, 검색 {totals['search_count']}회")
+            if row['top_domains']:
+                domains = ', '.join(f"{domain}({count})" for domain, count in row['top_domains'][:5])
+                print(f"   🔗 상위 도메인: {domains}")
+            if row['top_categories']:
+                categories = ', '.join(f"{category}({count})" for category, count in row['top_categories'][:5])
+                print(f"   🏷️  카테고리: {categories}")
+            if totals['app_minutes']:
+                top_apps = sorted(totals['app_minutes'].items(), key=lambda item: item[1], reverse=True)[:5]
+                print(f"   📱 앱 사용: {', '.join(f'{app} {minutes:.0f}분' for app, minutes in top_apps)}")
+            if row['productivity_score'] is not None:
+                print(f"   💪 평균 생산성 점수: {row['productivity_score']}/100")
+        
+        return rows
+    
+    def lookup_time(self, when: str, window_minutes: float = 10) -> Dict:
+        """시점 조회 - 그 시각에 앞에 있던 앱, 주변 방문, 검색어 (날짜별 색인에서 bisect)
+        
+        Args:
+            when: YYYY-MM-DDTHH:MM[:SS] 형식 시각
+            window_minutes: 주변 방문/검색어를 찾을 앞뒤 시간(분)
+        """
+        moment = datetime.fromisoformat(when)
+        index = self.data_integrator.load_timeline_index(moment.strftime('%Y-%m-%d'))
+        result = index.at(moment, window_minutes)
+        
+        print(f"\n🕑 {result['time']}에 하던 일 (앞뒤 {window_minutes:g}분)")
+        print("-" * 40)
+        app = result['active_app']
+        if app:
+            print(f"📱 앱: {app['app_name']} ({app['start'][11:16]} ~ {app['end'][11:16]}"
+                  f"{', ' + app['category'] if app.get('category') else ''})")
+        else:
+            print("📱 앱: 기록 없음")
+        
+        last_visit = result['last_visit']
+        if last_visit:
+            print(f"🌐 직전 방문: {last_visit['time'][11:19]} {last_visit['title'] or last_visit['domain']}")
+        
+        print(f"🔗 주변 방문: {len(result['nearby_visits'])}개")
+        for visit in result['nearby_visits'][:10]:
+            print(f"   • {visit['time'][11:19]} {visit['domain']} - {visit['title'] or visit['url']}")
+        
+        if result['searches']:
+            print(f"🔍 검색어:")
+            for search in result['searches']:
+                print(f"   • {search['time'][11:19]} {search['query']} ({search['engine']})")
+        
+        return result
+    
+    def run_retention(self, keep_days: int, dry_run: bool = False) -> Dict:
+        """보존 기간 정리 - keep_days일이 지난 원시 파일을 월간 아카이브로 합치고 삭제
+        
+        Args:
+            keep_days: 원시 파일을 보존할 일 수 (오늘 포함)
+            dry_run: True면 대상만 보여주고 파일은 바꾸지 않음
+        """
+        job = RetentionJob(str(self.project_root), keep_days, catalog=self.data_integrator.catalog,
+                           stage_cache=self.stage_cache)
+        report = job.run(dry_run=dry_run)
+        
+        print(f"\n🧹 보존 기간 정리{' (미리보기)' if dry_run else ''}: {keep_days}일 (기준 {report['cutoff']} 이전)")
+        print("-" * 40)
+        if not report['days']:
+            print("✅ 정리할 날짜가 없습니다")
+        else:
+            print(f"📅 대상: {report['days']}일 ({', '.join(report['months'])})")
+            print(f"🗑️  {'삭제될' if dry_run else '삭제된'} 파일: {report['removed_files']}개 "
+                  f"({report['removed_bytes'] / 1024:.1f}KB)")
+            for path in report['archives']:
+                print(f"   📦 {path}")
+            if report['archives']:
+                print(f"📦 아카이브 크기: {report['archive_bytes'] / 1024:.1f}KB")
+        
+        swept = report['swept']
+        if any(swept[key] for key in ('cache_entries', 'objects', 'run_reports')):
+            print(f"🧽 참조가 끊긴 파생 데이터: 객체 {swept['objects']}개, 단계 캐시 항목 {swept['cache_entries']}개, "
+                  f"실행 보고서 {swept['run_reports']}개 ({swept['bytes'] / 1024:.1f}KB)")
+        
+        return report
+    
     def run_data_integration_only(self, target_date: str = None) -> Dict:
         """데이터 통합만 실행"""
         print(f"🔄 데이터 통합만 실행 (날짜: {target_date or '최신'})")
@@ -203,9 +643,8 @@ class PersonalLoggingPlatform:
         print(f"📝 노트 생성만 실행 (통합 데이터: {integration_file})")
         
         try:
-            # 통합 데이터 로드
-            with open(integration_file, 'r', encoding='utf-8') as f:
-                integrated_data = json.load(f)
+            # 통합 데이터 로드 (객체 저장소 참조는 실제 페이로드로 복원)
+            integrated_data = self.data_integrator.load_integrated_data(integration_file)
             
             # 노트 생성
             note_path = self.note_generator.generate_daily_note(integrated_data)
@@ -235,45 +674,32 @@ class PersonalLoggingPlatform:
         available_data = {
             'browser_data': [],
             'app_data': [],
-            'integrated_data': []
+            'integrated_data': [],
+            'archived_months': []
         }
         
-        # 브라우저 데이터 스캔
-        browser_path = self.project_root / "browser-collector" / "output"
-        if browser_path.exists():
-            browser_files = list(browser_path.glob("browser_summary_*.json"))
-            for file in browser_files:
-                date_match = file.stem.split('_')[-1]  # 20250817
-                if len(date_match) == 8:
-                    formatted_date = f"{date_match[:4]}-{date_match[4:6]}-{date_match[6:]}"
-                    available_data['browser_data'].append({
-                        'date': formatted_date,
-                        'file': str(file)
-                    })
-        
-        # 앱 데이터 스캔
-        app_path = self.project_root / "app-tracker" / "output"
-        if app_path.exists():
-            app_files = list(app_path.glob("app_summary_*.json"))
-            for file in app_files:
-                date_match = file.stem.split('_')[-1]
-                if len(date_match) == 8:
-                    formatted_date = f"{date_match[:4]}-{date_match[4:6]}-{date_match[6:]}"
-                    available_data['app_data'].append({
-                        'date': formatted_date,
-                        'file': str(file)
-                    })
-        
-        # 통합 데이터 스캔
-        integration_path = self.project_root / "data-aggregator" / "output"
-        if integration_path.exists():
-            integration_files = list(integration_path.glob("integrated_data_*.json"))
-            for file in integration_files:
+        # 출력 카탈로그에서 조회 (디렉토리 mtime이 바뀐 경우만 다시 스캔)
+        catalog = self.data_integrator.catalog
+        catalog.refresh()
+        
+        for source, key in (('browser', 'browser_data'), ('app', 'app_data')):
+            for date in catalog.dates(source, 'summary'):
+                available_data[key].append({
+                    'date': date,
+                    'file': str(catalog.path_of(source, catalog.latest(date, source, 'summary')))
+                })
+        
+        for date in catalog.dates('integrated'):
+            for entry in catalog.files(date, 'integrated', 'integrated'):
                 available_data['integrated_data'].append({
-                    'file': str(file),
-                    'modified': datetime.fromtimestamp(file.stat().st_mtime).strftime('%Y-%m-%d %H:%M')
+                    'file': str(catalog.path_of('integrated', entry)),
+                    'modified': datetime.fromtimestamp(entry['mtime']).strftime('%Y-%m-%d %H:%M')
                 })
         
+        # 보존 기간 정리로 월간 아카이브에 합쳐진 달 (아카이브 항목은 그 달 1일에 등록됨)
+        available_data['archived_months'] = sorted({date[:7] for date in catalog.dates('browser', 'archive')} |
+                                                   {date[:7] for date in catalog.dates('app', 'archive')})
+        
         # 결과 출력
         print("\n📋 사용 가능한 데이터:")
         print("-" * 40)
@@ -300,6 +726,9 @@ class PersonalLoggingPlatform:
         else:
             print("\n🔗 통합 데이터: 없음")
         
+        if available_data['archived_months']:
+            print(f"\n📦 아카이브된 달: {', '.join(available_data['archived_months'])}")
+        
         return available_data
 
 
@@ -315,6 +744,14 @@ def create_argument_parser():
     python main.py --vault-path ~/Obsidian/MyVault   # 옵시디언 Vault에 직접 저장
     python main.py --list                            # 사용 가능한 데이터 목록 보기
     python main.py --integration-only                # 데이터 통합만 실행
+    python main.py --force                           # 단계 캐시 무시하고 전체 다시 실행
+    python main.py --from 2025-08-01 --to 2025-08-31 # 기간 백필 (날짜별 병렬 처리)
+    python main.py --rollup weekly                   # 주간 롤업 보기 (--from/--to로 기간 지정 가능)
+    python main.py --at 2025-08-17T14:30             # 그 시각에 하던 일 (앱, 주변 방문, 검색어)
+    python main.py --retention 90 --dry-run          # 90일이 지난 원시 파일 정리 대상 미리보기
+    python main.py --render-notes --from 2025-01-01 --to 2025-12-31  # 저장된 통합 데이터로 노트만 일괄 재생성
+    python main.py --backfill-vault --vault-path ~/Obsidian/MyVault --from 2025-01-01 --to 2025-12-31
+                                                     # Vault의 빠졌거나 오래된 노트 채우기
         """
     )
     
@@ -324,6 +761,70 @@ def create_argument_parser():
         help='처리할 날짜 (YYYY-MM-DD 형식). 지정하지 않으면 최신 데이터 사용'
     )
     
+    parser.add_argument(
+        '--from',
+        dest='from_date',
+        type=str,
+        help='기간 처리 시작 날짜 (YYYY-MM-DD). --to와 함께 사용'
+    )
+    
+    parser.add_argument(
+        '--to',
+        dest='to_date',
+        type=str,
+        help='기간 처리 끝 날짜 (YYYY-MM-DD, 포함). 생략하면 시작 날짜와 같음'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='기간 처리 작업자 프로세스 수 (기본값: CPU 코어 수) / Vault 백필 동시 작업 수 (기본값: 4)'
+    )
+    
+    parser.add_argument(
+        '--render-notes',
+        action='store_true',
+        help='--from/--to 기간의 저장된 통합 데이터로 노트만 일괄 재생성 (변경된 노트만 씀)'
+    )
+    
+    parser.add_argument(
+        '--backfill-vault',
+        action='store_true',
+        help='--vault-path의 빠졌거나 오래된 Daily Note를 --from/--to 기간만큼 채우기 (동시 작업 수: --workers, 기본 4)'
+    )
+    
+    parser.add_argument(
+        '--rollup',
+        choices=PERIOD_KINDS,
+        help='미리 계산된 주간/월간 롤업 표시 (--from/--to와 함께 쓰면 그 기간만)'
+    )
+    
+    parser.add_argument(
+        '--at',
+        type=str,
+        help='시점 조회 (YYYY-MM-DDTHH:MM) - 그 시각에 앞에 있던 앱, 주변 방문, 검색어'
+    )
+    
+    parser.add_argument(
+        '--window',
+        type=float,
+        default=10,
+        help='--at 조회에서 주변 방문/검색어를 찾을 앞뒤 시간(분, 기본값: 10)'
+    )
+    
+    parser.add_argument(
+        '--retention',
+        type=int,
+        metavar='DAYS',
+        help='DAYS일이 지난 원시 파일을 월간 아카이브(일/도메인/시간대 집계)로 합치고 삭제'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='--retention 대상만 보여주고 파일은 바꾸지 않음'
+    )
+    
     parser.add_argument(
         '--vault-path', 
         type=str, 
@@ -355,6 +856,12 @@ def create_argument_parser():
         help='기존 통합 데이터 파일에서 노트 생성'
     )
     
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='단계 캐시를 무시하고 모든 단계를 다시 실행'
+    )
+    
     parser.add_argument(
         '--project-root', 
         type=str,
@@ -387,6 +894,66 @@ def main():
             sys.exit(1)
         return
     
+    if args.rollup:
+        platform.show_period_rollups(args.rollup, args.from_date, args.to_date)
+        return
+    
+    if args.at:
+        try:
+            platform.lookup_time(args.at, args.window)
+        except ValueError as e:
+            print(f"❌ 시점 조회 실패: {str(e)}")
+            sys.exit(1)
+        return
+    
+    if args.retention is not None:
+        try:
+            platform.run_retention(args.retention, args.dry_run)
+        except ValueError as e:
+            print(f"❌ 보존 기간 정리 실패: {str(e)}")
+            sys.exit(1)
+        return
+    
+    if args.render_notes:
+        if not (args.from_date or args.to_date):
+            print("❌ --render-notes는 --from/--to 기간이 필요합니다")
+            sys.exit(1)
+        try:
+            platform.render_notes_range(args.from_date or args.to_date, args.to_date or args.from_date, args.template)
+        except ValueError as e:
+            print(f"❌ 노트 재생성 실패: {str(e)}")
+            sys.exit(1)
+        return
+    
+    if args.backfill_vault:
+        if not args.vault_path or not (args.from_date or args.to_date):
+            print("❌ --backfill-vault는 --vault-path와 --from/--to 기간이 필요합니다")
+            sys.exit(1)
+        try:
+            report = platform.backfill_vault(
+                args.vault_path, args.from_date or args.to_date, args.to_date or args.from_date,
+                args.template, args.workers or 4
+            )
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ Vault 백필 실패: {str(e)}")
+            sys.exit(1)
+        if report['failed']:
+            sys.exit(1)
+        return
+    
+    if args.from_date or args.to_date:
+        try:
+            report = platform.run_date_range(
+                args.from_date or args.to_date, args.to_date or args.from_date,
+                args.vault_path, args.template, args.workers
+            )
+        except ValueError as e:
+            print(f"❌ 기간 처리 실패: {str(e)}")
+            sys.exit(1)
+        if report['totals']['failed']:
+            sys.exit(1)
+        return
+    
     if args.note_from_file:
         if not Path(args.note_from_file).exists():
             print(f"❌ 통합 데이터 파일을 찾을 수 없습니다: {args.note_from_file}")
@@ -398,7 +965,7 @@ def main():
         return
     
     # 기본 동작: 전체 파이프라인 실행
-    result = platform.run_full_pipeline(args.date, args.vault_path, args.template)
+    result = platform.run_full_pipeline(args.date, args.vault_path, args.template, args.force)
     
     if not result['success']:
         print(f"\n❌ 파이프라인 실행 실패")
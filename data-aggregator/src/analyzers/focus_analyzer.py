@@ -0,0 +1,275 @@
+"""
+스트리밍 집중도 분석기 - 앱 포커스 구간과 브라우저 방문을 합친 타임라인을 한 번만 훑어서
+집중 세션, 시간대별 컨텍스트 전환 수, 가장 긴 딥워크 블록을 계산
+
+- 타임라인: 앱 구간은 (앱, 카테고리) 컨텍스트, 브라우저가 앞에 있을 때의 방문은 (도메인, 방문 카테고리) 컨텍스트
+- 집중 세션: 생산적 카테고리 컨텍스트가 끊기지 않고 이어진 구간 (grace_seconds 이하의 짧은 이탈은 허용)
+- 컨텍스트 전환: 앞에 있는 앱/도메인이 바뀐 횟수 (시작 시각의 시간대별)
+
+이벤트를 시각순으로 하나씩 받고 상태는 진행 중인 세션 하나와 고정 크기 카운터만 유지하므로
+O(이벤트 수) 시간, 이벤트 수와 무관한 메모리로 동작한다 (겹친 구간은 감싸는 구간 깊이만큼만 기억).
+과거 5분 추정 기록처럼 더 긴 구간 안에서 시작해서 먼저 끝나는 구간이 있으면, 그 구간이 끝난 뒤
+감싸던 구간으로 돌아간다. 표준 라이브러리만 사용하므로
+수집 데몬에서 파일 경로로 로드해서 실시간 이벤트를 넣을 수도 있다.
+"""
+
+import heapq
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# 집중 세션으로 보는 카테고리 (브라우저 방문/앱 카테고리 공통)
+PRODUCTIVE_CATEGORIES = frozenset({'developer', 'work', 'education', 'productivity'})
+
+# 브라우저 판별 기준 (time_correlation도 이 정의를 가져다 씀 - 이 모듈은 데몬이 경로로 로드하므로 의존 없이 여기 둠)
+BROWSER_BUNDLE_IDS = frozenset({
+    'com.google.chrome', 'com.apple.safari', 'org.mozilla.firefox', 'com.microsoft.edgemac',
+    'com.operasoftware.opera', 'com.brave.browser', 'com.naver.whale', 'company.thebrowser.browser'
+})
+# 앱 카테고리/번들 ID가 없는 과거 데이터용 - 앱 이름의 단어 단위로만 비교 ('Searchlight'의 arc 같은 오탐 방지)
+BROWSER_NAME_WORDS = frozenset({'chrome', 'chromium', 'safari', 'firefox', 'edge', 'opera', 'brave', 'whale', 'arc'})
+
+
+def is_browser_app(interval: Dict) -> bool:
+    """앱 구간이 브라우저인지 (카테고리 → 번들 ID → 앱 이름 단어 순으로 확인)"""
+    if interval.get('category') == 'browser':
+        return True
+    if (interval.get('bundle_id') or '').lower() in BROWSER_BUNDLE_IDS:
+        return True
+    words = re.findall(r'[a-z]+', (interval.get('app_name') or '').lower())
+    return any(word in BROWSER_NAME_WORDS for word in words)
+
+
+class StreamingFocusAnalyzer:
+    """시각순 이벤트(앱 구간 시작, 방문)를 하나씩 받아 집중도 지표를 갱신"""
+
+    def __init__(self, min_session_minutes: float = 10, deep_work_minutes: float = 25,
+                 grace_seconds: float = 120, visit_dwell_cap: float = 300, top_sessions: int = 5,
+                 productive_categories: Iterable[str] = PRODUCTIVE_CATEGORIES):
+        """
+        Args:
+            min_session_minutes: 이보다 짧은 생산적 구간은 집중 세션으로 세지 않음
+            deep_work_minutes: 이 이상 이어진 세션을 딥워크 블록으로 봄
+            grace_seconds: 이 시간 이하의 비생산적 이탈은 세션을 끊지 않음
+            visit_dwell_cap: 앱 구간 밖의 방문 1회에 부여할 최대 체류 시간(초)
+            top_sessions: 결과에 남길 가장 긴 세션 수
+        """
+        self.min_session_seconds = min_session_minutes * 60
+        self.deep_work_seconds = deep_work_minutes * 60
+        self.grace_seconds = grace_seconds
+        self.visit_dwell_cap = visit_dwell_cap
+        self.top_sessions = top_sessions
+        self.productive_categories = frozenset(productive_categories)
+
+        # 타임라인 → 컨텍스트 구간 변환 상태
+        self._interval: Optional[Dict] = None
+        self._interval_is_browser = False
+        self._outer: List[Dict] = []  # 현재 구간을 감싸고 더 늦게 끝나는 이전 구간들 (끝 시각 내림차순)
+        self._pending: Optional[List] = None  # [start, end, label, category]
+        self._last_time = float('-inf')
+
+        # 컨텍스트/세션 상태
+        self._label: Optional[str] = None
+        self._session: Optional[Dict] = None
+        self._break_seconds = 0.0
+
+        # 고정 크기 집계
+        self.switches_by_hour = [0] * 24
+        self.tracked_seconds_by_hour = [0.0] * 24
+        self.tracked_seconds = 0.0
+        self.productive_seconds = 0.0
+        self.session_count = 0
+        self.deep_work_blocks = 0
+        self.focus_seconds = 0.0
+        self._longest: List = []  # (길이, 시작, 끝, 주 컨텍스트) 최소 힙, 최대 top_sessions개
+
+    # ---- 입력 ----
+
+    def add_app_interval(self, interval: Dict):
+        """앱 포커스 구간 시작 이벤트 ({'start', 'end', 'app_name', 'category'}, epoch 초)"""
+        self._check_order(interval['start'])
+        self._resume_outer(interval['start'])
+        self._flush(interval['start'])
+        current = self._interval
+        if current is not None and current['end'] > interval['end']:
+            self._outer.append(current)
+        self._set_interval(interval, interval['start'])
+
+    def add_visit(self, visit: Dict):
+        """브라우저 방문 이벤트 ({'time', 'domain', 'category'}, epoch 초)"""
+        t = visit['time']
+        self._check_order(t)
+        self._resume_outer(t)
+        interval = self._interval
+        in_interval = interval is not None and interval['start'] <= t < interval['end']
+
+        if in_interval and not self._interval_is_browser:
+            # 다른 앱이 앞에 있을 때의 방문 (백그라운드 탭 로드 등)은 컨텍스트를 바꾸지 않음
+            return
+
+        end = interval['end'] if in_interval else t + self.visit_dwell_cap
+        self._flush(t)
+        self._pending = [t, end, visit.get('domain') or 'unknown', visit.get('category') or 'unknown']
+
+    def _set_interval(self, interval: Dict, start: float):
+        self._interval = interval
+        self._interval_is_browser = is_browser_app(interval)
+        self._pending = [start, interval['end'],
+                         interval.get('app_name') or 'unknown', interval.get('category') or 'unknown']
+
+    def _resume_outer(self, t: float):
+        """현재 구간이 t 전에 끝났으면 그 구간을 감싸던 구간의 남은 부분으로 복귀"""
+        while self._outer and self._interval['end'] <= t:
+            outer = self._outer.pop()
+            resume_at = self._interval['end']
+            if outer['end'] > resume_at:
+                self._flush(resume_at)
+                self._set_interval(outer, resume_at)
+
+    def _check_order(self, t: float):
+        if t < self._last_time:
+            raise ValueError("이벤트는 시각순으로 넣어야 합니다")
+        self._last_time = t
+
+    def _flush(self, until: float):
+        """대기 중인 컨텍스트 구간을 다음 이벤트 시각에서 잘라 처리"""
+        if self._pending is None:
+            return
+        start, end, label, category = self._pending
+        self._pending = None
+        end = min(end, until)
+        if end > start:
+            self._on_segment(start, end, label, category)
+
+    # ---- 세션 감지 ----
+
+    def _on_segment(self, start: float, end: float, label: str, category: str):
+        duration = end - start
+        hour = datetime.fromtimestamp(start).hour
+        self.tracked_seconds += duration
+        self.tracked_seconds_by_hour[hour] += duration
+
+        if self._label is not None and label != self._label:
+            self.switches_by_hour[hour] += 1
+        self._label = label
+
+        session = self._session
+        if category in self.productive_categories:
+            self.productive_seconds += duration
+            if session is not None and start - session['end'] <= self.grace_seconds:
+                session['end'] = end
+            else:
+                self._close_session()
+                session = self._session = {'start': start, 'end': end, 'labels': {}}
+            session['labels'][label] = session['labels'].get(label, 0.0) + duration
+            self._break_seconds = 0.0
+        elif session is not None:
+            # 짧은 이탈이 이어져서 grace를 넘으면 세션 종료
+            self._break_seconds += duration
+            if self._break_seconds > self.grace_seconds:
+                self._close_session()
+
+    def _close_session(self):
+        session, self._session = self._session, None
+        self._break_seconds = 0.0
+        if session is None:
+            return
+        length = session['end'] - session['start']
+        if length < self.min_session_seconds:
+            return
+
+        self.session_count += 1
+        self.focus_seconds += length
+        if length >= self.deep_work_seconds:
+            self.deep_work_blocks += 1
+
+        main_label = max(session['labels'].items(), key=lambda item: item[1])[0]
+        entry = (length, session['start'], session['end'], main_label)
+        if len(self._longest) < self.top_sessions:
+            heapq.heappush(self._longest, entry)
+        elif entry > self._longest[0]:
+            heapq.heapreplace(self._longest, entry)
+
+    # ---- 결과 ----
+
+    def finish(self) -> Dict:
+        """남은 구간/세션을 닫고 결과 반환"""
+        self._resume_outer(float('inf'))
+        if self._pending is not None:
+            self._flush(self._pending[1])
+        self._close_session()
+
+        sessions = [{
+            'start': datetime.fromtimestamp(start).isoformat(timespec='seconds'),
+            'end': datetime.fromtimestamp(end).isoformat(timespec='seconds'),
+            'minutes': round(length / 60, 1),
+            'main_context': label
+        } for length, start, end, label in sorted(self._longest, reverse=True)]
+
+        active_hours = sum(1 for seconds in self.tracked_seconds_by_hour if seconds > 0)
+        total_switches = sum(self.switches_by_hour)
+        return {
+            'focus_sessions': self.session_count,
+            'deep_work_blocks': self.deep_work_blocks,
+            'total_focus_minutes': round(self.focus_seconds / 60, 1),
+            'productive_minutes': round(self.productive_seconds / 60, 1),
+            'tracked_minutes': round(self.tracked_seconds / 60, 1),
+            'longest_deep_work': sessions[0] if sessions else None,
+            'top_sessions': sessions,
+            'context_switches': total_switches,
+            'context_switches_per_hour': {
+                str(hour): count for hour, count in enumerate(self.switches_by_hour) if count
+            },
+            'avg_switches_per_active_hour': round(total_switches / active_hours, 1) if active_hours else 0.0
+        }
+
+
+def analyze_focus(intervals: Iterable[Dict], visits: Iterable[Dict], **options) -> Dict:
+    """시작 시각순 앱 구간과 시각순 방문을 병합해서 한 번에 분석
+
+    heapq.merge로 두 정렬된 스트림을 합치므로 추가 정렬이나 복사 없이 O(n + m)
+    (정렬되지 않은 리스트만 한 번 정렬, 반복자는 시각순이어야 함)
+    """
+    if isinstance(intervals, list) and any(a['start'] > b['start'] for a, b in zip(intervals, intervals[1:])):
+        intervals = sorted(intervals, key=lambda interval: interval['start'])
+    if isinstance(visits, list) and any(a['time'] > b['time'] for a, b in zip(visits, visits[1:])):
+        visits = sorted(visits, key=lambda visit: visit['time'])
+    analyzer = StreamingFocusAnalyzer(**options)
+    timeline = heapq.merge(
+        ((interval['start'], 0, interval) for interval in intervals),
+        ((visit['time'], 1, visit) for visit in visits),
+        key=lambda event: (event[0], event[1])
+    )
+    for _, kind, item in timeline:
+        if kind == 0:
+            analyzer.add_app_interval(item)
+        else:
+            analyzer.add_visit(item)
+    return analyzer.finish()
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 합성 타임라인으로 세션/전환 확인
+    base = datetime(2025, 8, 17, 9, 0)
+
+    def at(minutes: float) -> float:
+        return (base + timedelta(minutes=minutes)).timestamp()
+
+    intervals = [
+        {'start': at(0), 'end': at(40), 'app_name': 'Code', 'category': 'developer'},
+        {'start': at(40), 'end': at(41), 'app_name': 'Slack', 'category': 'communication'},
+        {'start': at(41), 'end': at(70), 'app_name': 'Google Chrome', 'category': 'browser'},
+        {'start': at(70), 'end': at(100), 'app_name': 'Code', 'category': 'developer'},
+    ]
+    visits = [
+        {'time': at(41.5), 'domain': 'github.com', 'category': 'developer'},
+        {'time': at(55), 'domain': 'youtube.com', 'category': 'entertainment'},
+        {'time': at(80), 'domain': 'docs.python.org', 'category': 'education'},  # Code가 앞 - 백그라운드
+    ]
+
+    result = analyze_focus(intervals, visits)
+    print("🎯 집중도 분석 결과")
+    print(f"   • 집중 세션 {result['focus_sessions']}개, 딥워크 {result['deep_work_blocks']}개, "
+          f"총 {result['total_focus_minutes']}분")
+    print(f"   • 가장 긴 딥워크: {result['longest_deep_work']}")
+    print(f"   • 컨텍스트 전환 {result['context_switches']}회 {result['context_switches_per_hour']}")
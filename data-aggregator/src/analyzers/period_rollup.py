@@ -0,0 +1,295 @@
+"""
+주간/월간 기간 롤업 - 일일 통합 결과를 미리 집계해 둔 기간 행
+
+기간 행(주: ISO 주 'YYYY-Www', 월: 'YYYY-MM')마다 날짜별 기여분과 합계를 함께 저장한다.
+하루를 통합하면 그 날짜가 속한 주/월 행에서 이전 기여분을 빼고 새 기여분을 더하기만 하므로
+(같은 날을 다시 통합해도 이중 집계되지 않음) 기간 조회는 미리 계산된 몇 개의 행만 읽으면 된다.
+
+저장 위치: data-aggregator/output/rollups/{weekly|monthly}_<기간>.json
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+ROLLUP_VERSION = 1
+PERIOD_KINDS = ('weekly', 'monthly')
+TOP_DOMAIN_LIMIT = 10
+
+# 합계에서 더하고 빼는 카운터 필드 (이름 → 값)
+_COUNTER_FIELDS = ('category_counts', 'domain_counts', 'app_minutes', 'app_category_minutes')
+_SCALAR_FIELDS = ('browser_visits', 'search_count')
+
+
+def _browser_visit_counts(complete) -> Optional[tuple]:
+    """complete 문서(dict 또는 지연 핸들)의 카테고리별 방문 목록 → (카테고리별 방문 수, 도메인별 방문 수)
+
+    요약의 highlights는 하루 상위 5개뿐이라 기간 합계가 틀어지므로 전체 방문 목록에서 센다.
+    complete가 없거나 읽을 수 없으면 None.
+    """
+    if not complete:
+        return None
+    try:
+        if hasattr(complete, 'section'):
+            categories = complete.section('category_analysis', 'categories')
+        else:
+            categories = complete['category_analysis']['categories']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    category_counts: Dict[str, int] = {}
+    domain_counts: Dict[str, int] = {}
+    for category, visits in categories.items():
+        if visits:
+            category_counts[category] = len(visits)
+        for visit in visits:
+            domain = visit.get('domain', '')
+            domain_counts[domain] = domain_counts.get(domain, 0) + 1
+    return category_counts, domain_counts
+
+
+def day_contribution(integrated_data: Dict) -> Dict:
+    """통합 데이터 1일치 → 기간 롤업에 더할 기여분
+
+    Returns:
+        {'date', 'browser_visits', 'search_count', 'category_counts', 'domain_counts',
+         'app_minutes', 'app_category_minutes', 'productivity_score'}
+    """
+    browser_data = integrated_data.get('browser_data')
+    app_data = integrated_data.get('app_data')
+    analysis = integrated_data.get('analysis', {})
+
+    contribution = {
+        'date': integrated_data['date'],
+        'browser_visits': 0,
+        'search_count': 0,
+        'category_counts': {},
+        'domain_counts': {},
+        'app_minutes': {},
+        'app_category_minutes': {},
+        'productivity_score': analysis.get('productivity_insights', {}).get('productivity_score')
+    }
+
+    if browser_data:
+        summary = browser_data['summary']
+        contribution['browser_visits'] = summary['summary']['total_visits']
+        contribution['search_count'] = summary['summary']['search_count']
+        counts = _browser_visit_counts(browser_data.get('complete'))
+        aggregates = browser_data.get('aggregates')
+        if counts is None and aggregates:
+            # 아카이브된 날짜는 아카이브할 때 남긴 일별 집계 (전체 방문 기준)
+            counts = (dict(aggregates['categories']), dict(aggregates['domains']))
+        if counts is None:
+            # 둘 다 없으면 요약의 상위 항목만 반영
+            counts = (dict(summary['highlights']['top_categories']), dict(summary['highlights']['top_domains']))
+        contribution['category_counts'], contribution['domain_counts'] = counts
+
+    if app_data:
+        usage_patterns = app_data['summary'].get('category_analysis', {}).get('usage_patterns', {})
+        contribution['app_category_minutes'] = {
+            category: round(minutes, 2)
+            for category, minutes in usage_patterns.get('category_usage_minutes', {}).items()
+        }
+        # 앱별 포커스 시간은 롤업 파일에만 있음 (없으면 비워 둠)
+        rollup = app_data.get('rollup')
+        if rollup:
+            names = rollup.get('apps', {})
+            app_minutes: Dict[str, float] = {}
+            for bundle_id, seconds in rollup.get('focus_total_seconds', {}).items():
+                name = names.get(bundle_id, bundle_id)
+                app_minutes[name] = round(app_minutes.get(name, 0.0) + seconds / 60, 2)
+            contribution['app_minutes'] = app_minutes
+
+    return contribution
+
+
+def period_keys(date: str) -> Dict[str, str]:
+    """날짜(YYYY-MM-DD)가 속한 주/월 기간 키"""
+    day = datetime.strptime(date, '%Y-%m-%d')
+    iso_year, iso_week, _ = day.isocalendar()
+    return {
+        'weekly': f"{iso_year}-W{iso_week:02d}",
+        'monthly': day.strftime('%Y-%m')
+    }
+
+
+def period_bounds(kind: str, period: str) -> Dict[str, str]:
+    """기간 키 → 시작/끝 날짜 (YYYY-MM-DD, 끝 포함)"""
+    if kind == 'weekly':
+        start = datetime.strptime(f"{period}-1", '%G-W%V-%u')
+        end = start + timedelta(days=6)
+    else:
+        start = datetime.strptime(f"{period}-01", '%Y-%m-%d')
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return {'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d')}
+
+
+class PeriodRollupStore:
+    """주간/월간 롤업 행 저장소 (날짜별 기여분 델타 적용)"""
+
+    def __init__(self, rollup_dir: str):
+        """
+        Args:
+            rollup_dir: 롤업 행을 저장할 디렉토리 (보통 data-aggregator/output/rollups)
+        """
+        self.rollup_dir = Path(rollup_dir)
+
+    # ---- 저장/로드 ----
+
+    def path_for(self, kind: str, period: str) -> Path:
+        return self.rollup_dir / f"{kind}_{period}.json"
+
+    def get(self, kind: str, period: str) -> Optional[Dict]:
+        """기간 행 로드 (없으면 None)"""
+        path = self.path_for(kind, period)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            row = json.load(f)
+        return row if row.get('version') == ROLLUP_VERSION else None
+
+    def _new_row(self, kind: str, period: str) -> Dict:
+        return {
+            'version': ROLLUP_VERSION,
+            'kind': kind,
+            'period': period,
+            **period_bounds(kind, period),
+            'days': {},
+            'totals': self._empty_totals()
+        }
+
+    @staticmethod
+    def _empty_totals() -> Dict:
+        totals = {field: 0 for field in _SCALAR_FIELDS}
+        totals.update({field: {} for field in _COUNTER_FIELDS})
+        totals.update({'productivity_score_sum': 0, 'productivity_days': 0})
+        return totals
+
+    def _save(self, row: Dict):
+        self.rollup_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(row['kind'], row['period'])
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(row, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    # ---- 델타 적용 ----
+
+    @staticmethod
+    def _apply(totals: Dict, contribution: Dict, sign: int):
+        """합계에 기여분을 더하거나(sign=1) 뺌(sign=-1)"""
+        for field in _SCALAR_FIELDS:
+            totals[field] += sign * contribution.get(field, 0)
+
+        for field in _COUNTER_FIELDS:
+            counter = totals[field]
+            for key, value in contribution.get(field, {}).items():
+                updated = round(counter.get(key, 0) + sign * value, 2)
+                if updated:
+                    counter[key] = updated
+                else:
+                    counter.pop(key, None)
+
+        score = contribution.get('productivity_score')
+        if score is not None:
+            totals['productivity_score_sum'] += sign * score
+            totals['productivity_days'] += sign
+
+    @staticmethod
+    def _finish(row: Dict):
+        """합계에서 파생 필드(상위 도메인, 평균 생산성 점수 등) 갱신"""
+        totals = row['totals']
+        row['day_count'] = len(row['days'])
+        row['top_domains'] = sorted(totals['domain_counts'].items(),
+                                    key=lambda item: item[1], reverse=True)[:TOP_DOMAIN_LIMIT]
+        row['top_categories'] = sorted(totals['category_counts'].items(),
+                                       key=lambda item: item[1], reverse=True)
+        row['productivity_score'] = (round(totals['productivity_score_sum'] / totals['productivity_days'], 1)
+                                     if totals['productivity_days'] else None)
+        row['updated_at'] = datetime.now().isoformat()
+
+    def apply_days(self, contributions: Iterable[Dict]) -> List[Dict]:
+        """여러 날짜의 기여분을 적용 (기간 행마다 한 번만 읽고 씀)
+
+        같은 날짜가 이미 반영돼 있으면 이전 기여분을 빼고 새 기여분으로 교체한다.
+
+        Returns:
+            갱신된 기간 행 목록
+        """
+        rows: Dict[tuple, Dict] = {}
+        for contribution in contributions:
+            date = contribution['date']
+            for kind, period in period_keys(date).items():
+                row = rows.get((kind, period))
+                if row is None:
+                    row = rows[(kind, period)] = self.get(kind, period) or self._new_row(kind, period)
+
+                previous = row['days'].get(date)
+                if previous is not None:
+                    self._apply(row['totals'], previous, -1)
+                self._apply(row['totals'], contribution, 1)
+                row['days'][date] = contribution
+
+        for row in rows.values():
+            row['days'] = dict(sorted(row['days'].items()))
+            self._finish(row)
+            self._save(row)
+        return list(rows.values())
+
+    def apply_day(self, contribution: Dict) -> List[Dict]:
+        """하루치 기여분 적용 (주간/월간 행 각각 1개 갱신)"""
+        return self.apply_days([contribution])
+
+    # ---- 조회 ----
+
+    def rows_between(self, kind: str, start_date: str, end_date: str) -> List[Dict]:
+        """기간 [start_date, end_date]에 걸치는 기간 행 목록 (저장된 행만, 시간순)"""
+        if kind not in PERIOD_KINDS:
+            raise ValueError(f"알 수 없는 롤업 종류입니다: {kind}")
+
+        rows = []
+        seen = set()
+        day = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        while day <= end:
+            period = period_keys(day.strftime('%Y-%m-%d'))[kind]
+            if period not in seen:
+                seen.add(period)
+                row = self.get(kind, period)
+                if row is not None:
+                    rows.append(row)
+            # 같은 기간 안의 나머지 날짜는 건너뜀
+            day = datetime.strptime(period_bounds(kind, period)['end'], '%Y-%m-%d') + timedelta(days=1)
+        return rows
+
+    def periods(self, kind: str) -> List[str]:
+        """저장된 기간 키 목록 (오름차순)"""
+        if not self.rollup_dir.exists():
+            return []
+        prefix = f"{kind}_"
+        return sorted(path.stem[len(prefix):] for path in self.rollup_dir.glob(f"{prefix}*.json"))
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 같은 날을 두 번 반영해도 합계가 한 번만 집계되는지 확인
+    import tempfile
+
+    store = PeriodRollupStore(tempfile.mkdtemp())
+    day = {
+        'date': '2025-08-17', 'browser_visits': 121, 'search_count': 14,
+        'category_counts': {'developer': 68, 'social': 20}, 'domain_counts': {'github.com': 58},
+        'app_minutes': {'Code': 95.5}, 'app_category_minutes': {'developer': 60.0},
+        'productivity_score': 72
+    }
+    store.apply_day(day)
+    store.apply_day(dict(day, browser_visits=130, domain_counts={'github.com': 60}))
+    store.apply_day(dict(day, date='2025-08-14', productivity_score=None))
+
+    for kind in PERIOD_KINDS:
+        for row in store.rows_between(kind, '2025-08-01', '2025-08-31'):
+            totals = row['totals']
+            print(f"📆 {kind} {row['period']} ({row['start']} ~ {row['end']}): {row['day_count']}일, "
+                  f"방문 {totals['browser_visits']}회, 검색 {totals['search_count']}회, "
+                  f"생산성 {row['productivity_score']}, 상위 도메인 {row['top_domains'][:3]}")
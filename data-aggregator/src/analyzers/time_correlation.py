@@ -0,0 +1,214 @@
+"""
+시간 상관 분석 - 브라우저 방문을 그 시각에 앞에 있던 앱 포커스 구간에 연결
+
+방문(시각순)과 앱 포커스 구간(시작 시각순)을 포인터 두 개로 한 번만 훑는 스윕 라인 조인이라
+방문 n개, 구간 m개에 대해 O(n + m)로 끝난다 (정렬되지 않은 입력만 한 번 정렬, 겹친 구간은 겹친 만큼만 추가 확인).
+
+- 방문마다 그 시각에 활성이던 앱 구간을 찾아 앱별 방문 수/카테고리 분포로 집계
+- 브라우저 앱이 앞에 있을 때의 방문은 다음 방문까지(최대 DWELL_CAP_SECONDS, 구간 끝까지) 머문 시간을
+  그 방문의 카테고리에 귀속해서 카테고리별 브라우저 사용 시간을 추정
+"""
+
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional
+
+from .focus_analyzer import is_browser_app
+
+# 방문 1회에 귀속할 최대 체류 시간 (다음 방문이 없거나 한참 뒤일 때)
+DWELL_CAP_SECONDS = 300
+
+
+def _epoch(iso_time: str) -> float:
+    """앱 히스토리 시각(로컬 기준 naive ISO) → epoch 초"""
+    return datetime.fromisoformat(iso_time).timestamp()
+
+
+def visit_epoch(iso_time: str) -> float:
+    """브라우저 방문 시각 → epoch 초
+
+    Chrome/Safari 수집기는 방문 시각을 UTC 기준 naive ISO 문자열로 기록하므로 (앱 히스토리는 로컬 시각)
+    시간대가 없으면 UTC로 해석한다. 로컬로 해석하면 KST에서는 방문이 9시간 밀려 어떤 앱 구간에도 붙지 않는다.
+    """
+    moment = datetime.fromisoformat(iso_time)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def visits_from_browser_complete(complete) -> List[Dict]:
+    """브라우저 complete 데이터(또는 지연 핸들) → 시각순 방문 목록
+
+    카테고리 분석 섹션에는 카테고리별로 나뉜 전체 방문이 들어 있으므로 그 섹션만 읽는다.
+    없으면 merged_history를 카테고리 없이 사용한다.
+    """
+    visits = []
+    try:
+        categories = complete.section('category_analysis', 'categories') if hasattr(complete, 'section') \
+            else complete['category_analysis']['categories']
+    except (KeyError, TypeError):
+        categories = None
+
+    if categories:
+        for category, records in categories.items():
+            for record in records:
+                visits.append(_visit(record, category))
+    else:
+        try:
+            history = complete.section('raw_data', 'merged_history') if hasattr(complete, 'section') \
+                else complete['raw_data']['merged_history']
+        except (KeyError, TypeError):
+            history = []
+        visits = [_visit(record, None) for record in history]
+
+    visits = [visit for visit in visits if visit is not None]
+    visits.sort(key=lambda visit: visit['time'])
+    return visits
+
+
+def _visit(record: Dict, category: Optional[str]) -> Optional[Dict]:
+    try:
+        time = visit_epoch(record['visit_time'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {
+        'time': time,
+        'domain': record.get('domain', ''),
+        'title': record.get('title'),
+        'url': record.get('url'),
+        'category': category or 'unknown',
+        'browser': record.get('browser')
+    }
+
+
+def intervals_from_app_history(app_history: Iterable[Dict]) -> List[Dict]:
+    """앱 히스토리 레코드 → 시작 시각순 포커스 구간 목록
+
+    end_timestamp가 없는 과거 레코드는 timestamp + duration_minutes로 끝을 계산한다.
+    """
+    intervals = []
+    for record in app_history:
+        try:
+            start = _epoch(record['timestamp'])
+            if record.get('end_timestamp'):
+                end = _epoch(record['end_timestamp'])
+            else:
+                end = start + float(record.get('duration_minutes') or 0) * 60
+        except (KeyError, TypeError, ValueError):
+            continue
+        if end <= start:
+            continue
+        intervals.append({
+            'start': start,
+            'end': end,
+            'bundle_id': record.get('bundle_id'),
+            'app_name': record.get('app_name') or record.get('bundle_id') or 'unknown',
+            'category': record.get('category')
+        })
+    intervals.sort(key=lambda interval: interval['start'])
+    return intervals
+
+
+def correlate_visits_with_focus(visits: List[Dict], intervals: List[Dict],
+                                dwell_cap: float = DWELL_CAP_SECONDS) -> Dict:
+    """시각순 방문과 시작 시각순 포커스 구간을 한 번의 스윕으로 조인
+
+    구간이 겹치면(과거 5분 추정 기록 등) 방문 시각을 덮는 구간 중 가장 늦게 시작한 구간에 연결한다
+    (시점 조회 색인, 집중도 분석과 같은 기준).
+
+    Returns:
+        {
+          'by_app': {앱 이름: {'visits', 'categories': {카테고리: 방문 수}, 'is_browser'}},
+          'browser_category_seconds': {카테고리: 브라우저가 앞에 있을 때 머문 추정 초},
+          'foreground_visits': 브라우저 앱이 앞에 있을 때의 방문 수,
+          'background_visits': 다른 앱이 앞에 있을 때의 방문 수 (백그라운드 탭 로드 등),
+          'unattributed_visits': 추적 구간 밖의 방문 수,
+          'tracked_window': {'start', 'end'} 또는 None
+        }
+    """
+    # 정렬되지 않은 입력만 한 번 정렬 (변환 함수 결과는 이미 정렬돼 있음)
+    if any(visits[i]['time'] > visits[i + 1]['time'] for i in range(len(visits) - 1)):
+        visits = sorted(visits, key=lambda visit: visit['time'])
+    if any(intervals[i]['start'] > intervals[i + 1]['start'] for i in range(len(intervals) - 1)):
+        intervals = sorted(intervals, key=lambda interval: interval['start'])
+
+    by_app: Dict[str, Dict] = {}
+    category_seconds: Dict[str, float] = {}
+    foreground = background = unattributed = 0
+
+    j = 0
+    m = len(intervals)
+    browser_flags = [is_browser_app(interval) for interval in intervals]
+    # 시작 시각순 누적 최대 끝 시각 - 겹친 구간을 거슬러 올라갈 때 더 이상 t를 덮는 구간이 없으면 멈춤
+    max_end = list(accumulate((interval['end'] for interval in intervals), max))
+    for i, visit in enumerate(visits):
+        t = visit['time']
+        # t 이전에 시작한 구간까지 포인터를 앞으로만 이동
+        while j < m and intervals[j]['start'] <= t:
+            j += 1
+        k = j - 1
+        while k >= 0 and max_end[k] > t and intervals[k]['end'] <= t:
+            k -= 1
+        if k < 0 or intervals[k]['end'] <= t:
+            unattributed += 1
+            continue
+
+        interval = intervals[k]
+        browser = browser_flags[k]
+        usage = by_app.get(interval['app_name'])
+        if usage is None:
+            usage = by_app[interval['app_name']] = {'visits': 0, 'categories': {}, 'is_browser': browser}
+        usage['visits'] += 1
+        usage['categories'][visit['category']] = usage['categories'].get(visit['category'], 0) + 1
+
+        if browser:
+            foreground += 1
+            next_time = visits[i + 1]['time'] if i + 1 < len(visits) else t + dwell_cap
+            dwell = max(0.0, min(next_time - t, dwell_cap, interval['end'] - t))
+            category_seconds[visit['category']] = category_seconds.get(visit['category'], 0.0) + dwell
+        else:
+            background += 1
+
+    return {
+        'by_app': dict(sorted(by_app.items(), key=lambda item: item[1]['visits'], reverse=True)),
+        'browser_category_seconds': {
+            category: round(seconds, 1)
+            for category, seconds in sorted(category_seconds.items(), key=lambda item: item[1], reverse=True)
+        },
+        'foreground_visits': foreground,
+        'background_visits': background,
+        'unattributed_visits': unattributed,
+        'tracked_window': {
+            'start': datetime.fromtimestamp(intervals[0]['start']).isoformat(),
+            'end': datetime.fromtimestamp(max(interval['end'] for interval in intervals)).isoformat()
+        } if intervals else None
+    }
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 합성 데이터로 스윕 조인 확인
+    base = datetime(2025, 8, 17, 14, 0)
+    app_history = [
+        {'app_name': 'Google Chrome', 'category': 'browser', 'timestamp': base.isoformat(),
+         'end_timestamp': (base + timedelta(minutes=20)).isoformat()},
+        {'app_name': 'Code', 'category': 'developer', 'timestamp': (base + timedelta(minutes=20)).isoformat(),
+         'duration_minutes': 30},
+    ]
+
+    def utc(minutes: float) -> str:
+        # 브라우저 수집기처럼 UTC 기준 naive 시각
+        return (base + timedelta(minutes=minutes)).astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+    complete = {'category_analysis': {'categories': {
+        'developer': [{'visit_time': utc(m), 'domain': 'github.com'} for m in (1, 5, 25)],
+        'social': [{'visit_time': utc(12), 'domain': 'x.com'}, {'visit_time': utc(180), 'domain': 'x.com'}],
+    }}}
+
+    result = correlate_visits_with_focus(visits_from_browser_complete(complete),
+                                         intervals_from_app_history(app_history))
+    print("🔗 시간 상관 분석 결과")
+    for app_name, usage in result['by_app'].items():
+        print(f"   • {app_name}: 방문 {usage['visits']}회 {usage['categories']}")
+    print(f"   • 브라우저 카테고리별 시간(초): {result['browser_category_seconds']}")
+    print(f"   • 포그라운드 {result['foreground_visits']} / 백그라운드 {result['background_visits']} / "
+          f"추적 밖 {result['unattributed_visits']}")
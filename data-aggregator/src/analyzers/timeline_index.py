@@ -0,0 +1,207 @@
+"""
+시점 조회 색인 - "14:30에 뭘 하고 있었지?"에 여러 JSON 파일을 훑지 않고 답하기
+
+날짜마다 앱 포커스 구간(시작 시각순), 브라우저 방문, 검색어를 시각순으로 정렬한 열(column) 배열로 저장하고
+조회는 bisect로 위치를 찾으므로 O(log n) + 결과 크기만큼만 걸린다.
+포커스 구간은 보통 겹치지 않지만 과거 5분 추정 기록이나 프로세스 시작 기록은 겹칠 수 있으므로,
+로드할 때 시작 시각순 누적 최대 끝 시각 배열을 만들어 t 이하의 마지막 구간부터 t를 덮는 구간이
+남아 있는 동안만 거슬러 올라간다 (겹치지 않으면 구간 하나만 확인).
+브라우저 방문/검색 시각은 UTC 기준으로 기록되어 있으므로 UTC로 해석한다 (조회 시각은 로컬).
+
+저장 위치: data-aggregator/output/timeline/timeline_<YYYY-MM-DD>.json (통합 데이터 저장 시 함께 갱신)
+"""
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .time_correlation import visit_epoch
+
+TIMELINE_INDEX_VERSION = 2
+DEFAULT_WINDOW_MINUTES = 10
+
+# 열 이름 (시각 열 + 값 열)
+_APP_COLUMNS = ('start', 'end', 'app_name', 'bundle_id', 'category')
+_VISIT_COLUMNS = ('time', 'domain', 'title', 'url', 'category', 'browser')
+_SEARCH_COLUMNS = ('time', 'query', 'engine', 'browser')
+
+
+def _epoch(value: Union[str, datetime, float]) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch).isoformat(timespec='seconds')
+
+
+def _columns(records: Iterable[Dict], names: tuple) -> Dict[str, List]:
+    columns = {name: [] for name in names}
+    for record in records:
+        for name in names:
+            columns[name].append(record.get(name))
+    return columns
+
+
+def searches_from_browser_complete(complete) -> List[Dict]:
+    """브라우저 complete 데이터(또는 지연 핸들) → 시각순 검색어 목록 (search_analysis 섹션만 읽음)"""
+    try:
+        queries = complete.section('search_analysis', 'queries') if hasattr(complete, 'section') \
+            else complete['search_analysis']['queries']
+    except (KeyError, TypeError):
+        queries = []
+
+    searches = []
+    for record in queries or []:
+        try:
+            time = visit_epoch(record['visit_time'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        searches.append({
+            'time': time,
+            'query': record.get('query', ''),
+            'engine': record.get('engine'),
+            'browser': record.get('browser')
+        })
+    searches.sort(key=lambda search: search['time'])
+    return searches
+
+
+def build_timeline_index(date: str, intervals: List[Dict], visits: List[Dict], searches: List[Dict]) -> Dict:
+    """정렬된 구간/방문/검색어 목록 → 저장용 열 배열 색인
+
+    Args:
+        intervals: intervals_from_app_history() 결과 (시작 시각순)
+        visits: visits_from_browser_complete() 결과 (시각순)
+        searches: searches_from_browser_complete() 결과 (시각순)
+    """
+    return {
+        'version': TIMELINE_INDEX_VERSION,
+        'date': date,
+        'apps': _columns(intervals, _APP_COLUMNS),
+        'visits': _columns(visits, _VISIT_COLUMNS),
+        'searches': _columns(searches, _SEARCH_COLUMNS)
+    }
+
+
+class TimelineIndex:
+    """하루치 시점 조회 색인 (열 배열 + bisect)"""
+
+    def __init__(self, data: Dict):
+        self.date = data['date']
+        self.apps = data['apps']
+        self.visits = data['visits']
+        self.searches = data['searches']
+        # 시작 시각순 누적 최대 끝 시각 - 더 일찍 시작해서 길게 이어진 구간이 t를 덮는지 판단용
+        self._max_end = list(accumulate(self.apps['end'], max))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional['TimelineIndex']:
+        """저장된 색인 로드 (없거나 버전이 다르면 None)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(data) if data.get('version') == TIMELINE_INDEX_VERSION else None
+
+    @staticmethod
+    def save(data: Dict, path: Union[str, Path]) -> bool:
+        """색인을 원자적으로 저장. 내용이 같으면 쓰지 않음 (쓴 경우 True)"""
+        path = Path(path)
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        try:
+            if path.read_bytes() == payload:
+                return False
+        except OSError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return True
+
+    # ---- 조회 ----
+
+    @staticmethod
+    def _rows(columns: Dict[str, List], lo: int, hi: int, time_key: str) -> List[Dict]:
+        rows = []
+        for i in range(lo, hi):
+            row = {name: values[i] for name, values in columns.items()}
+            row[time_key] = _iso(row[time_key])
+            rows.append(row)
+        return rows
+
+    def active_app(self, when: Union[str, datetime, float]) -> Optional[Dict]:
+        """그 시각에 앞에 있던 앱 구간 (없으면 None, 구간이 겹치면 t를 덮는 구간 중 가장 늦게 시작한 구간)"""
+        t = _epoch(when)
+        i = bisect_right(self.apps['start'], t) - 1
+        while i >= 0 and self._max_end[i] > t and self.apps['end'][i] <= t:
+            i -= 1
+        if i < 0 or self.apps['end'][i] <= t:
+            return None
+        app = {name: values[i] for name, values in self.apps.items()}
+        app['start'] = _iso(app['start'])
+        app['end'] = _iso(app['end'])
+        return app
+
+    def visits_between(self, start: Union[str, datetime, float], end: Union[str, datetime, float]) -> List[Dict]:
+        """[start, end] 사이 방문 (시각순)"""
+        times = self.visits['time']
+        return self._rows(self.visits, bisect_left(times, _epoch(start)), bisect_right(times, _epoch(end)), 'time')
+
+    def searches_between(self, start: Union[str, datetime, float], end: Union[str, datetime, float]) -> List[Dict]:
+        """[start, end] 사이 검색어 (시각순)"""
+        times = self.searches['time']
+        return self._rows(self.searches, bisect_left(times, _epoch(start)), bisect_right(times, _epoch(end)), 'time')
+
+    def at(self, when: Union[str, datetime, float], window_minutes: float = DEFAULT_WINDOW_MINUTES) -> Dict:
+        """그 시각의 활동 - 앞에 있던 앱, 앞뒤 window_minutes 안의 방문/검색어, 직전 방문
+
+        Returns:
+            {'time', 'window_minutes', 'active_app', 'last_visit', 'nearby_visits', 'searches'}
+        """
+        t = _epoch(when)
+        window = window_minutes * 60
+
+        last = bisect_right(self.visits['time'], t) - 1
+        return {
+            'time': _iso(t),
+            'window_minutes': window_minutes,
+            'active_app': self.active_app(t),
+            'last_visit': self._rows(self.visits, last, last + 1, 'time')[0] if last >= 0 else None,
+            'nearby_visits': self.visits_between(t - window, t + window),
+            'searches': self.searches_between(t - window, t + window)
+        }
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 합성 데이터로 시점 조회 확인
+    base = datetime(2025, 8, 17, 14, 0)
+
+    def at(minutes: float) -> float:
+        return (base + timedelta(minutes=minutes)).timestamp()
+
+    intervals = [
+        {'start': at(0), 'end': at(25), 'app_name': 'Code', 'bundle_id': 'com.microsoft.VSCode', 'category': 'developer'},
+        {'start': at(25), 'end': at(50), 'app_name': 'Google Chrome', 'bundle_id': 'com.google.Chrome',
+         'category': 'browser'},
+    ]
+    visits = [{'time': at(m), 'domain': 'github.com', 'title': f'PR #{m}', 'url': f'https://github.com/pr/{m}',
+               'category': 'developer', 'browser': 'chrome'} for m in (5, 28, 31, 45)]
+    searches = [{'time': at(27), 'query': 'bisect interval tree', 'engine': 'google', 'browser': 'chrome'}]
+
+    index = TimelineIndex(build_timeline_index('2025-08-17', intervals, visits, searches))
+    result = index.at(base + timedelta(minutes=30))
+    print(f"🕑 {result['time']}")
+    print(f"   📱 앱: {result['active_app']['app_name'] if result['active_app'] else '-'}")
+    print(f"   🌐 직전 방문: {result['last_visit']['title'] if result['last_visit'] else '-'}")
+    print(f"   🔗 주변 방문 {len(result['nearby_visits'])}개, 🔍 검색어 {[s['query'] for s in result['searches']]}")
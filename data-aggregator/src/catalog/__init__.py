@@ -0,0 +1,6 @@
+# Output catalog package - 수집기 출력 파일 색인
+from .output_catalog import OutputCatalog, register_output
+from .stage_cache import StageCache
+from .retention import RetentionJob
+
+__all__ = ['OutputCatalog', 'register_output', 'StageCache', 'RetentionJob']
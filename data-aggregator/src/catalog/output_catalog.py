@@ -0,0 +1,373 @@
+"""
+출력 카탈로그 - 수집기 출력 파일의 영구 색인
+
+날짜 → 소스 → 종류 → 파일 목록(크기, 수정 시각, sha256, 레코드 수)을
+data-aggregator/output/catalog/catalog.json에 유지해서, 통합기가 디렉토리를 glob 하지 않고
+하루치 파일을 O(1)로 찾을 수 있게 함
+
+수집기는 파일을 쓸 때 register_output()으로 등록하고,
+refresh()는 디렉토리 mtime이 바뀐 소스만 다시 훑어서 달라진 파일만 해시를 새로 계산한다.
+항목에는 파일명만 저장하고 경로는 프로젝트 루트 + 소스 출력 디렉토리로 만들므로 프로젝트를 옮겨도 유효하다.
+브라우저 데몬, 앱 추적기, 통합기가 동시에 저장할 수 있으므로 저장은 파일 잠금 안에서
+디스크의 최신 카탈로그에 이 프로세스의 변경분만 다시 적용한다.
+
+이 모듈은 다른 프로젝트(browser-collector, app-tracker)에서 파일 경로로 직접 로드할 수 있도록
+표준 라이브러리 외의 의존성이나 상대 import를 쓰지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - 잠금 없이 저장
+    fcntl = None
+
+CATALOG_VERSION = 2
+
+# 소스 → (프로젝트 루트 기준 출력 디렉토리, [(종류, 파일명 패턴)])
+# 패턴 그룹: 1 = YYYYMMDD (월간 아카이브는 YYYYMM), 2 = HHMMSS (있으면)
+SOURCES = {
+    'browser': ('browser-collector/output', [
+        ('summary', re.compile(r'^browser_summary_(\d{8})\.json$')),
+        ('complete', re.compile(r'^browser_complete_(\d{8})(?:_(\d{6}))?\.json$')),
+        ('report', re.compile(r'^category_report_(\d{8})\.txt$')),
+        ('archive', re.compile(r'^browser_archive_(\d{6})\.json$')),
+    ]),
+    'app': ('app-tracker/src/output', [
+        ('summary', re.compile(r'^app_summary_(\d{8})\.json$')),
+        ('complete', re.compile(r'^app_usage_complete_(\d{8})_(\d{6})\.json$')),
+        ('rollup', re.compile(r'^app_rollup_(\d{8})\.json$')),
+        ('report', re.compile(r'^app_category_report_(\d{8})\.txt$')),
+        ('archive', re.compile(r'^app_archive_(\d{6})\.json$')),
+    ]),
+    'integrated': ('data-aggregator/output', [
+        ('integrated', re.compile(r'^integrated_data_(\d{8})(?:_(\d{6}))?\.json$')),
+        ('archive', re.compile(r'^integrated_archive_(\d{6})\.json$')),
+    ]),
+}
+
+# 레코드 수를 세기 위해 파싱할 최대 파일 크기 (그보다 크면 등록 시 넘겨준 값만 사용)
+ROW_COUNT_MAX_BYTES = 2 * 1024 * 1024
+
+# (소스, 종류) → 파싱한 JSON에서 레코드 수를 꺼내는 함수
+_ROW_COUNTERS = {
+    ('browser', 'summary'): lambda d: d['summary']['total_visits'],
+    ('browser', 'complete'): lambda d: d['metadata']['total_records'],
+    ('app', 'summary'): lambda d: d['summary']['total_running_apps'],
+    ('app', 'complete'): lambda d: len(d.get('running_apps', [])),
+    ('app', 'rollup'): lambda d: len(d.get('focus_minutely', {})),
+    ('browser', 'archive'): lambda d: len(d['days']),
+    ('app', 'archive'): lambda d: len(d['days']),
+    ('integrated', 'archive'): lambda d: len(d['days']),
+}
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """다른 프로세스의 카탈로그 저장과 겹치지 않도록 배타적 잠금 (잠금 파일은 지우지 않음)"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _apply(dirs: Dict, days: Dict, op: Tuple):
+    """변경 1건을 카탈로그 내용에 적용 ('put' = 항목 추가/교체, 'drop' = 항목 제거, 'dir' = 디렉토리 mtime)"""
+    if op[0] == 'dir':
+        dirs[op[1]] = op[2]
+        return
+
+    _, date, source, kind, value = op
+    if op[0] == 'put':
+        entries = days.setdefault(date, {}).setdefault(source, {}).setdefault(kind, [])
+        for i, entry in enumerate(entries):
+            if entry['name'] == value['name']:
+                entries[i] = value
+                return
+        entries.append(value)
+        entries.sort(key=lambda e: (e['time'] or '', e['name']))
+        return
+
+    kinds = days.get(date, {}).get(source, {})
+    kept = [e for e in kinds.get(kind, []) if e['name'] != value]
+    if kept:
+        kinds[kind] = kept
+    else:
+        kinds.pop(kind, None)
+    if date in days and source in days[date] and not kinds:
+        del days[date][source]
+    if date in days and not days[date]:
+        del days[date]
+
+
+def classify_file(filename: str) -> Optional[Dict]:
+    """파일명으로 (소스, 종류, 날짜, 시각) 판별. 카탈로그 대상이 아니면 None
+
+    월간 아카이브는 그 달 1일 날짜로 등록한다.
+    """
+    for source, (_, patterns) in SOURCES.items():
+        for kind, pattern in patterns:
+            match = pattern.match(filename)
+            if match:
+                day = match.group(1)
+                if len(day) == 6:
+                    day += '01'
+                return {
+                    'source': source,
+                    'kind': kind,
+                    'date': f"{day[:4]}-{day[4:6]}-{day[6:]}",
+                    'time': match.group(2) if pattern.groups >= 2 else None
+                }
+    return None
+
+
+class OutputCatalog:
+    """수집기/통합기 출력 파일 색인"""
+
+    def __init__(self, project_root: str, catalog_path: Optional[str] = None,
+                 snapshot: Optional[Dict] = None):
+        """
+        Args:
+            project_root: personal-logging-platform 프로젝트 루트 경로
+            catalog_path: 카탈로그 파일 경로. None이면 data-aggregator/output/catalog/catalog.json
+                (카탈로그 저장이 출력 디렉토리 mtime을 바꾸지 않도록 하위 디렉토리에 둠)
+            snapshot: 다른 프로세스에서 넘겨받은 snapshot() 결과. 주어지면 파일을 읽지 않음
+        """
+        self.project_root = Path(project_root)
+        self.catalog_path = Path(catalog_path) if catalog_path else \
+            self.project_root / "data-aggregator" / "output" / "catalog" / "catalog.json"
+        self.lock_path = self.catalog_path.with_name(self.catalog_path.name + '.lock')
+        self._ops: List[Tuple] = []  # 마지막 저장 이후 이 프로세스의 변경 (저장 시 디스크 내용에 다시 적용)
+        self._load(snapshot)
+
+    # ---- 저장/로드 ----
+
+    def snapshot(self) -> Dict:
+        """프로세스 풀 작업자에게 넘길 수 있는 카탈로그 내용"""
+        return {'version': CATALOG_VERSION, 'dirs': self.dir_mtimes, 'days': self.days}
+
+    def _read(self) -> Dict:
+        data = None
+        if self.catalog_path.exists():
+            try:
+                with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        if not data or data.get('version') != CATALOG_VERSION:
+            data = {'version': CATALOG_VERSION, 'dirs': {}, 'days': {}}
+        return data
+
+    def _load(self, snapshot: Optional[Dict] = None):
+        data = snapshot if snapshot is not None else self._read()
+        self.dir_mtimes: Dict[str, float] = data['dirs']
+        # 'YYYY-MM-DD' → 소스 → 종류 → [파일 항목]
+        self.days: Dict[str, Dict[str, Dict[str, List[Dict]]]] = data['days']
+
+    def _change(self, op: Tuple):
+        _apply(self.dir_mtimes, self.days, op)
+        self._ops.append(op)
+
+    def save(self):
+        """변경 사항이 있으면 잠금 안에서 디스크의 최신 카탈로그에 변경분을 적용해 원자적으로 저장
+
+        로드 이후 다른 프로세스가 등록한 항목을 덮어쓰지 않는다.
+        """
+        if not self._ops:
+            return
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.lock_path):
+            data = self._read()
+            for op in self._ops:
+                _apply(data['dirs'], data['days'], op)
+            tmp_path = self.catalog_path.with_name(f".{self.catalog_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.catalog_path)
+        self._ops = []
+        self._load(data)
+
+    # ---- 갱신 ----
+
+    def register(self, path: str, rows: Optional[int] = None) -> Optional[Dict]:
+        """파일 1개 등록/갱신 (수집기가 파일을 쓴 직후 호출)
+
+        Args:
+            path: 파일 경로
+            rows: 레코드 수. None이면 작은 파일은 직접 파싱해서 계산
+
+        Returns:
+            카탈로그 항목. 카탈로그 대상 파일이 아니면 None
+        """
+        path = Path(path).resolve()
+        info = classify_file(path.name)
+        if info is None or not path.exists():
+            return None
+
+        stat = path.stat()
+        key = (info['date'], info['source'], info['kind'])
+        entries = self.days.get(key[0], {}).get(key[1], {}).get(key[2], [])
+        existing = next((e for e in entries if e['name'] == path.name), None)
+
+        # 크기와 mtime이 같으면 해시를 다시 계산하지 않음
+        if existing and existing['size'] == stat.st_size and existing['mtime'] == stat.st_mtime:
+            if rows is not None and existing.get('rows') != rows:
+                existing = dict(existing, rows=rows)
+                self._change(('put',) + key + (existing,))
+            return existing
+
+        if rows is None:
+            rows = self._count_rows(path, info, stat.st_size)
+
+        entry = {
+            'name': path.name,
+            'time': info['time'],
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': _file_sha256(path),
+            'rows': rows
+        }
+        self._change(('put',) + key + (entry,))
+        return entry
+
+    def verify(self, source: str, entry: Dict) -> Optional[Dict]:
+        """항목의 파일을 stat해서 기록된 크기/mtime과 다르면 해시를 다시 계산한 항목 반환 (파일이 없으면 None)
+
+        수집 데몬처럼 같은 파일을 제자리에서 다시 쓰면 디렉토리 mtime이 바뀌지 않아 refresh()가 놓치므로
+        sha256을 입력 지문으로 쓰기 전에 호출한다. 바뀐 항목은 save() 때 카탈로그에 반영된다.
+        """
+        return self.register(str(self.path_of(source, entry)))
+
+    def _count_rows(self, path: Path, info: Dict, size: int) -> Optional[int]:
+        counter = _ROW_COUNTERS.get((info['source'], info['kind']))
+        if counter is None or size > ROW_COUNT_MAX_BYTES:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return counter(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def refresh(self) -> int:
+        """디렉토리 mtime이 바뀐 소스만 다시 훑어서 카탈로그 갱신
+
+        Returns:
+            다시 훑은 디렉토리 수
+        """
+        rescanned = 0
+        for source, (rel_dir, _) in SOURCES.items():
+            directory = self.project_root / rel_dir
+            try:
+                mtime = directory.stat().st_mtime
+            except OSError:
+                continue
+            if self.dir_mtimes.get(source) == mtime:
+                continue
+
+            rescanned += 1
+            present = set()
+            for path in directory.iterdir():
+                info = classify_file(path.name)
+                if info is None or info['source'] != source:
+                    continue
+                present.add(path.name)
+                self.register(str(path))
+
+            # 삭제된 파일 제거
+            removed = [(date, kind, entry['name'])
+                       for date, sources in self.days.items()
+                       for kind, entries in sources.get(source, {}).items()
+                       for entry in entries if entry['name'] not in present]
+            for date, kind, name in removed:
+                self._change(('drop', date, source, kind, name))
+
+            self._change(('dir', source, mtime))
+
+        self.save()
+        return rescanned
+
+    # ---- 조회 ----
+
+    def path_of(self, source: str, entry: Dict) -> Path:
+        """카탈로그 항목의 파일 경로 (프로젝트 루트 + 소스 출력 디렉토리 + 파일명)"""
+        return self.project_root / SOURCES[source][0] / entry['name']
+
+    def files(self, date: str, source: str, kind: str) -> List[Dict]:
+        """해당 날짜/소스/종류의 파일 항목 목록 (시각 → 파일명 순)"""
+        return list(self.days.get(date, {}).get(source, {}).get(kind, []))
+
+    def latest(self, date: str, source: str, kind: str) -> Optional[Dict]:
+        """해당 날짜의 가장 최근 파일 항목 (같은 날 여러 파일이면 파일명의 시각 기준, 결정적)"""
+        entries = self.days.get(date, {}).get(source, {}).get(kind)
+        return entries[-1] if entries else None
+
+    def archive_for(self, date: str, source: str) -> Optional[Dict]:
+        """날짜(YYYY-MM-DD)가 속한 달의 월간 아카이브 항목 (보존 기간이 지나 일일 파일이 정리된 날짜용)"""
+        return self.latest(f"{date[:7]}-01", source, 'archive')
+
+    def dates(self, source: str, kind: Optional[str] = None) -> List[str]:
+        """해당 소스(와 종류)의 파일이 있는 날짜 목록 (오름차순)"""
+        return sorted(
+            date for date, sources in self.days.items()
+            if source in sources and (kind is None or kind in sources[source])
+        )
+
+    def latest_date(self, source: str, kind: str) -> Optional[str]:
+        """해당 소스/종류 파일이 있는 가장 최근 날짜"""
+        dates = self.dates(source, kind)
+        return dates[-1] if dates else None
+
+    def summary(self) -> Dict:
+        """소스별 날짜 수와 파일 수"""
+        result = {}
+        for source in SOURCES:
+            days = self.dates(source)
+            result[source] = {
+                'days': len(days),
+                'files': sum(len(entries) for date in days for entries in self.days[date][source].values()),
+                'first_date': days[0] if days else None,
+                'last_date': days[-1] if days else None
+            }
+        return result
+
+
+def register_output(project_root: str, path: str, rows: Optional[int] = None) -> Optional[Dict]:
+    """카탈로그를 열어 파일 1개를 등록하고 저장 (수집기용 편의 함수)"""
+    catalog = OutputCatalog(project_root)
+    entry = catalog.register(path, rows)
+    catalog.save()
+    return entry
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 현재 출력 디렉토리로 카탈로그 갱신
+    project_root = Path(__file__).resolve().parents[3]
+    catalog = OutputCatalog(str(project_root))
+
+    started = datetime.now()
+    rescanned = catalog.refresh()
+    elapsed = (datetime.now() - started).total_seconds() * 1000
+
+    print(f"📚 카탈로그 갱신: 디렉토리 {rescanned}개 다시 스캔 ({elapsed:.1f}ms)")
+    for source, info in catalog.summary().items():
+        print(f"   • {source}: {info['days']}일, 파일 {info['files']}개 ({info['first_date']} ~ {info['last_date']})")
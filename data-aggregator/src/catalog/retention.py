@@ -0,0 +1,431 @@
+"""
+보존 기간 정리 - 오래된 원시 방문/앱 기록을 일별 집계로 줄여서 월간 아카이브로 합치기
+
+보존 기간(keep_days)이 지난 날짜는 원시 파일을 지우고 다음만 남긴다.
+- 브라우저: 일별 요약 + 도메인별/시간대별/도메인×시간대 방문 수, 카테고리/브라우저별 방문 수, 검색어별 횟수
+- 앱: 일별 요약 + 앱별/시간대별 사용 시간(분), 시간 단위로 줄인 롤업 (분 단위 버킷 제거)
+- 통합: 그 날의 마지막 통합 분석 결과 (시점 조회 색인처럼 원시 방문이 든 파생 파일은 삭제)
+텍스트 리포트는 요약으로 다시 만들 수 있으므로 아카이브하지 않고 지운다.
+
+같은 달의 날짜들은 소스별 월간 아카이브 하나(browser_archive_YYYYMM.json 등)에 모이고
+카탈로그에는 날짜별 파일 대신 달마다 아카이브 항목 하나만 남으므로, 보존 기간 밖의 저장 공간과
+카탈로그 스캔 비용은 기간이 길어져도 달 수에만 비례한다.
+주간/월간 롤업 행(output/rollups)은 건드리지 않으므로 롤업 조회는 그대로 동작하고,
+통합기는 아카이브된 날짜의 요약/롤업을 아카이브에서 읽는다.
+
+통합 출력이 참조하던 파생 데이터는 마크 앤 스윕으로 정리한다.
+- 단계 캐시(stage_cache.json): 보존 기간 밖 날짜의 항목과 출력 파일이 없어진 항목 제거
+- 객체 저장소(output/objects): 남은 통합 문서/통합 아카이브/단계 캐시 항목에서 (객체 안의 참조까지 따라가며)
+  닿지 않는 객체 삭제. 통합이 동시에 실행 중일 수 있으므로 최근 OBJECT_GRACE_SECONDS 안에 쓰거나
+  재사용한 객체는 남긴다
+- 기간 실행 보고서(output/runs): 끝 날짜가 보존 기간 밖인 보고서 삭제
+"""
+
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..integrators.object_store import ObjectStore, object_refs
+from .output_catalog import SOURCES, OutputCatalog
+from .stage_cache import StageCache
+
+ARCHIVE_VERSION = 1
+DEFAULT_KEEP_DAYS = 90
+
+# 소스 → 월간 아카이브 파일명 접두어
+ARCHIVE_PREFIXES = {'browser': 'browser_archive_', 'app': 'app_archive_', 'integrated': 'integrated_archive_'}
+
+# 롤업을 시간 단위로 줄일 때 지우는 분 단위 버킷
+_MINUTE_BUCKETS = ('focus_minutely', 'process_minutely')
+
+# 이 시간 안에 쓰거나 재사용한 객체는 참조가 없어도 지우지 않음 (진행 중인 통합 보호)
+OBJECT_GRACE_SECONDS = 3600
+
+# 단계 캐시에서 객체 해시를 출력으로 기록하는 단계 → 출력 이름
+_CACHED_OBJECT_OUTPUTS = {'integrate': 'sources'}
+
+
+def _load_json(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _sorted_counts(counts: Dict, limit: Optional[int] = None) -> Dict:
+    items = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+    return dict(items[:limit] if limit else items)
+
+
+def _nested_counts(counts: Dict[str, Dict]) -> Dict:
+    return {key: dict(sorted(inner.items())) for key, inner in counts.items()}
+
+
+def browser_day_aggregates(completes: Iterable[Dict]) -> Dict:
+    """하루치 browser_complete 문서들 → 일별 집계 (같은 방문이 여러 파일에 있어도 한 번만 셈)"""
+    visits: Dict[tuple, Dict] = {}
+    category_of: Dict[tuple, str] = {}
+    searches: Dict[tuple, Dict] = {}
+    for complete in completes:
+        for record in complete.get('raw_data', {}).get('merged_history', []):
+            visits[(record.get('browser'), record['url'], record['visit_time'])] = record
+        for category, records in complete.get('category_analysis', {}).get('categories', {}).items():
+            for record in records:
+                category_of[(record.get('browser'), record['url'], record['visit_time'])] = category
+        for search in complete.get('search_analysis', {}).get('queries', []):
+            searches[(search.get('browser'), search['url'], search['visit_time'])] = search
+
+    domains = defaultdict(int)
+    hours = defaultdict(int)
+    domain_hours = defaultdict(lambda: defaultdict(int))
+    categories = defaultdict(int)
+    browsers = defaultdict(int)
+    for key, record in visits.items():
+        hour = record['visit_time'][11:13]
+        domain = record.get('domain', '')
+        domains[domain] += 1
+        hours[hour] += 1
+        domain_hours[domain][hour] += 1
+        categories[category_of.get(key, 'other')] += 1
+        browsers[record.get('browser') or 'unknown'] += 1
+
+    search_terms = defaultdict(int)
+    for search in searches.values():
+        search_terms[search.get('query', '')] += 1
+
+    times = sorted(record['visit_time'] for record in visits.values())
+    return {
+        'total_visits': len(visits),
+        'unique_domains': len(domains),
+        'first_visit': times[0] if times else None,
+        'last_visit': times[-1] if times else None,
+        'domains': _sorted_counts(domains),
+        'hours': dict(sorted(hours.items())),
+        'domain_hours': _nested_counts(domain_hours),
+        'categories': _sorted_counts(categories),
+        'browsers': _sorted_counts(browsers),
+        'search_terms': _sorted_counts(search_terms)
+    }
+
+
+def app_day_aggregates(completes: Iterable[Dict]) -> Dict:
+    """하루치 app_usage_complete 문서들 → 일별 앱/시간대별 사용 시간(분) 집계"""
+    sessions: Dict[tuple, Dict] = {}
+    snapshots = 0
+    for complete in completes:
+        snapshots += 1
+        for record in complete.get('app_history', []):
+            sessions[(record.get('bundle_id'), record.get('timestamp'))] = record
+
+    app_minutes = defaultdict(float)
+    hours = defaultdict(float)
+    app_hours = defaultdict(lambda: defaultdict(float))
+    categories = defaultdict(float)
+    for record in sessions.values():
+        minutes = float(record.get('duration_minutes') or 0)
+        name = record.get('app_name') or record.get('bundle_id') or 'unknown'
+        hour = (record.get('timestamp') or '')[11:13] or '??'
+        app_minutes[name] += minutes
+        hours[hour] += minutes
+        app_hours[name][hour] += minutes
+        if record.get('category'):
+            categories[record['category']] += minutes
+
+    return {
+        'snapshots': snapshots,
+        'sessions': len(sessions),
+        'app_minutes': _sorted_counts(app_minutes),
+        'hours': dict(sorted(hours.items())),
+        'app_hours': _nested_counts(app_hours),
+        'category_minutes': _sorted_counts(categories)
+    }
+
+
+def downsample_app_rollup(rollup: Dict) -> Dict:
+    """앱 롤업에서 분 단위 버킷을 빼고 시간 단위/일 합계만 남김 (기간 롤업 기여분은 그대로 계산됨)"""
+    return {key: value for key, value in rollup.items() if key not in _MINUTE_BUCKETS}
+
+
+class RetentionJob:
+    """보존 기간이 지난 일일 출력 파일을 월간 아카이브로 합치고 카탈로그 갱신"""
+
+    def __init__(self, project_root: str, keep_days: int = DEFAULT_KEEP_DAYS,
+                 catalog: Optional[OutputCatalog] = None, stage_cache: Optional[StageCache] = None):
+        """
+        Args:
+            project_root: personal-logging-platform 프로젝트 루트 경로
+            keep_days: 원시 파일을 보존할 일 수 (오늘 포함 이 기간 안의 날짜는 건드리지 않음)
+            catalog: 이미 열어 둔 출력 카탈로그. None이면 직접 열어서 갱신
+            stage_cache: 이미 열어 둔 단계 캐시. None이면 직접 열기
+        """
+        if keep_days < 1:
+            raise ValueError("보존 기간은 1일 이상이어야 합니다")
+        self.project_root = Path(project_root)
+        self.keep_days = keep_days
+        if catalog is None:
+            catalog = OutputCatalog(str(self.project_root))
+            catalog.refresh()
+        self.catalog = catalog
+
+        output_dir = self.project_root / "data-aggregator" / "output"
+        if stage_cache is None:
+            stage_cache = StageCache(str(output_dir / "catalog" / "stage_cache.json"))
+        self.stage_cache = stage_cache
+        self.objects = ObjectStore(str(output_dir / "objects"))
+        self.runs_dir = output_dir / "runs"
+
+        self.timeline_dir = output_dir / "timeline"
+        self.event_dir = self.project_root / "app-tracker" / "src" / "output" / "events"
+
+    def cutoff(self, today: Optional[str] = None) -> str:
+        """이 날짜(YYYY-MM-DD) 이전이 정리 대상"""
+        day = datetime.strptime(today, '%Y-%m-%d') if today else datetime.now()
+        return (day - timedelta(days=self.keep_days - 1)).strftime('%Y-%m-%d')
+
+    def expired_days(self, today: Optional[str] = None) -> Dict[str, List[str]]:
+        """정리 대상 날짜 (월 'YYYY-MM' → 날짜 목록). 아카이브 항목만 있는 날짜는 제외"""
+        cutoff = self.cutoff(today)
+        months: Dict[str, List[str]] = defaultdict(list)
+        for date in sorted(self.catalog.days):
+            if date >= cutoff:
+                break
+            kinds = [kind for sources in self.catalog.days[date].values() for kind in sources]
+            if any(kind != 'archive' for kind in kinds):
+                months[date[:7]].append(date)
+        return dict(months)
+
+    # ---- 아카이브 ----
+
+    def archive_path(self, source: str, month: str) -> Path:
+        rel_dir = SOURCES[source][0]
+        return self.project_root / rel_dir / f"{ARCHIVE_PREFIXES[source]}{month.replace('-', '')}.json"
+
+    def _load_archive(self, source: str, month: str) -> Dict:
+        path = self.archive_path(source, month)
+        if path.exists():
+            archive = _load_json(str(path))
+            if archive.get('version') == ARCHIVE_VERSION:
+                return archive
+        return {'version': ARCHIVE_VERSION, 'source': source, 'month': month, 'days': {}}
+
+    def _save_archive(self, archive: Dict) -> Path:
+        path = self.archive_path(archive['source'], archive['month'])
+        archive['days'] = dict(sorted(archive['days'].items()))
+        archive['updated_at'] = datetime.now().isoformat()
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(archive, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return path
+
+    def _day_record(self, source: str, kinds: Dict[str, List[Path]], previous: Optional[Dict]) -> Dict:
+        """하루치 파일들(종류 → 시각순 경로) → 아카이브에 넣을 일별 기록 (이미 아카이브된 날짜면 이전 기록에 덧붙임)"""
+        record = dict(previous or {})
+        latest = {kind: str(paths[-1]) for kind, paths in kinds.items()}
+
+        if source == 'browser':
+            if 'summary' in latest:
+                record['summary'] = _load_json(latest['summary'])
+            if 'complete' in kinds:
+                record['aggregates'] = browser_day_aggregates(_load_json(str(p)) for p in kinds['complete'])
+        elif source == 'app':
+            if 'summary' in latest:
+                record['summary'] = _load_json(latest['summary'])
+            if 'rollup' in latest:
+                record['rollup'] = downsample_app_rollup(_load_json(latest['rollup']))
+            if 'complete' in kinds:
+                record['aggregates'] = app_day_aggregates(_load_json(str(p)) for p in kinds['complete'])
+        elif source == 'integrated' and 'integrated' in kinds:
+            # 같은 날 통합 파일이 여러 개면 마지막에 쓴 파일 (파일명의 시각은 날짜를 넘나들면 순서가 맞지 않음)
+            newest = max(kinds['integrated'], key=lambda p: p.stat().st_mtime)
+            document = _load_json(str(newest))
+            record['integrated'] = {
+                key: document.get(key) for key in ('timestamp', 'content_sha256', 'data_sources', 'analysis')
+            }
+
+        record['archived_files'] = sorted(set(record.get('archived_files', [])) |
+                                          {p.name for paths in kinds.values() for p in paths})
+        return record
+
+    # ---- 실행 ----
+
+    def run(self, today: Optional[str] = None, dry_run: bool = False) -> Dict:
+        """보존 기간이 지난 날짜를 월간 아카이브로 합치고 원시/파생 파일 삭제
+
+        아카이브를 먼저 원자적으로 저장한 뒤에 원본을 지우므로 중간에 멈춰도 데이터는 남는다
+        (다시 실행하면 남은 파일만 이어서 정리).
+
+        Args:
+            today: 기준 날짜 (YYYY-MM-DD, 기본값: 오늘)
+            dry_run: True면 대상만 계산하고 파일은 바꾸지 않음
+
+        Returns:
+            {'cutoff', 'months', 'days', 'removed_files', 'removed_bytes', 'archive_bytes', 'archives',
+             'swept': {'cache_entries', 'objects', 'run_reports', 'bytes'}}
+        """
+        months = self.expired_days(today)
+        report = {
+            'cutoff': self.cutoff(today),
+            'months': sorted(months),
+            'days': sum(len(dates) for dates in months.values()),
+            'removed_files': 0,
+            'removed_bytes': 0,
+            'archive_bytes': 0,
+            'archives': []
+        }
+
+        for month, dates in sorted(months.items()):
+            removable: List[Path] = []
+            for source in SOURCES:
+                days = {}
+                for date in dates:
+                    kinds = {}
+                    for kind, entries in self.catalog.days[date].get(source, {}).items():
+                        paths = [self.catalog.path_of(source, e) for e in entries] if kind != 'archive' else []
+                        paths = [path for path in paths if path.exists()]
+                        if paths:
+                            kinds[kind] = paths
+                    if kinds:
+                        days[date] = kinds
+                if not days:
+                    continue
+
+                archive = self._load_archive(source, month)
+                for date, kinds in days.items():
+                    archive['days'][date] = self._day_record(source, kinds, archive['days'].get(date))
+                    removable.extend(path for paths in kinds.values() for path in paths)
+
+                if not dry_run:
+                    path = self._save_archive(archive)
+                    self.catalog.register(str(path), rows=len(archive['days']))
+                    report['archives'].append(str(path))
+                    report['archive_bytes'] += path.stat().st_size
+
+            # 원시 방문/이벤트가 든 파생 파일 (카탈로그 밖)
+            for date in dates:
+                removable.append(self.timeline_dir / f"timeline_{date}.json")
+                removable.extend(self.event_dir.glob(f"events_{date.replace('-', '')}_*"))
+
+            for path in removable:
+                if not path.exists():
+                    continue
+                report['removed_files'] += 1
+                report['removed_bytes'] += path.stat().st_size
+                if not dry_run:
+                    path.unlink()
+
+        if not dry_run:
+            # 삭제된 파일은 디렉토리 mtime이 바뀐 소스를 다시 훑으면서 카탈로그에서 빠짐
+            self.catalog.refresh()
+        report['swept'] = self.sweep(report['cutoff'], dry_run)
+        return report
+
+    # ---- 마크 앤 스윕 ----
+
+    def _live_objects(self, cutoff: str, dropped_entries: Iterable[str]) -> set:
+        """남은 통합 문서, 통합 아카이브, 단계 캐시 항목에서 닿는 객체 해시 (객체 안의 참조까지)"""
+        pending: List[str] = []
+        for date, sources in self.catalog.days.items():
+            for kind, entries in sources.get('integrated', {}).items():
+                if date < cutoff and kind != 'archive':
+                    # 이번 정리로 지워지는(dry_run이면 지워질) 통합 파일
+                    continue
+                for entry in entries:
+                    try:
+                        pending.extend(object_refs(_load_json(str(self.catalog.path_of('integrated', entry)))))
+                    except (OSError, ValueError):
+                        continue
+
+        dropped = set(dropped_entries)
+        for name, entry in self.stage_cache.entries.items():
+            output = _CACHED_OBJECT_OUTPUTS.get(name.split(':', 1)[0])
+            if output and name not in dropped and entry.get('outputs', {}).get(output):
+                pending.append(entry['outputs'][output])
+
+        live = set()
+        while pending:
+            digest = pending.pop()
+            if digest in live:
+                continue
+            live.add(digest)
+            try:
+                pending.extend(object_refs(self.objects.get(digest)))
+            except (OSError, ValueError):
+                continue
+        return live
+
+    def sweep(self, cutoff: str, dry_run: bool = False) -> Dict:
+        """보존 기간 밖 단계 캐시 항목, 참조가 끊긴 객체, 기간 실행 보고서 정리
+
+        Args:
+            cutoff: 이 날짜(YYYY-MM-DD) 이전이 정리 대상
+            dry_run: True면 대상만 세고 파일은 바꾸지 않음
+
+        Returns:
+            {'cache_entries', 'objects', 'run_reports', 'bytes'}
+        """
+        swept = {'cache_entries': 0, 'objects': 0, 'run_reports': 0, 'bytes': 0}
+
+        dropped = self.stage_cache.prune(before=cutoff, dry_run=dry_run)
+        swept['cache_entries'] = len(dropped)
+        if not dry_run:
+            self.stage_cache.save()
+
+        live = self._live_objects(cutoff, dropped)
+        recent = time.time() - OBJECT_GRACE_SECONDS
+        for digest in list(self.objects.digests()):
+            if digest in live:
+                continue
+            path = self.objects.path_for(digest)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if stat.st_mtime > recent:
+                continue
+            swept['objects'] += 1
+            swept['bytes'] += stat.st_size
+            if not dry_run:
+                path.unlink()
+                try:
+                    path.parent.rmdir()
+                except OSError:
+                    pass  # 다른 객체가 남아 있음
+
+        # range_run_<시작>_<끝>_<시각>.json - 끝 날짜까지 모두 보존 기간 밖이면 삭제
+        end_limit = cutoff.replace('-', '')
+        for path in sorted(self.runs_dir.glob('range_run_*.json')):
+            parts = path.stem.split('_')
+            if len(parts) != 5 or parts[3] >= end_limit:
+                continue
+            swept['run_reports'] += 1
+            swept['bytes'] += path.stat().st_size
+            if not dry_run:
+                path.unlink()
+        return swept
+
+
+def load_archived_day(catalog: OutputCatalog, date: str, source: str) -> Optional[Dict]:
+    """아카이브된 날짜의 일별 기록 (없으면 None)"""
+    entry = catalog.archive_for(date, source)
+    if entry is None:
+        return None
+    try:
+        return _load_json(str(catalog.path_of(source, entry)))['days'].get(date)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 현재 출력 기준으로 정리 대상만 계산 (파일은 바꾸지 않음)
+    project_root = Path(__file__).resolve().parents[3]
+    job = RetentionJob(str(project_root), keep_days=DEFAULT_KEEP_DAYS)
+    result = job.run(dry_run=True)
+    print(f"🧹 보존 기간 {job.keep_days}일 (기준 {result['cutoff']} 이전)")
+    print(f"   • 대상: {result['days']}일 ({', '.join(result['months']) or '없음'})")
+    print(f"   • 삭제될 파일: {result['removed_files']}개 ({result['removed_bytes'] / 1024:.1f}KB)")
+    swept = result['swept']
+    print(f"   • 참조가 끊긴 객체 {swept['objects']}개, 단계 캐시 항목 {swept['cache_entries']}개, "
+          f"실행 보고서 {swept['run_reports']}개 ({swept['bytes'] / 1024:.1f}KB)")
@@ -0,0 +1,165 @@
+"""
+파이프라인 단계 캐시 - 입력이 바뀌지 않은 단계는 건너뛰기 (make 방식)
+
+단계마다 (입력 해시, 템플릿 해시, 코드 버전)으로 키를 만들고,
+날짜(범위)별로 마지막 실행의 키와 출력 파일을 기록한다.
+키가 같고 기록된 출력 파일이 그대로 있으면 캐시 적중으로 보고 단계를 건너뛴다.
+
+코드 버전은 단계를 구현한 소스 파일들의 해시라서, 코드를 고치면 해당 단계부터 자동으로 다시 실행된다.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+STAGE_CACHE_VERSION = 1
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """파일 sha256 (없으면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            return _sha256_bytes(f.read())
+    except OSError:
+        return None
+
+
+def code_version(paths: Iterable[Path]) -> str:
+    """디렉토리/파일 목록 아래의 .py 소스 전체 해시 (경로 순서 고정)"""
+    digest = hashlib.sha256()
+    files = []
+    for path in paths:
+        path = Path(path)
+        files.extend(sorted(path.rglob('*.py')) if path.is_dir() else [path])
+    for file in files:
+        if '__pycache__' in file.parts or not file.exists():
+            continue
+        digest.update(file.name.encode('utf-8'))
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """단계별 입력 키 → 출력 기록"""
+
+    def __init__(self, cache_path: str, stage_code: Optional[Dict[str, Iterable[Path]]] = None):
+        """
+        Args:
+            cache_path: 캐시 파일 경로 (보통 data-aggregator/output/catalog/stage_cache.json)
+            stage_code: 단계 이름 → 그 단계를 구현한 소스 디렉토리/파일 목록 (코드 버전 계산용)
+        """
+        self.cache_path = Path(cache_path)
+        self.code_versions = {stage: code_version(paths) for stage, paths in (stage_code or {}).items()}
+        self.results: Dict[str, str] = {}  # 이번 실행의 단계별 결과 (hit/miss/forced)
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        data = None
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        if not data or data.get('version') != STAGE_CACHE_VERSION:
+            data = {'version': STAGE_CACHE_VERSION, 'entries': {}}
+        # '단계:범위' → {'key', 'outputs', 'output_hashes', 'updated_at'}
+        self.entries: Dict[str, Dict] = data['entries']
+
+    def save(self):
+        """변경 사항이 있으면 원자적으로 저장"""
+        if not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STAGE_CACHE_VERSION, 'entries': self.entries},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def key(self, stage: str, **inputs) -> str:
+        """단계 입력(해시들, 설정 값) + 코드 버전으로 캐시 키 생성"""
+        payload = {'stage': stage, 'code': self.code_versions.get(stage), 'inputs': inputs}
+        return _sha256_bytes(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+
+    def lookup(self, stage: str, scope: str, key: str, force: bool = False) -> Optional[Dict]:
+        """캐시 적중이면 기록(outputs 포함) 반환, 아니면 None
+
+        기록된 출력 파일이 없어졌거나 내용이 바뀌었으면(해시를 기록한 경우) 적중으로 보지 않는다.
+        """
+        if force:
+            self.results[stage] = 'forced'
+            return None
+
+        entry = self.entries.get(f"{stage}:{scope}")
+        if entry and entry['key'] == key and self._outputs_intact(entry):
+            self.results[stage] = 'hit'
+            return entry
+
+        self.results[stage] = 'miss'
+        return None
+
+    @staticmethod
+    def _outputs_intact(entry: Dict) -> bool:
+        for name, path in entry.get('files', {}).items():
+            if not path or not os.path.exists(path):
+                return False
+            expected = entry.get('file_hashes', {}).get(name)
+            if expected and file_sha256(path) != expected:
+                return False
+        return True
+
+    def store(self, stage: str, scope: str, key: str, outputs: Dict,
+              files: Optional[Dict[str, str]] = None, hash_files: bool = False):
+        """단계 실행 결과 기록
+
+        Args:
+            outputs: 다음 단계에 넘길 값 (해시, 경로 등)
+            files: 이 단계가 만든 출력 파일 (이름 → 경로). 없어지면 캐시 무효
+            hash_files: True면 출력 파일 해시도 기록해서 파일이 수정되면 캐시 무효
+        """
+        files = files or {}
+        self.entries[f"{stage}:{scope}"] = {
+            'key': key,
+            'outputs': outputs,
+            'files': files,
+            'file_hashes': {name: file_sha256(path) for name, path in files.items()} if hash_files else {},
+            'updated_at': datetime.now().isoformat()
+        }
+        self._dirty = True
+
+    def prune(self, before: Optional[str] = None, dry_run: bool = False) -> List[str]:
+        """범위가 before(YYYY-MM-DD)보다 이전이거나 기록된 출력 파일이 없어진 항목 제거
+
+        보존 기간 정리(RetentionJob)가 호출한다. 출력 파일이 없는 항목은 어차피 적중하지 않는다.
+
+        Returns:
+            제거한(dry_run이면 제거할) '단계:범위' 목록
+        """
+        removed = [
+            name for name, entry in self.entries.items()
+            if (before and name.split(':', 1)[1] < before)
+            or any(not path or not os.path.exists(path) for path in entry.get('files', {}).values())
+        ]
+        if removed and not dry_run:
+            for name in removed:
+                del self.entries[name]
+            self._dirty = True
+        return removed
+
+    def report(self) -> Dict:
+        """이번 실행의 단계별 결과와 적중 수"""
+        return {
+            'stages': dict(self.results),
+            'hits': sum(1 for result in self.results.values() if result == 'hit'),
+            'total': len(self.results)
+        }
@@ -6,9 +6,11 @@ Author: Personal Data Engineer
 """
 
 import json
+import os
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from string import Template
 import re
 
@@ -16,15 +18,20 @@ import re
 class ObsidianNoteGenerator:
     """통합 데이터를 옵시디언 Daily Notes로 변환하는 클래스"""
     
-    def __init__(self, template_dir: str, output_dir: str):
+    def __init__(self, template_dir: str, output_dir: str, templates: Optional[Dict[str, str]] = None):
         """
         Args:
             template_dir: 템플릿 디렉토리 경로
             output_dir: 출력 디렉토리 경로
+            templates: 미리 읽어 둔 템플릿 (파일명 → 내용). 병렬 작업자가 파일을 다시 읽지 않도록 공유
         """
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.templates: Dict[str, str] = dict(templates or {})
+        
+        # 컴파일된 템플릿 캐시: 파일명 → (mtime_ns, Template). 파일이 바뀌면 다시 컴파일
+        self._compiled: Dict[str, Tuple[Optional[int], Template]] = {}
         
         # 기본 템플릿 생성
         self._ensure_templates_exist()
@@ -78,6 +85,8 @@ ${tags}
     def generate_daily_note(self, integrated_data: Dict, template_name: str = "daily_note_template.md") -> str:
         """통합 데이터를 Daily Note로 변환
         
+        렌더링 결과가 디스크의 파일과 바이트 단위로 같으면 파일을 다시 쓰지 않는다.
+        
         Args:
             integrated_data: 데이터 통합기에서 생성된 통합 데이터
             template_name: 사용할 템플릿 파일명
@@ -87,31 +96,101 @@ ${tags}
         """
         print(f"📝 Daily Note 생성 시작: {integrated_data['date']}")
         
-        # 템플릿 로드
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"템플릿을 찾을 수 없습니다: {template_path}")
+        rendered_note = self.render_daily_note(integrated_data, template_name)
+        output_path = self.note_path_for(integrated_data['date'])
         
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
+        if self._write_if_changed(output_path, rendered_note):
+            print(f"✅ Daily Note 생성 완료: {output_path}")
+        else:
+            print(f"✅ Daily Note 변경 없음: {output_path}")
+        return str(output_path)
+    
+    def render_daily_notes(self, integrated_docs: Iterable[Dict],
+                           template_name: str = "daily_note_template.md") -> Dict:
+        """여러 날의 통합 데이터를 한 번에 렌더링 (템플릿은 한 번만 컴파일)
         
-        # 템플릿 변수 생성
-        template_vars = self._prepare_template_variables(integrated_data)
+        내용이 바뀐 노트만 쓰므로 변경 없는 파일의 mtime이 유지된다 (Obsidian Sync 재업로드 방지).
         
-        # 템플릿 렌더링
-        template = Template(template_content)
-        rendered_note = template.safe_substitute(**template_vars)
+        Returns:
+            {'written': [경로], 'unchanged': [경로], 'elapsed_seconds': 초}
+        """
+        started = time.perf_counter()
+        result = {'written': [], 'unchanged': [], 'elapsed_seconds': 0.0}
+        
+        for integrated_data in integrated_docs:
+            rendered_note = self.render_daily_note(integrated_data, template_name)
+            output_path = self.note_path_for(integrated_data['date'])
+            key = 'written' if self._write_if_changed(output_path, rendered_note) else 'unchanged'
+            result[key].append(str(output_path))
+        
+        result['elapsed_seconds'] = round(time.perf_counter() - started, 4)
+        print(f"📝 Daily Note 일괄 생성: 작성 {len(result['written'])}개, "
+              f"변경 없음 {len(result['unchanged'])}개 ({result['elapsed_seconds']:.2f}초)")
+        return result
+    
+    def render_daily_note(self, integrated_data: Dict, template_name: str = "daily_note_template.md") -> str:
+        """통합 데이터 → 렌더링된 마크다운 문자열 (파일은 쓰지 않음)"""
+        template = self._compiled_template(template_name)
+        template_vars = self._prepare_template_variables(integrated_data)
+        return template.safe_substitute(**template_vars)
+    
+    def note_path_for(self, date_str: str) -> Path:
+        """출력 디렉토리의 Daily Note 경로"""
+        return self.output_dir / f"{date_str} - Daily Log.md"
+    
+    def _compiled_template(self, template_name: str) -> Template:
+        """컴파일된 템플릿 (파일 mtime이 바뀌었을 때만 다시 읽음)"""
+        if template_name in self.templates:
+            mtime = None
+        else:
+            template_path = self.template_dir / template_name
+            try:
+                mtime = template_path.stat().st_mtime_ns
+            except OSError:
+                raise FileNotFoundError(f"템플릿을 찾을 수 없습니다: {template_path}")
+        
+        cached = self._compiled.get(template_name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, Template(self.load_template(template_name)))
+            self._compiled[template_name] = cached
+        return cached[1]
+    
+    @staticmethod
+    def _write_if_changed(path: Path, content: str) -> bool:
+        """내용이 디스크의 파일과 다를 때만 쓰기. 썼으면 True
         
-        # 출력 파일 생성
-        date_str = integrated_data['date']
-        filename = f"{date_str} - Daily Log.md"
-        output_path = self.output_dir / filename
+        임시 파일에 쓴 뒤 os.replace로 바꿔치기하므로 동기화 도구나 옵시디언이
+        반쯤 쓰인 노트를 읽는 일이 없다.
+        """
+        data = content.encode('utf-8')
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        
+        # 임시 파일은 같은 디렉토리에 숨김 파일로 (옵시디언이 노트로 인식하지 않음)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return True
+    
+    def load_template(self, template_name: str) -> str:
+        """템플릿 내용 반환 (미리 읽어 둔 템플릿이 있으면 파일을 읽지 않음)"""
+        if template_name in self.templates:
+            return self.templates[template_name]
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(rendered_note)
+        template_path = self.template_dir / template_name
+        if not template_path.exists():
+            raise FileNotFoundError(f"템플릿을 찾을 수 없습니다: {template_path}")
         
-        print(f"✅ Daily Note 생성 완료: {output_path}")
-        return str(output_path)
+        with open(template_path, 'r', encoding='utf-8') as f:
+            return f.read()
     
     def _prepare_template_variables(self, data: Dict) -> Dict[str, str]:
         """템플릿 변수 준비"""
@@ -121,7 +200,7 @@ ${tags}
         
         return {
             'date': data['date'],
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': self._note_timestamp(data),
             'activity_summary': self._generate_activity_summary(data, analysis),
             'digital_activity': self._generate_digital_activity_section(data, analysis),
             'browser_analysis': self._generate_browser_section(browser_data),
@@ -132,6 +211,14 @@ ${tags}
             'tags': self._generate_tags(browser_data, app_data, analysis)
         }
     
+    @staticmethod
+    def _note_timestamp(data: Dict) -> str:
+        """노트에 표시할 생성 시각 - 통합 시각을 사용해서 같은 데이터면 같은 노트가 나오게 함"""
+        try:
+            return datetime.fromisoformat(data['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        except (KeyError, TypeError, ValueError):
+            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
     def _generate_activity_summary(self, data: Dict, analysis: Dict) -> str:
         """활동 요약 섹션 생성"""
         summary_parts = []
@@ -187,8 +274,9 @@ ${tags}
         
         if app_data:
             sections.append("### 📱 앱 활동")
-            if app_data['complete']:
-                session_count = len(app_data['complete']['sessions'])
+            # 세션 수는 통합 분석에서 계산된 값을 사용 (원시 complete 파일을 다시 읽지 않음)
+            session_count = analysis.get('activity_overview', {}).get('total_app_sessions')
+            if session_count:
                 sections.append(f"- **앱 세션**: {session_count}회")
             sections.append("- 상세한 앱 사용 패턴은 아래 '앱 사용 패턴' 섹션을 참고하세요.")
             sections.append("")
@@ -342,7 +430,23 @@ ${tags}
         focus_analysis = analysis.get('focus_analysis', {})
         if focus_analysis:
             sections.append("### 🎯 집중도 분석")
-            sections.append("집중도 분석 기능이 곧 추가될 예정입니다.")
+            sections.append(f"- **집중 세션**: {focus_analysis.get('focus_sessions', 0)}개 "
+                            f"(총 {focus_analysis.get('total_focus_minutes', 0)}분, "
+                            f"딥워크 {focus_analysis.get('deep_work_blocks', 0)}개)")
+            
+            longest = focus_analysis.get('longest_deep_work')
+            if longest:
+                sections.append(f"- **가장 긴 집중 블록**: {longest['start'][11:16]} ~ {longest['end'][11:16]} "
+                                f"({longest['minutes']}분, 주로 {longest['main_context']})")
+            
+            sections.append(f"- **컨텍스트 전환**: {focus_analysis.get('context_switches', 0)}회 "
+                            f"(활동 시간당 평균 {focus_analysis.get('avg_switches_per_active_hour', 0)}회)")
+            
+            switches_per_hour = focus_analysis.get('context_switches_per_hour', {})
+            if switches_per_hour:
+                busiest = sorted(switches_per_hour.items(), key=lambda item: item[1], reverse=True)[:3]
+                sections.append("- **전환이 잦았던 시간대**: " +
+                                ", ".join(f"{hour}시 ({count}회)" for hour, count in busiest))
             sections.append("")
         
         if not sections:
@@ -405,9 +509,28 @@ ${tags}
         
         return ' '.join(sorted(tags))
     
+    @staticmethod
+    def vault_note_path(vault_path: str, date_str: str) -> Path:
+        """Vault의 Daily Note 경로 (옵시디언 표준 형식: Daily Notes/YYYY-MM-DD.md)"""
+        return Path(vault_path) / "Daily Notes" / f"{date_str}.md"
+    
+    def write_vault_note(self, integrated_data: Dict, vault_path: str,
+                         template_name: str = "daily_note_template.md") -> Tuple[Path, bool]:
+        """렌더링해서 Vault의 Daily Note에 원자적으로 쓰기 (내용이 같으면 쓰지 않음)
+        
+        Returns:
+            (노트 경로, 실제로 썼는지 여부)
+        """
+        note_path = self.vault_note_path(vault_path, integrated_data['date'])
+        note_path.parent.mkdir(exist_ok=True)
+        rendered_note = self.render_daily_note(integrated_data, template_name)
+        return note_path, self._write_if_changed(note_path, rendered_note)
+    
     def create_obsidian_vault_note(self, integrated_data: Dict, vault_path: str, template_name: str = "daily_note_template.md") -> str:
         """옵시디언 Vault에 직접 Daily Note 생성
         
+        출력 디렉토리를 거치지 않고 렌더링 결과를 Vault에 바로 원자적으로 쓴다 (내용이 같으면 쓰지 않음).
+        
         Args:
             integrated_data: 통합 데이터
             vault_path: 옵시디언 Vault 경로
@@ -422,27 +545,13 @@ ${tags}
         
         print(f"📓 옵시디언 Vault에 노트 생성: {vault_path}")
         
-        # Daily Notes 폴더 확인/생성
-        daily_notes_dir = vault_path / "Daily Notes"
-        daily_notes_dir.mkdir(exist_ok=True)
-        
-        # 임시로 일반 노트 생성 후 복사
-        temp_note = self.generate_daily_note(integrated_data, template_name)
-        
-        # Vault에 복사
-        date_str = integrated_data['date']
-        vault_filename = f"{date_str}.md"  # 옵시디언 표준 형식
-        vault_note_path = daily_notes_dir / vault_filename
-        
-        # 파일 복사
-        with open(temp_note, 'r', encoding='utf-8') as src:
-            with open(vault_note_path, 'w', encoding='utf-8') as dst:
-                dst.write(src.read())
-        
-        print(f"✅ 옵시디언 노트 생성 완료: {vault_note_path}")
+        vault_note_path, written = self.write_vault_note(integrated_data, str(vault_path), template_name)
+        if written:
+            print(f"✅ 옵시디언 노트 생성 완료: {vault_note_path}")
+        else:
+            print(f"✅ 옵시디언 노트 변경 없음: {vault_note_path}")
         return str(vault_note_path)
 
-
 if __name__ == "__main__":
     # 테스트 실행
     import sys
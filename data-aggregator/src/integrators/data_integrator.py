@@ -10,22 +10,76 @@ import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-import glob
 from collections import defaultdict
 
+from ..analyzers.focus_analyzer import analyze_focus
+from ..analyzers.period_rollup import PeriodRollupStore, day_contribution
+from ..analyzers.timeline_index import TimelineIndex, build_timeline_index, searches_from_browser_complete
+from ..analyzers.time_correlation import (
+    correlate_visits_with_focus, intervals_from_app_history, visits_from_browser_complete
+)
+from ..catalog import OutputCatalog
+from ..catalog.retention import load_archived_day
+from .lazy_json import LazyJsonFile, json_default
+from .object_store import ObjectStore, content_hash
+
+# 통합 문서에 그대로 넣지 않고 객체 저장소에 한 번만 저장한 뒤 해시로 참조하는 소스 섹션
+OBJECT_SECTIONS = ('summary', 'rollup', 'aggregates')
+
 
 class DataIntegrator:
     """브라우저 데이터와 앱 데이터를 통합하는 클래스"""
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, catalog: Optional[OutputCatalog] = None):
         """
         Args:
             project_root: personal-logging-platform 프로젝트 루트 경로
+            catalog: 이미 갱신된 출력 카탈로그 (병렬 작업자용). None이면 직접 열어서 갱신
         """
         self.project_root = Path(project_root)
         self.browser_data_path = self.project_root / "browser-collector" / "output"
         self.app_data_path = self.project_root / "app-tracker" / "src" / "output"
         
+        # 출력 파일 색인 - 디렉토리 mtime이 바뀐 소스만 다시 훑음
+        if catalog is None:
+            catalog = OutputCatalog(str(self.project_root))
+            catalog.refresh()
+        self.catalog = catalog
+        
+        # 소스 페이로드 내용 주소 저장소 - 통합 문서는 해시 참조만 가짐
+        self.objects = ObjectStore(str(self.project_root / "data-aggregator" / "output" / "objects"))
+        
+        # 주간/월간 기간 롤업 - 하루를 통합할 때마다 그 날의 기여분만 반영
+        self.rollups = PeriodRollupStore(str(self.project_root / "data-aggregator" / "output" / "rollups"))
+        
+        # 날짜별 시점 조회 색인 - 통합 데이터를 저장할 때 함께 갱신
+        self.timeline_dir = self.project_root / "data-aggregator" / "output" / "timeline"
+        
+    def _resolve_date(self, source: str, target_date: Optional[str]) -> Optional[str]:
+        """대상 날짜(YYYY-MM-DD) 결정 - None이면 카탈로그에서 요약 파일이 있는 가장 최근 날짜"""
+        if target_date:
+            return target_date
+        return self.catalog.latest_date(source, 'summary')
+    
+    def _load_catalog_json(self, date: str, source: str, kind: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """카탈로그에서 해당 날짜의 가장 최근 파일을 찾아 로드 (없으면 (None, None))
+
+        complete 파일은 원시 기록 전체라 크기가 기록 양에 비례하므로 바로 파싱하지 않고
+        LazyJsonFile 핸들을 반환한다. 분석이 실제로 접근한 섹션만 그때 파싱된다.
+        """
+        entry = self.catalog.latest(date, source, kind)
+        if entry is None:
+            # 보존 기간이 지나 월간 아카이브로 합쳐진 날짜는 아카이브의 요약/롤업 사용 (원시 complete는 없음)
+            archived = load_archived_day(self.catalog, date, source) if kind in ('summary', 'rollup') else None
+            if archived and archived.get(kind) is not None:
+                return archived[kind], str(self.catalog.path_of(source, self.catalog.archive_for(date, source)))
+            return None, None
+        path = str(self.catalog.path_of(source, entry))
+        if kind == 'complete':
+            return LazyJsonFile(path), path
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), path
+    
     def load_browser_data(self, target_date: str = None) -> Optional[Dict]:
         """브라우저 데이터 로드
         
@@ -36,50 +90,39 @@ class DataIntegrator:
             통합된 브라우저 데이터 딕셔너리
         """
         try:
-            if target_date:
-                # 특정 날짜 데이터 찾기
-                summary_pattern = f"browser_summary_{target_date.replace('-', '')}.json"
-                complete_pattern = f"browser_complete_{target_date.replace('-', '')}_*.json"
-            else:
-                # 최신 데이터 찾기
-                summary_files = list(self.browser_data_path.glob("browser_summary_*.json"))
-                if not summary_files:
-                    print("⚠️  브라우저 데이터가 없습니다.")
-                    return None
-                
-                latest_summary = max(summary_files, key=os.path.getctime)
-                date_str = latest_summary.stem.split('_')[-1]  # 20250817
-                summary_pattern = f"browser_summary_{date_str}.json"
-                complete_pattern = f"browser_complete_{date_str}_*.json"
+            date = self._resolve_date('browser', target_date)
+            if date is None:
+                print("⚠️  브라우저 데이터가 없습니다.")
+                return None
             
             # Summary 데이터 로드
-            summary_files = list(self.browser_data_path.glob(summary_pattern))
-            complete_files = list(self.browser_data_path.glob(complete_pattern))
-            
-            if not summary_files:
+            summary_data, summary_file = self._load_catalog_json(date, 'browser', 'summary')
+            if summary_data is None:
                 print(f"⚠️  {target_date or '최신'} 날짜의 브라우저 요약 데이터를 찾을 수 없습니다.")
                 return None
                 
-            with open(summary_files[0], 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
-                
-            # Complete 데이터 로드 (있으면)
-            complete_data = None
-            if complete_files:
-                with open(complete_files[0], 'r', encoding='utf-8') as f:
-                    complete_data = json.load(f)
+            # Complete 데이터 핸들 (있으면, 같은 날 여러 개면 가장 최근 파일) - 접근할 때 섹션 단위로 파싱
+            complete_data, complete_file = self._load_catalog_json(date, 'browser', 'complete')
             
-            return {
+            browser_data = {
                 'type': 'browser',
-                'date': summary_data.get('date'),
+                'date': summary_data.get('date') or date,
                 'summary': summary_data,
                 'complete': complete_data,
                 'source_files': {
-                    'summary': str(summary_files[0]),
-                    'complete': str(complete_files[0]) if complete_files else None
+                    'summary': summary_file,
+                    'complete': complete_file
                 }
             }
             
+            # 아카이브된 날짜는 complete 대신 아카이브의 일별 집계(전체 도메인/카테고리 방문 수)를 기간 롤업에 사용
+            if complete_data is None:
+                archived = load_archived_day(self.catalog, date, 'browser')
+                if archived and archived.get('aggregates'):
+                    browser_data['aggregates'] = archived['aggregates']
+            
+            return browser_data
+            
         except Exception as e:
             print(f"❌ 브라우저 데이터 로드 실패: {str(e)}")
             return None
@@ -94,51 +137,33 @@ class DataIntegrator:
             통합된 앱 데이터 딕셔너리
         """
         try:
-            if not self.app_data_path.exists():
-                print("⚠️  앱 추적 데이터 디렉토리가 없습니다. 앱 추적기를 먼저 실행해주세요.")
+            date = self._resolve_date('app', target_date)
+            if date is None:
+                print("⚠️  앱 데이터가 없습니다. 앱 추적기를 먼저 실행해주세요.")
                 return None
-                
-            if target_date:
-                # 특정 날짜 데이터 찾기
-                summary_pattern = f"app_summary_{target_date.replace('-', '')}.json"
-                complete_pattern = f"app_complete_{target_date.replace('-', '')}_*.json"
-            else:
-                # 최신 데이터 찾기
-                summary_files = list(self.app_data_path.glob("app_summary_*.json"))
-                if not summary_files:
-                    print("⚠️  앱 데이터가 없습니다. 앱 추적기를 먼저 실행해주세요.")
-                    return None
-                
-                latest_summary = max(summary_files, key=os.path.getctime)
-                date_str = latest_summary.stem.split('_')[-1]
-                summary_pattern = f"app_summary_{date_str}.json"
-                complete_pattern = f"app_complete_{date_str}_*.json"
             
             # Summary 데이터 로드
-            summary_files = list(self.app_data_path.glob(summary_pattern))
-            complete_files = list(self.app_data_path.glob(complete_pattern))
-            
-            if not summary_files:
+            summary_data, summary_file = self._load_catalog_json(date, 'app', 'summary')
+            if summary_data is None:
                 print(f"⚠️  {target_date or '최신'} 날짜의 앱 요약 데이터를 찾을 수 없습니다.")
                 return None
                 
-            with open(summary_files[0], 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
-                
-            # Complete 데이터 로드 (있으면)
-            complete_data = None
-            if complete_files:
-                with open(complete_files[0], 'r', encoding='utf-8') as f:
-                    complete_data = json.load(f)
+            # Complete 데이터 핸들 (있으면) - 접근할 때 섹션 단위로 파싱
+            complete_data, complete_file = self._load_catalog_json(date, 'app', 'complete')
+            
+            # 분/시간 단위 롤업 로드 (있으면) - 원시 스냅샷보다 훨씬 작음
+            rollup_data, rollup_file = self._load_catalog_json(date, 'app', 'rollup')
             
             return {
                 'type': 'app',
-                'date': summary_data.get('date'),
+                'date': summary_data.get('date') or date,
                 'summary': summary_data,
                 'complete': complete_data,
+                'rollup': rollup_data,
                 'source_files': {
-                    'summary': str(summary_files[0]),
-                    'complete': str(complete_files[0]) if complete_files else None
+                    'summary': summary_file,
+                    'complete': complete_file,
+                    'rollup': rollup_file
                 }
             }
             
@@ -147,7 +172,7 @@ class DataIntegrator:
             return None
     
     def integrate_daily_data(self, target_date: str = None) -> Dict:
-        """일일 데이터 통합
+        """일일 데이터 통합 (소스 로드 + 통합 분석)
         
         Args:
             target_date: YYYY-MM-DD 형식. None이면 가장 최신 데이터
@@ -155,6 +180,68 @@ class DataIntegrator:
         Returns:
             통합된 일일 활동 데이터
         """
+        return self.analyze(self.load_sources(target_date))
+    
+    def source_fingerprint(self, target_date: str = None) -> Dict:
+        """통합 입력 파일들의 해시 (카탈로그에 기록된 sha256을 사용하므로 바뀌지 않은 파일은 읽지 않음)
+        
+        제자리에서 다시 쓰인 파일(데몬의 browser_summary 등)을 놓치지 않도록 항목마다 크기/mtime을
+        stat으로 확인하고, 달라진 파일만 다시 해시한다.
+        
+        Returns:
+            {'date': 통합 날짜, 'inputs': {'소스/종류': sha256}}
+        """
+        dates = {}
+        inputs = {}
+        changed = False
+        for source, kinds in (('browser', ('summary', 'complete')), ('app', ('summary', 'complete', 'rollup'))):
+            date = self._resolve_date(source, target_date)
+            if date is None:
+                continue
+            if self.catalog.latest(date, source, 'summary') is None:
+                # 아카이브된 날짜는 그 날의 아카이브 기록 해시를 입력으로 사용
+                # (월간 아카이브 파일 해시는 같은 달의 다른 날이 아카이브될 때마다 바뀜)
+                archived = load_archived_day(self.catalog, date, source)
+                if not archived:
+                    continue
+                dates[source] = date
+                inputs[f"{source}/archive"] = content_hash(archived)
+                continue
+            dates[source] = date
+            for kind in kinds:
+                entry = self.catalog.latest(date, source, kind)
+                verified = self.catalog.verify(source, entry) if entry else None
+                changed = changed or verified != entry
+                inputs[f"{source}/{kind}"] = verified['sha256'] if verified else None
+        
+        if changed:
+            self.catalog.save()
+        
+        integration_date = dates.get('browser') or dates.get('app') or \
+            target_date or datetime.now().strftime('%Y-%m-%d')
+        return {'date': integration_date, 'inputs': inputs}
+    
+    def store_sources(self, sources: Dict) -> str:
+        """분석 전 소스 문서를 객체 저장소에 저장하고 해시 반환 (단계 캐시용)
+        
+        실행 시각은 빼고 저장하므로 소스가 같으면 해시도 같다.
+        """
+        document = self._to_stored_document(sources)
+        document.pop('timestamp', None)
+        return self.objects.put(document)['$object']
+    
+    def load_stored_sources(self, digest: str) -> Dict:
+        """store_sources()로 저장한 소스 문서 복원"""
+        document = self._rehydrate(self.objects.resolve(self.objects.get(digest)))
+        document['timestamp'] = datetime.now().isoformat()
+        return document
+    
+    def load_sources(self, target_date: str = None) -> Dict:
+        """브라우저/앱 소스 로드 (분석 전 통합 문서)
+        
+        Args:
+            target_date: YYYY-MM-DD 형식. None이면 가장 최신 데이터
+        """
         print(f"🔄 일일 데이터 통합 시작...")
         
         # 데이터 로드
@@ -181,9 +268,20 @@ class DataIntegrator:
             'browser_data': browser_data,
             'app_data': app_data
         }
+        return integrated_data
+    
+    def analyze(self, integrated_data: Dict) -> Dict:
+        """소스 문서에 통합 분석 결과를 추가"""
+        browser_data = integrated_data['browser_data']
+        app_data = integrated_data['app_data']
+        integration_date = integrated_data['date']
+        
+        # 타임라인 (방문/앱 포커스 구간/검색어)은 한 번만 만들어서 분석과 시점 조회 색인이 함께 사용
+        visits, intervals, searches = self._build_timeline(browser_data, app_data)
         
         # 통합 분석 수행
-        integrated_data['analysis'] = self._perform_integration_analysis(browser_data, app_data)
+        integrated_data['analysis'] = self._perform_integration_analysis(browser_data, app_data, visits, intervals)
+        integrated_data['timeline_index'] = build_timeline_index(integration_date, intervals, visits, searches)
         
         print(f"✅ 데이터 통합 완료: {integration_date}")
         print(f"   - 브라우저 데이터: {'✓' if browser_data else '✗'}")
@@ -191,21 +289,37 @@ class DataIntegrator:
         
         return integrated_data
     
-    def _perform_integration_analysis(self, browser_data: Optional[Dict], app_data: Optional[Dict]) -> Dict:
-        """브라우저와 앱 데이터의 교차 분석"""
+    def _build_timeline(self, browser_data: Optional[Dict],
+                        app_data: Optional[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """complete 파일에서 시각순 방문, 앱 포커스 구간, 검색어 목록 생성 (필요한 섹션만 파싱)"""
+        visits, intervals, searches = [], [], []
+        try:
+            if browser_data and browser_data['complete']:
+                visits = visits_from_browser_complete(browser_data['complete'])
+                searches = searches_from_browser_complete(browser_data['complete'])
+            if app_data and app_data['complete']:
+                intervals = intervals_from_app_history(app_data['complete'].get('app_history', []))
+        except Exception as e:
+            print(f"⚠️  타임라인 생성 중 오류: {str(e)}")
+        return visits, intervals, searches
+    
+    def _perform_integration_analysis(self, browser_data: Optional[Dict], app_data: Optional[Dict],
+                                      visits: List[Dict], intervals: List[Dict]) -> Dict:
+        """브라우저와 앱 데이터의 교차 분석 (visits/intervals: 시각순 방문과 앱 포커스 구간)"""
         analysis = {
             'activity_overview': {},
             'productivity_insights': {},
             'time_patterns': {},
             'focus_analysis': {},
             'category_breakdown': {},
+            'time_correlation': {},
             'recommendations': []
         }
         
         try:
             # 활동 개요 생성
             total_browser_visits = browser_data['summary']['summary']['total_visits'] if browser_data else 0
-            total_app_sessions = len(app_data['complete']['sessions']) if app_data and app_data['complete'] else 0
+            total_app_sessions = len(app_data['complete'].get('app_history', [])) if app_data and app_data['complete'] else 0
             
             analysis['activity_overview'] = {
                 'total_browser_visits': total_browser_visits,
@@ -242,6 +356,14 @@ class DataIntegrator:
                     'activity_distribution': f"브라우저 활동 피크: {peak_hour}시"
                 }
             
+            # 집중도 분석 - 병합 타임라인 단일 패스
+            if visits or intervals:
+                analysis['focus_analysis'] = analyze_focus(intervals, visits)
+            
+            # 시간 상관 분석 - 방문을 그 시각의 앱 포커스 구간에 연결
+            if visits and intervals:
+                analysis['time_correlation'] = self._correlate_activity(visits, intervals)
+            
             # 추천사항 생성
             analysis['recommendations'] = self._generate_recommendations(browser_data, app_data)
             
@@ -251,6 +373,13 @@ class DataIntegrator:
         
         return analysis
     
+    def _correlate_activity(self, visits: List[Dict], intervals: List[Dict]) -> Dict:
+        """브라우저 방문 ↔ 앱 포커스 구간 스윕 라인 조인 (O(방문 수 + 구간 수))"""
+        result = correlate_visits_with_focus(visits, intervals)
+        result['visit_count'] = len(visits)
+        result['interval_count'] = len(intervals)
+        return result
+    
     def _extract_focus_areas(self, browser_data: Dict, app_data: Dict) -> List[str]:
         """주요 집중 영역 추출"""
         focus_areas = []
@@ -313,9 +442,124 @@ class DataIntegrator:
         
         return recommendations
     
-    def save_integrated_data(self, integrated_data: Dict, output_path: str = None) -> str:
-        """통합 데이터를 JSON 파일로 저장"""
+    def _to_stored_document(self, integrated_data: Dict) -> Dict:
+        """저장용 통합 문서 - 소스 섹션은 객체 저장소 참조로, complete 핸들은 원본 경로 참조로 바꿈
+        
+        시점 조회 색인은 문서에 넣지 않고 날짜별 색인 파일로 따로 저장한다.
+        """
+        document = dict(integrated_data)
+        document.pop('timeline_index', None)
+        for source_key in ('browser_data', 'app_data'):
+            source = integrated_data.get(source_key)
+            if not source:
+                continue
+            stored_source = dict(source)
+            for section in OBJECT_SECTIONS:
+                if stored_source.get(section) is not None:
+                    stored_source[section] = self.objects.put(stored_source[section])
+            if isinstance(stored_source.get('complete'), LazyJsonFile):
+                stored_source['complete'] = self._complete_ref(stored_source['complete'])
+            document[source_key] = stored_source
+        
+        # 실행 시각을 뺀 내용 해시 - 다시 통합해도 내용이 같으면 새 파일을 쓰지 않음
+        document.pop('content_sha256', None)
+        document['content_sha256'] = content_hash({k: v for k, v in document.items() if k != 'timestamp'})
+        return document
+    
+    def _find_identical_integration(self, date: str, digest: str) -> Optional[str]:
+        """같은 날짜의 기존 통합 파일 중 내용 해시가 같은 파일 경로 (최상위 키 하나만 파싱)"""
+        for entry in reversed(self.catalog.files(date, 'integrated', 'integrated')):
+            path = str(self.catalog.path_of('integrated', entry))
+            try:
+                if LazyJsonFile(path).get('content_sha256') == digest:
+                    return path
+            except (OSError, ValueError):
+                continue
+        return None
+    
+    def _complete_ref(self, complete: LazyJsonFile) -> Dict[str, str]:
+        """complete 핸들 → 프로젝트 루트 기준 상대 경로 참조 (프로젝트를 옮겨도 유효)"""
+        path = Path(complete.path)
+        try:
+            return {'$ref': path.relative_to(self.project_root).as_posix()}
+        except ValueError:
+            return complete.to_ref()
+    
+    def _rehydrate(self, document: Dict) -> Dict:
+        """complete 경로 참조({'$ref': path})를 지연 로딩 핸들로 되돌림
+        
+        보존 기간 정리 등으로 원본 파일이 지워졌으면 complete는 None (아카이브된 날짜와 같은 취급).
+        이전 버전이 저장한 절대 경로 참조도 그대로 읽는다.
+        """
+        for source_key in ('browser_data', 'app_data'):
+            source = document.get(source_key)
+            complete = source.get('complete') if source else None
+            if isinstance(complete, dict) and '$ref' in complete:
+                path = self.project_root / complete['$ref']
+                source['complete'] = LazyJsonFile(str(path)) if path.exists() else None
+        return document
+    
+    @staticmethod
+    def load_content_hash(integration_file: str) -> Optional[str]:
+        """통합 파일의 content_sha256 (최상위 키 하나만 파싱)"""
+        return LazyJsonFile(integration_file).get('content_sha256')
+    
+    def latest_integration_file(self, date: str) -> Optional[str]:
+        """해당 날짜의 가장 최근에 쓴 통합 파일 경로 (파일명의 시각은 날짜를 넘나들면 순서가 맞지 않아 mtime 기준)"""
+        entries = self.catalog.files(date, 'integrated', 'integrated')
+        if not entries:
+            return None
+        return str(self.catalog.path_of('integrated', max(entries, key=lambda e: e['mtime'])))
+    
+    def load_integrated_data(self, integration_file: str) -> Dict:
+        """저장된 통합 문서를 로드하고 객체 참조를 실제 페이로드로 복원"""
+        with open(integration_file, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        return self._rehydrate(self.objects.resolve(document))
+    
+    def timeline_index_path(self, date: str) -> Path:
+        """날짜별 시점 조회 색인 파일 경로"""
+        return self.timeline_dir / f"timeline_{date}.json"
+    
+    def save_timeline_index(self, integrated_data: Dict) -> Optional[str]:
+        """통합 데이터의 시점 조회 색인 저장 (내용이 같으면 쓰지 않음, 색인이 없으면 None)"""
+        index = integrated_data.get('timeline_index')
+        if not index:
+            return None
+        path = self.timeline_index_path(integrated_data['date'])
+        TimelineIndex.save(index, path)
+        return str(path)
+    
+    def load_timeline_index(self, date: str) -> TimelineIndex:
+        """날짜별 시점 조회 색인 로드 - 아직 없으면(색인 도입 전 통합 등) 소스로 만들어서 저장"""
+        index = TimelineIndex.load(self.timeline_index_path(date))
+        if index is None:
+            integrated_data = self.analyze(self.load_sources(date))
+            self.save_timeline_index(integrated_data)
+            index = TimelineIndex(integrated_data['timeline_index'])
+        return index
+    
+    def save_integrated_data(self, integrated_data: Dict, output_path: str = None, register: bool = True) -> str:
+        """통합 데이터를 JSON 파일로 저장
+        
+        소스 요약/롤업은 객체 저장소(output/objects)에 한 번만 저장하고 문서에는 해시 참조만 남긴다.
+        출력 경로를 지정하지 않았고 같은 날짜에 내용이 같은 통합 파일이 이미 있으면 쓰지 않고 그 경로를 반환한다.
+        
+        Args:
+            register: False면 카탈로그 등록과 기간 롤업 반영을 하지 않음
+                (병렬 작업자는 부모 프로세스가 한 번에 처리)
+        """
+        document = self._to_stored_document(integrated_data)
+        self.save_timeline_index(integrated_data)
+        
         if output_path is None:
+            existing = self._find_identical_integration(integrated_data['date'], document['content_sha256'])
+            if existing:
+                # 노트 등 후속 출력이 기존 파일과 같아지도록 통합 시각도 기존 값으로 맞춤
+                integrated_data['timestamp'] = LazyJsonFile(existing).get('timestamp', integrated_data.get('timestamp'))
+                print(f"💾 통합 데이터 변경 없음 - 기존 파일 사용: {existing}")
+                return existing
+            
             date_str = integrated_data['date'].replace('-', '')
             timestamp = datetime.now().strftime('%H%M%S')
             filename = f"integrated_data_{date_str}_{timestamp}.json"
@@ -325,19 +569,21 @@ class DataIntegrator:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(integrated_data, f, ensure_ascii=False, indent=2)
+            # complete 핸들은 _to_stored_document에서 원본 파일 경로 참조({'$ref': path})로 바뀜
+            json.dump(document, f, ensure_ascii=False, indent=2, default=json_default)
+        
+        if register:
+            self.catalog.register(str(output_path))
+            self.catalog.save()
+            self.rollups.apply_day(day_contribution(integrated_data))
         
         print(f"💾 통합 데이터 저장됨: {output_path}")
         return str(output_path)
 
-
 if __name__ == "__main__":
-    # 테스트 실행
-    import sys
-    sys.path.append(str(Path(__file__).parent.parent.parent))
-    
-    project_root = "/Users/admin/Documents/GitHub/personal-logging-platform"
-    integrator = DataIntegrator(project_root)
+    # 테스트 실행 - data-aggregator 디렉토리에서 python -m src.integrators.data_integrator
+    project_root = Path(__file__).resolve().parents[3]
+    integrator = DataIntegrator(str(project_root))
     
     # 데이터 통합 실행
     integrated_data = integrator.integrate_daily_data()
@@ -0,0 +1,213 @@
+"""
+지연 로딩 JSON 핸들 - 수집기의 큰 complete 파일을 필요한 섹션만 파싱
+
+파일을 mmap으로 열어 최상위 키의 바이트 범위만 색인하고,
+실제로 키에 접근할 때 그 범위만 json.loads 한다.
+json.dump(indent=N)으로 저장된 파일은 들여쓰기 패턴으로 키 위치를 정규식(C 속도)으로 찾고,
+압축 저장된 파일은 토큰 스캐너로 대체한다.
+"""
+
+import json
+import mmap
+import re
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# 문자열 리터럴 또는 구조 문자 (토큰 스캐너용)
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]', re.S)
+
+
+class LazyJsonFile(Mapping):
+    """최상위가 객체인 JSON 파일에 대한 읽기 전용 지연 로딩 Mapping
+
+    dict처럼 get()/[]/in/keys()를 지원하고, 접근한 최상위 키만 파싱해서 캐시한다.
+    section('raw_data', 'merged_history')처럼 중첩 객체의 하위 키도 상위 값 전체를 파싱하지 않고 읽을 수 있다.
+    json.dump 시에는 to_ref()로 경로 참조만 직렬화한다 (json_default 참고).
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+        self._indent: Optional[int] = None
+        self._cache: Dict[str, Any] = {}
+        self.parsed_bytes = 0  # 실제로 파싱한 바이트 수 (측정용)
+
+    # ---- 색인 ----
+
+    def _open(self):
+        f = open(self.path, 'rb')
+        try:
+            return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 mmap 불가
+            f.close()
+            raise ValueError(f"빈 JSON 파일입니다: {self.path}")
+
+    def _ensure_index(self):
+        if self._index is not None:
+            return
+        f, mm = self._open()
+        try:
+            start = mm.find(b'{')
+            end = mm.rfind(b'}')
+            if start < 0 or end < start:
+                raise ValueError(f"최상위가 JSON 객체가 아닙니다: {self.path}")
+            self._indent = self._detect_indent(mm, start)
+            self._index = self._index_object(mm, start, end, self._indent)
+        finally:
+            mm.close()
+            f.close()
+
+    @staticmethod
+    def _detect_indent(mm, start: int) -> Optional[int]:
+        """첫 키의 들여쓰기 폭 (압축 저장이면 None)"""
+        match = re.compile(rb'\{\n( +)"').match(mm, start)
+        return len(match.group(1)) if match else None
+
+    def _index_object(self, mm, start: int, end: int, indent: Optional[int]) -> Dict[str, Tuple[int, int]]:
+        """mm[start]='{' ~ mm[end]='}' 객체의 키 → 값 바이트 범위"""
+        if indent is not None:
+            positions = []
+            pattern = re.compile(rb'\n' + b' ' * indent + rb'"((?:[^"\\\n]|\\.)*)": ')
+            for match in pattern.finditer(mm, start, end):
+                positions.append((json.loads(b'"' + match.group(1) + b'"'), match.end(), match.start()))
+            index = {}
+            for i, (key, value_start, _) in enumerate(positions):
+                value_end = positions[i + 1][2] if i + 1 < len(positions) else end
+                index[key] = (value_start, value_end)
+            return index
+        return self._scan_object(mm, start, end)
+
+    @staticmethod
+    def _scan_object(mm, start: int, end: int) -> Dict[str, Tuple[int, int]]:
+        """들여쓰기가 없는 JSON용 토큰 스캐너 - 깊이 1의 키와 값 범위만 기록"""
+        index = {}
+        depth = 0
+        key = None
+        expecting_key = True
+        value_start = None
+
+        for match in _TOKEN.finditer(mm, start, end + 1):
+            token = match.group()
+            if token in (b'{', b'['):
+                depth += 1
+            elif token in (b'}', b']'):
+                depth -= 1
+                if depth == 0 and key is not None:
+                    index[key] = (value_start, match.start())
+            elif depth == 1:
+                if token == b',':
+                    if key is not None:
+                        index[key] = (value_start, match.start())
+                    key, expecting_key = None, True
+                elif token == b':':
+                    value_start = match.end()
+                elif expecting_key:
+                    key = json.loads(token)
+                    expecting_key = False
+        return index
+
+    # ---- 값 읽기 ----
+
+    def _parse_range(self, mm, value_start: int, value_end: int) -> Any:
+        raw = mm[value_start:value_end].rstrip().rstrip(b',')
+        self.parsed_bytes += len(raw)
+        return json.loads(raw)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        self._ensure_index()
+        value_start, value_end = self._index[key]
+
+        f, mm = self._open()
+        try:
+            value = self._parse_range(mm, value_start, value_end)
+        finally:
+            mm.close()
+            f.close()
+
+        self._cache[key] = value
+        return value
+
+    def section(self, *keys: str) -> Any:
+        """중첩 객체의 하위 값을 상위 값 전체를 파싱하지 않고 읽기
+
+        예: section('raw_data', 'merged_history')
+        """
+        if not keys:
+            raise KeyError("섹션 키가 필요합니다")
+        if len(keys) == 1 or keys[0] in self._cache:
+            value = self[keys[0]]
+            for key in keys[1:]:
+                value = value[key]
+            return value
+
+        self._ensure_index()
+        value_start, value_end = self._index[keys[0]]
+        f, mm = self._open()
+        try:
+            indent = self._indent
+            for depth, key in enumerate(keys[1:], start=2):
+                start = mm.find(b'{', value_start, value_end)
+                end = mm.rfind(b'}', value_start, value_end)
+                if start < 0:
+                    raise KeyError(key)
+                child_index = self._index_object(mm, start, end, indent * depth if indent else None)
+                value_start, value_end = child_index[key]
+            return self._parse_range(mm, value_start, value_end)
+        finally:
+            mm.close()
+            f.close()
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_index()
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        self._ensure_index()
+        return len(self._index)
+
+    def __bool__(self) -> bool:
+        # 파일이 있으면 참 (빈 객체 여부 때문에 파일을 색인하지 않음)
+        return Path(self.path).exists()
+
+    def __repr__(self) -> str:
+        return f"LazyJsonFile({self.path!r})"
+
+    def to_ref(self) -> Dict[str, str]:
+        """직렬화용 경로 참조"""
+        return {'$ref': self.path}
+
+
+def json_default(obj):
+    """json.dump(default=...)용 - 지연 핸들은 경로 참조로 직렬화"""
+    if isinstance(obj, LazyJsonFile):
+        return obj.to_ref()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if __name__ == "__main__":
+    # 테스트 실행 - 가장 최근 브라우저 complete 파일에서 메타데이터 섹션만 읽기
+    import sys
+    import time
+
+    project_root = Path(__file__).resolve().parents[3]
+    files = sorted((project_root / "browser-collector" / "output").glob("browser_complete_*.json"))
+    path = sys.argv[1] if len(sys.argv) > 1 else (str(files[-1]) if files else None)
+    if path is None:
+        print("⚠️  읽을 complete 파일이 없습니다.")
+        sys.exit(0)
+
+    started = time.perf_counter()
+    handle = LazyJsonFile(path)
+    keys = list(handle.keys())
+    metadata = handle.get('metadata')
+    elapsed = (time.perf_counter() - started) * 1000
+
+    size = Path(path).stat().st_size
+    print(f"📄 {Path(path).name} ({size:,} bytes)")
+    print(f"   • 최상위 키: {', '.join(keys)}")
+    print(f"   • metadata: {metadata}")
+    print(f"   • 파싱한 바이트: {handle.parsed_bytes:,} / {size:,} ({elapsed:.1f}ms)")
@@ -0,0 +1,107 @@
+"""
+내용 주소 객체 저장소 - 통합 문서가 원본 데이터를 복사하지 않고 해시로 참조
+
+페이로드를 정규화된 JSON(공백 없음, 키 순서 유지)으로 직렬화해서 sha256으로 이름을 붙여
+output/objects/<앞 2자리>/<나머지>.json에 한 번만 저장한다.
+같은 내용은 몇 번을 통합해도 디스크에 한 벌만 남는다.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .lazy_json import json_default
+
+OBJECT_REF_KEY = '$object'
+
+
+def canonical_json(payload: Any) -> bytes:
+    """해시 계산용 정규화 직렬화 (같은 내용이면 항상 같은 바이트)
+
+    키를 정렬하지 않는다 - 노트 생성기 등이 딕셔너리 순서대로 출력하므로 저장했다가 읽어도
+    원래 순서가 유지되어야 하고, 수집기는 항상 같은 순서로 키를 쓴다.
+    """
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'),
+                      default=json_default).encode('utf-8')
+
+
+def content_hash(payload: Any) -> str:
+    """페이로드의 sha256 (정규화 직렬화 기준)"""
+    return hashlib.sha256(canonical_json(payload)).hexdigest()
+
+
+def is_object_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and OBJECT_REF_KEY in value
+
+
+def object_refs(value: Any) -> Iterator[str]:
+    """문서 안의 모든 객체 참조 해시 (중첩 깊이 제한 없음)"""
+    if is_object_ref(value):
+        yield value[OBJECT_REF_KEY]
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from object_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from object_refs(item)
+
+
+class ObjectStore:
+    """sha256 → JSON 페이로드 저장소"""
+
+    def __init__(self, objects_dir: str):
+        """
+        Args:
+            objects_dir: 객체 디렉토리 (보통 data-aggregator/output/objects)
+        """
+        self.objects_dir = Path(objects_dir)
+        self.written = 0  # 이번 실행에서 새로 쓴 객체 수
+        self.reused = 0   # 이미 있어서 쓰지 않은 객체 수
+
+    def path_for(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest[2:]}.json"
+
+    def put(self, payload: Any) -> Dict[str, str]:
+        """페이로드 저장 후 참조({'$object': sha256}) 반환. 이미 있으면 쓰지 않음"""
+        data = canonical_json(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+
+        try:
+            # 보존 기간 정리(RetentionJob)가 방금 다시 참조된 객체를 지우지 않도록 mtime 갱신
+            os.utime(path)
+            self.reused += 1
+        except OSError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.written += 1
+
+        return {OBJECT_REF_KEY: digest}
+
+    def digests(self) -> Iterator[str]:
+        """저장된 모든 객체의 해시"""
+        for path in self.objects_dir.glob('??/*.json'):
+            yield path.parent.name + path.stem
+
+    def get(self, digest: str) -> Any:
+        """해시로 페이로드 로드"""
+        with open(self.path_for(digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def resolve(self, value: Any, depth: Optional[int] = 2) -> Any:
+        """문서 안의 객체 참조를 실제 페이로드로 바꾼 사본 반환
+
+        Args:
+            depth: 참조를 찾을 최대 중첩 깊이 (통합 문서는 소스 → 섹션 2단계)
+        """
+        if is_object_ref(value):
+            return self.get(value[OBJECT_REF_KEY])
+        if isinstance(value, dict) and (depth is None or depth > 0):
+            next_depth = None if depth is None else depth - 1
+            return {key: self.resolve(item, next_depth) for key, item in value.items()}
+        return value
@@ -0,0 +1,328 @@
+"""
+데이터 통합기 분석 모듈 테스트
+합성 데이터로 타임라인 변환/상관 분석이 제대로 작동하는지 확인 (수집된 출력 파일 불필요)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# data-aggregator 디렉토리를 파이썬 경로에 추가
+sys.path.append(str(Path(__file__).parent))
+
+from src.analyzers.focus_analyzer import analyze_focus, is_browser_app
+from src.analyzers.period_rollup import PeriodRollupStore, period_keys
+from src.analyzers.timeline_index import TimelineIndex, build_timeline_index, searches_from_browser_complete
+from src.analyzers.time_correlation import (
+    correlate_visits_with_focus, intervals_from_app_history, visits_from_browser_complete
+)
+
+
+@contextmanager
+def local_timezone(name: str):
+    """테스트 동안만 로컬 시간대 변경 (TZ 환경 변수 + time.tzset)"""
+    previous = os.environ.get('TZ')
+    os.environ['TZ'] = name
+    time.tzset()
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = previous
+        time.tzset()
+
+
+def test_visit_times_are_utc():
+    """시간 상관 분석 테스트 - UTC 방문 시각이 로컬 시각 앱 구간에 연결되는지 (KST)"""
+    print("🧪 방문 시각 시간대 테스트 시작...")
+
+    try:
+        with local_timezone('Asia/Seoul'):
+            # 앱 히스토리는 로컬(KST) 시각, 브라우저 방문은 UTC 기준 naive 시각 - 같은 순간
+            app_history = [{'app_name': 'Google Chrome', 'category': 'browser',
+                            'timestamp': '2025-08-17T10:00:00', 'end_timestamp': '2025-08-17T10:30:00'}]
+            complete = {'category_analysis': {'categories': {'developer': [
+                {'visit_time': '2025-08-17T01:10:00.123456', 'domain': 'github.com', 'browser': 'chrome'},
+                {'visit_time': '2025-08-17T01:20:00', 'domain': 'github.com', 'browser': 'chrome'}
+            ]}}}
+
+            visits = visits_from_browser_complete(complete)
+            result = correlate_visits_with_focus(visits, intervals_from_app_history(app_history))
+            assert result['foreground_visits'] == 2, result
+            assert result['unattributed_visits'] == 0, result
+            assert result['by_app']['Google Chrome']['categories'] == {'developer': 2}
+
+        print("   ✅ 01:10 UTC 방문이 10:00~10:30 KST Chrome 구간에 연결됨")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 방문 시각 시간대 테스트 실패: {e}")
+        return False
+
+
+def test_focus_on_merged_timeline():
+    """집중도 분석 테스트 - 수집기 형식의 complete/앱 히스토리를 변환해서 합친 타임라인 (KST)"""
+    print("\n🧪 합친 타임라인 집중도 분석 테스트 시작...")
+
+    try:
+        with local_timezone('Asia/Seoul'):
+            app_history = [
+                {'app_name': 'Google Chrome', 'category': 'browser',
+                 'timestamp': '2025-08-17T09:00:00', 'end_timestamp': '2025-08-17T09:40:00'},
+                {'app_name': 'Code', 'category': 'developer',
+                 'timestamp': '2025-08-17T09:40:00', 'end_timestamp': '2025-08-17T10:40:00'},
+                # 종료 시각이 없는 과거 5분 추정 기록 - Code 구간 안에서 시작해서 먼저 끝남
+                {'app_name': 'Slack', 'category': 'communication',
+                 'timestamp': '2025-08-17T10:00:00', 'duration_minutes': 5},
+            ]
+            complete = {'category_analysis': {'categories': {
+                'developer': [{'visit_time': f'2025-08-17T00:{m:02d}:00', 'domain': 'github.com'}
+                              for m in (5, 15, 25)],
+                # Code가 앞에 있을 때의 방문 (백그라운드) - 컨텍스트를 바꾸지 않음
+                'entertainment': [{'visit_time': '2025-08-17T00:50:00', 'domain': 'youtube.com'}]
+            }}}
+
+            result = analyze_focus(intervals_from_app_history(app_history), visits_from_browser_complete(complete))
+
+        longest = result['longest_deep_work']
+        assert longest['start'] == '2025-08-17T09:05:00' and longest['end'] == '2025-08-17T10:00:00', longest
+        assert longest['main_context'] == 'github.com', longest
+        # Slack 이후 Code 구간의 남은 35분이 두 번째 세션
+        assert result['focus_sessions'] == 2 and result['deep_work_blocks'] == 2, result
+        assert result['total_focus_minutes'] == 90.0, result
+        assert result['context_switches_per_hour'] == {'9': 2, '10': 2}, result
+
+        print(f"   ✅ 세션 {result['focus_sessions']}개, 총 {result['total_focus_minutes']}분 "
+              f"(가장 긴 세션 {longest['start'][11:16]}~{longest['end'][11:16]})")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 합친 타임라인 집중도 분석 테스트 실패: {e}")
+        return False
+
+
+def test_timeline_index_overlaps():
+    """시점 조회 색인 테스트 - 겹친 앱 구간과 UTC 방문/검색 시각 (KST)"""
+    print("\n🧪 시점 조회 색인 테스트 시작...")
+
+    try:
+        with local_timezone('Asia/Seoul'):
+            app_history = [
+                {'app_name': 'Code', 'category': 'developer',
+                 'timestamp': '2025-08-17T09:00:00', 'end_timestamp': '2025-08-17T10:00:00'},
+                {'app_name': 'Slack', 'category': 'communication', 'timestamp': '2025-08-17T09:10:00',
+                 'duration_minutes': 5},
+                {'app_name': 'Terminal', 'category': 'developer',
+                 'timestamp': '2025-08-17T09:20:00', 'end_timestamp': '2025-08-17T09:25:00'},
+            ]
+            complete = {
+                'category_analysis': {'categories': {'developer': [
+                    {'visit_time': '2025-08-17T00:21:00', 'domain': 'github.com', 'title': 'PR'}
+                ]}},
+                'search_analysis': {'queries': [
+                    {'visit_time': '2025-08-17T00:22:00', 'query': 'bisect', 'engine': 'google'}
+                ]}
+            }
+            index = TimelineIndex(build_timeline_index(
+                '2025-08-17', intervals_from_app_history(app_history),
+                visits_from_browser_complete(complete), searches_from_browser_complete(complete)
+            ))
+
+            # 먼저 시작한 긴 구간이 뒤 구간들보다 늦게 끝나도 찾아야 함
+            assert index.active_app('2025-08-17T09:12:00')['app_name'] == 'Slack'
+            assert index.active_app('2025-08-17T09:17:00')['app_name'] == 'Code'
+            assert index.active_app('2025-08-17T09:22:00')['app_name'] == 'Terminal'
+            assert index.active_app('2025-08-17T09:40:00')['app_name'] == 'Code'
+            assert index.active_app('2025-08-17T10:30:00') is None
+
+            moment = index.at('2025-08-17T09:22:00', window_minutes=2)
+            assert moment['last_visit']['time'] == '2025-08-17T09:21:00', moment
+            assert [search['query'] for search in moment['searches']] == ['bisect'], moment
+
+        print("   ✅ 겹친 구간 조회 + UTC 방문/검색 시각 변환 확인")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 시점 조회 색인 테스트 실패: {e}")
+        return False
+
+
+def _contribution(date: str, domains: dict, score: float) -> dict:
+    return {
+        'date': date,
+        'browser_visits': sum(domains.values()),
+        'search_count': 0,
+        'category_counts': {'developer': sum(domains.values())},
+        'domain_counts': domains,
+        'app_minutes': {},
+        'app_category_minutes': {},
+        'productivity_score': score
+    }
+
+
+def test_period_rollup_replace_day():
+    """기간 롤업 테스트 - 같은 날짜를 다시 반영하면 이전 기여분을 빼고 교체"""
+    print("\n🧪 기간 롤업 테스트 시작...")
+
+    try:
+        store = PeriodRollupStore(tempfile.mkdtemp())
+        store.apply_day(_contribution('2025-08-18', {'github.com': 5, 'x.com': 2}, 80))
+        store.apply_day(_contribution('2025-08-19', {'github.com': 2}, 60))
+        store.apply_day(_contribution('2025-08-18', {'github.com': 1}, 70))
+
+        row = store.get('weekly', period_keys('2025-08-18')['weekly'])
+        totals = row['totals']
+        assert row['day_count'] == 2, row
+        assert totals['domain_counts'] == {'github.com': 3}, totals  # 0이 된 x.com은 빠짐
+        assert totals['browser_visits'] == 3, totals
+        assert totals['productivity_days'] == 2 and row['productivity_score'] == 65.0, row
+        assert store.get('monthly', '2025-08')['totals'] == totals
+
+        print("   ✅ 2025-08-18 재반영: 주간/월간 합계가 교체된 기여분 기준")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 기간 롤업 테스트 실패: {e}")
+        return False
+
+
+def _at(minutes: float) -> float:
+    """2025-08-17 10:00 (로컬) 기준 분 → epoch 초"""
+    return (datetime(2025, 8, 17, 10, 0) + timedelta(minutes=minutes)).timestamp()
+
+
+def test_correlation_unsorted_overlapping():
+    """시간 상관 분석 테스트 - 정렬되지 않은 입력과 겹친 구간"""
+    print("\n🧪 시간 상관 분석 (비정렬/겹침) 테스트 시작...")
+
+    try:
+        # 시작 시각순이 아니고, Chrome 구간이 Code 구간 안에 있음
+        intervals = [
+            {'start': _at(10), 'end': _at(20), 'app_name': 'Google Chrome', 'category': 'browser'},
+            {'start': _at(0), 'end': _at(60), 'app_name': 'Code', 'category': 'developer'},
+        ]
+        visits = [
+            {'time': _at(30), 'domain': 'docs.python.org', 'category': 'education'},
+            {'time': _at(15), 'domain': 'github.com', 'category': 'developer'},
+            {'time': _at(-60), 'domain': 'news.ycombinator.com', 'category': 'news'},
+        ]
+
+        result = correlate_visits_with_focus(visits, intervals)
+        assert result['by_app']['Google Chrome']['categories'] == {'developer': 1}, result
+        assert result['by_app']['Code']['categories'] == {'education': 1}, result
+        assert (result['foreground_visits'], result['background_visits'], result['unattributed_visits']) == (1, 1, 1)
+        # 다음 방문(15분 뒤)까지가 아니라 5분 상한과 Chrome 구간 끝에서 잘림
+        assert result['browser_category_seconds'] == {'developer': 300.0}, result
+
+        print("   ✅ 겹친 구간에서는 나중에 시작한 구간에 연결, 비정렬 입력도 정렬해서 처리")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 시간 상관 분석 (비정렬/겹침) 테스트 실패: {e}")
+        return False
+
+
+def test_browser_detection():
+    """브라우저 판별 테스트 - 번들 ID와 앱 이름 단어 단위 비교 (부분 문자열 오탐 없음)"""
+    print("\n🧪 브라우저 판별 테스트 시작...")
+
+    try:
+        browsers = [
+            {'app_name': 'Arc'},
+            {'app_name': 'Microsoft Edge'},
+            {'app_name': 'Google Chrome Canary'},
+            {'app_name': 'Browser', 'bundle_id': 'company.thebrowser.Browser'},
+            {'app_name': 'Whatever', 'category': 'browser'},
+        ]
+        others = [
+            {'app_name': 'Searchlight'},
+            {'app_name': 'Knowledge Base'},
+            {'app_name': 'Archive Utility', 'bundle_id': 'com.apple.archiveutility'},
+            {'app_name': 'Code', 'bundle_id': 'com.microsoft.VSCode', 'category': 'developer'},
+        ]
+        assert all(is_browser_app(app) for app in browsers), [a for a in browsers if not is_browser_app(a)]
+        assert not any(is_browser_app(app) for app in others), [a for a in others if is_browser_app(a)]
+
+        print(f"   ✅ 브라우저 {len(browsers)}개 판별, 비슷한 이름의 앱 {len(others)}개 제외")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 브라우저 판별 테스트 실패: {e}")
+        return False
+
+
+def test_focus_unsorted_overlapping():
+    """집중도 분석 테스트 - 정렬되지 않은 입력과 다른 구간 안의 짧은 구간"""
+    print("\n🧪 집중도 분석 (비정렬/겹침) 테스트 시작...")
+
+    try:
+        intervals = [
+            {'start': _at(10), 'end': _at(12), 'app_name': 'Slack', 'category': 'communication'},
+            {'start': _at(0), 'end': _at(40), 'app_name': 'Code', 'category': 'developer'},
+        ]
+        visits = [
+            {'time': _at(30), 'domain': 'youtube.com', 'category': 'entertainment'},  # Code가 앞 - 무시
+            {'time': _at(20), 'domain': 'github.com', 'category': 'developer'},
+        ]
+
+        result = analyze_focus(intervals, visits)
+        # 2분 이탈은 grace(120초) 안이라 Code 40분이 세션 하나로 이어짐
+        assert result['focus_sessions'] == 1 and result['deep_work_blocks'] == 1, result
+        assert result['top_sessions'][0]['minutes'] == 40.0, result
+        assert result['productive_minutes'] == 38.0, result
+        assert result['context_switches'] == 2, result
+
+        print(f"   ✅ 세션 {result['top_sessions'][0]['minutes']}분, 전환 {result['context_switches']}회")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 집중도 분석 (비정렬/겹침) 테스트 실패: {e}")
+        return False
+
+
+def main():
+    """메인 테스트 실행"""
+    print("🚀 Data Aggregator 분석 모듈 테스트 시작")
+    print("=" * 40)
+
+    tests = [
+        ("방문 시각 시간대", test_visit_times_are_utc),
+        ("합친 타임라인 집중도 분석", test_focus_on_merged_timeline),
+        ("시점 조회 색인", test_timeline_index_overlaps),
+        ("기간 롤업", test_period_rollup_replace_day),
+        ("시간 상관 분석 (비정렬/겹침)", test_correlation_unsorted_overlapping),
+        ("브라우저 판별", test_browser_detection),
+        ("집중도 분석 (비정렬/겹침)", test_focus_unsorted_overlapping)
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+            else:
+                print(f"❌ {test_name} 테스트 실패")
+        except Exception as e:
+            print(f"❌ {test_name} 테스트 중 예외 발생: {e}")
+
+    print("\n" + "=" * 40)
+    print(f"🏁 테스트 결과: {passed}/{total} 통과")
+
+    if passed == total:
+        print("✅ 모든 테스트 통과!")
+    else:
+        print("⚠️ 일부 테스트 실패.")
+
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
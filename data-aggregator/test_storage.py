@@ -0,0 +1,365 @@
+"""
+데이터 통합기 저장/카탈로그 모듈 테스트
+임시 디렉토리에 합성 출력 파일을 만들어 확인 (실제 프로젝트 출력은 건드리지 않음)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# data-aggregator 디렉토리를 파이썬 경로에 추가
+sys.path.append(str(Path(__file__).parent))
+
+from src.analyzers.period_rollup import PERIOD_KINDS, period_keys
+from src.catalog import OutputCatalog, RetentionJob, StageCache
+from src.catalog.retention import load_archived_day
+from src.integrators.data_integrator import DataIntegrator
+from src.integrators.lazy_json import LazyJsonFile
+from src.integrators.object_store import ObjectStore
+
+
+def _write_json(path: Path, data, **options) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, **options)
+    return path
+
+
+def test_lazy_json_file():
+    """지연 로딩 JSON 테스트 - 들여쓰기/압축 저장 파일 색인과 중첩 섹션 읽기"""
+    print("🧪 지연 로딩 JSON 테스트 시작...")
+
+    try:
+        document = {
+            'metadata': {'total_records': 2, 'note': '중괄호 } 와 "따옴표", 쉼표가 든 문자열'},
+            'raw_data': {
+                'history_by_browser': {'chrome': [{'url': 'https://a.com/?q={x}', 'title': '[a], {b}'}]},
+                'merged_history': [{'url': 'https://b.com', 'visit_time': '2025-08-17T01:00:00'}]
+            },
+            'search_analysis': {'queries': []},
+            'last': [1, {'k': 'v'}]
+        }
+        directory = Path(tempfile.mkdtemp())
+        files = {
+            'indent': _write_json(directory / 'indent.json', document, indent=2),
+            'compact': _write_json(directory / 'compact.json', document, separators=(',', ':'))
+        }
+
+        for name, path in files.items():
+            lazy = LazyJsonFile(str(path))
+            assert list(lazy) == list(document), (name, list(lazy))
+            assert lazy['metadata'] == document['metadata'], name
+            # 접근한 키만 파싱
+            assert lazy.parsed_bytes < path.stat().st_size / 2, (name, lazy.parsed_bytes)
+
+            assert lazy.section('raw_data', 'merged_history') == document['raw_data']['merged_history'], name
+            assert lazy.section('raw_data', 'history_by_browser', 'chrome') == \
+                document['raw_data']['history_by_browser']['chrome'], name
+            assert 'raw_data' not in lazy._cache, name  # 섹션 읽기는 상위 값 전체를 캐시하지 않음
+            assert lazy['last'] == document['last'] and lazy.get('missing') is None, name
+            print(f"   ✅ {name}: 키 {len(lazy)}개, 파싱 {lazy.parsed_bytes}/{path.stat().st_size}바이트")
+
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 지연 로딩 JSON 테스트 실패: {e}")
+        return False
+
+
+def _integrated(date: str, score: int) -> dict:
+    return {
+        'date': date,
+        'timestamp': f"{date}T12:00:00",
+        'browser_data': None,
+        'app_data': None,
+        'analysis': {'productivity_insights': {'productivity_score': score}, 'recommendations': []}
+    }
+
+
+def test_identical_integration_skip():
+    """통합 파일 저장 테스트 - 내용이 같으면 새 파일을 쓰지 않고 기존 파일 사용"""
+    print("\n🧪 통합 파일 중복 저장 건너뛰기 테스트 시작...")
+
+    try:
+        root = Path(tempfile.mkdtemp())
+        output_dir = root / "data-aggregator" / "output"
+        integrator = DataIntegrator(str(root))
+
+        first = integrator.save_integrated_data(_integrated('2025-08-17', 80))
+        # 통합 시각만 다른 같은 내용
+        again = _integrated('2025-08-17', 80)
+        again['timestamp'] = '2025-08-17T18:00:00'
+        assert integrator.save_integrated_data(again) == first
+        assert again['timestamp'] == '2025-08-17T12:00:00', again['timestamp']
+        assert len(list(output_dir.glob('integrated_data_*.json'))) == 1
+
+        # 파일명의 시각(초)이 겹치지 않게 기다린 뒤 내용이 다른 통합
+        time.sleep(1.1)
+        changed = integrator.save_integrated_data(_integrated('2025-08-17', 60))
+        assert changed != first and len(list(output_dir.glob('integrated_data_*.json'))) == 2
+        assert integrator._find_identical_integration('2025-08-17', 'no-such-digest') is None
+
+        print("   ✅ 같은 내용은 기존 파일 재사용, 다른 내용만 새 파일")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 통합 파일 중복 저장 건너뛰기 테스트 실패: {e}")
+        return False
+
+
+def test_stage_cache():
+    """단계 캐시 테스트 - 적중/미스/강제 실행과 출력 파일 변경 감지"""
+    print("\n🧪 단계 캐시 테스트 시작...")
+
+    try:
+        directory = Path(tempfile.mkdtemp())
+        code = directory / "render.py"
+        code.write_text("VERSION = 1\n")
+        cache_path = str(directory / "stage_cache.json")
+        note = directory / "note.md"
+
+        cache = StageCache(cache_path, stage_code={'render': [code]})
+        key = cache.key('render', content='abc')
+        assert cache.lookup('render', '2025-08-17', key) is None and cache.results['render'] == 'miss'
+        note.write_text("# 노트\n")
+        cache.store('render', '2025-08-17', key, {'daily_note': str(note)},
+                    files={'daily_note': str(note)}, hash_files=True)
+        cache.save()
+
+        # 다시 열어도 같은 키면 적중
+        cache = StageCache(cache_path, stage_code={'render': [code]})
+        hit = cache.lookup('render', '2025-08-17', key)
+        assert hit and hit['outputs']['daily_note'] == str(note) and cache.results['render'] == 'hit'
+        assert cache.lookup('render', '2025-08-17', key, force=True) is None and cache.results['render'] == 'forced'
+        assert cache.lookup('render', '2025-08-17', cache.key('render', content='xyz')) is None
+
+        # 출력 파일이 수정되면 미스
+        note.write_text("# 손으로 고친 노트\n")
+        assert cache.lookup('render', '2025-08-17', key) is None and cache.results['render'] == 'miss'
+
+        # 단계 코드가 바뀌면 키가 달라짐
+        code.write_text("VERSION = 2\n")
+        assert StageCache(cache_path, stage_code={'render': [code]}).key('render', content='abc') != key
+
+        print("   ✅ 적중/미스/강제 실행, 출력 수정·코드 변경 시 무효화")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 단계 캐시 테스트 실패: {e}")
+        return False
+
+
+def test_retention_job():
+    """보존 기간 정리 테스트 - 월간 아카이브, 원본 삭제, 카탈로그 갱신, 참조가 끊긴 객체 정리"""
+    print("\n🧪 보존 기간 정리 테스트 시작...")
+
+    try:
+        root = Path(tempfile.mkdtemp())
+        browser_dir = root / "browser-collector" / "output"
+        output_dir = root / "data-aggregator" / "output"
+
+        visits = [
+            {'browser': 'chrome', 'url': 'https://github.com/a', 'visit_time': '2025-01-01T01:00:00',
+             'domain': 'github.com'},
+            {'browser': 'chrome', 'url': 'https://x.com/b', 'visit_time': '2025-01-01T02:30:00', 'domain': 'x.com'},
+        ]
+        old_files = [
+            _write_json(browser_dir / "browser_summary_20250101.json",
+                        {'date': '2025-01-01', 'summary': {'total_visits': 2, 'search_count': 0}}),
+            _write_json(browser_dir / "browser_complete_20250101_120000.json", {
+                'metadata': {'total_records': 2},
+                'raw_data': {'merged_history': visits},
+                'search_analysis': {'queries': []},
+                'category_analysis': {'categories': {'developer': visits[:1], 'social': visits[1:]}}
+            }),
+        ]
+        recent = _write_json(browser_dir / "browser_summary_20250120.json",
+                             {'date': '2025-01-20', 'summary': {'total_visits': 0, 'search_count': 0}})
+
+        # 오래된 통합 문서가 참조하는 객체, 최근 단계 캐시가 참조하는 객체, 아무도 참조하지 않는 객체
+        objects = ObjectStore(str(output_dir / "objects"))
+        old_ref = objects.put({'summary': 'old'})
+        recent_sources = objects.put({'browser_data': {'summary': objects.put({'summary': 'recent'})}})
+        orphan = objects.put({'summary': 'orphan'})
+        stale = time.time() - 2 * 3600
+        for path in (output_dir / "objects").glob('*/*.json'):
+            os.utime(path, (stale, stale))
+        old_files.append(_write_json(output_dir / "integrated_data_20250101_130000.json", {
+            'date': '2025-01-01', 'timestamp': '2025-01-01T13:00:00', 'content_sha256': 'x',
+            'data_sources': {}, 'analysis': {}, 'browser_data': {'summary': old_ref}
+        }))
+
+        cache = StageCache(str(output_dir / "catalog" / "stage_cache.json"))
+        cache.store('analyze', '2025-01-01', 'k1', {}, files={'integration_file': str(old_files[-1])})
+        cache.store('integrate', '2025-01-20', 'k2', {'sources': recent_sources['$object']})
+        cache.save()
+
+        report = RetentionJob(str(root), keep_days=10).run(today='2025-01-25')
+        assert report['cutoff'] == '2025-01-16' and report['days'] == 1, report
+        assert not any(path.exists() for path in old_files) and recent.exists()
+
+        # 카탈로그: 일일 파일 항목 대신 월간 아카이브 항목
+        catalog = OutputCatalog(str(root))
+        assert catalog.latest('2025-01-01', 'browser', 'summary') is None
+        assert catalog.latest('2025-01-20', 'browser', 'summary') is not None
+        assert catalog.archive_for('2025-01-01', 'browser') is not None
+        archived = load_archived_day(catalog, '2025-01-01', 'browser')
+        assert archived['summary']['summary']['total_visits'] == 2
+        assert archived['aggregates']['domains'] == {'github.com': 1, 'x.com': 1}, archived['aggregates']
+        assert archived['aggregates']['categories'] == {'developer': 1, 'social': 1}
+        assert load_archived_day(catalog, '2025-01-01', 'integrated') is not None
+
+        # 마크 앤 스윕: 최근 단계 캐시가 (객체 안의 참조까지) 닿는 객체만 남음
+        remaining = set(objects.digests())
+        assert old_ref['$object'] not in remaining and orphan['$object'] not in remaining, remaining
+        assert recent_sources['$object'] in remaining and len(remaining) == 2, remaining
+        assert list(StageCache(str(output_dir / "catalog" / "stage_cache.json")).entries) == ['integrate:2025-01-20']
+        assert report['swept']['objects'] == 2 and report['swept']['cache_entries'] == 1, report['swept']
+
+        print(f"   ✅ 1일 아카이브, 파일 {report['removed_files']}개 삭제, 객체 {report['swept']['objects']}개 정리")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 보존 기간 정리 테스트 실패: {e}")
+        return False
+
+
+def _browser_day(browser_dir: Path, date: str, visits: list) -> None:
+    """하루치 합성 browser_summary/complete 파일 (요약 highlights는 수집기처럼 상위 항목만)"""
+    domains, categories = {}, {}
+    for visit in visits:
+        domains[visit['domain']] = domains.get(visit['domain'], 0) + 1
+        categories[visit['category']] = categories.get(visit['category'], 0) + 1
+    compact = date.replace('-', '')
+    _write_json(browser_dir / f"browser_summary_{compact}.json", {
+        'date': date,
+        'summary': {'total_visits': len(visits), 'unique_domains': len(domains), 'browsers_used': ['chrome'],
+                    'search_count': 0, 'category_count': len(categories)},
+        'highlights': {'top_domains': sorted(domains.items(), key=lambda x: -x[1])[:1], 'top_searches': [],
+                       'top_categories': sorted(categories.items(), key=lambda x: -x[1])[:1], 'peak_hour': 1},
+        'insights': []
+    })
+    records = [{'browser': 'chrome', 'url': f"https://{v['domain']}/{i}", 'title': v['domain'],
+                'visit_time': f"{date}T01:{i:02d}:00", 'domain': v['domain']} for i, v in enumerate(visits)]
+    by_category = {}
+    for record, visit in zip(records, visits):
+        by_category.setdefault(visit['category'], []).append(record)
+    _write_json(browser_dir / f"browser_complete_{compact}_120000.json", {
+        'metadata': {'total_records': len(records)},
+        'raw_data': {'history_by_browser': {'chrome': records}, 'merged_history': records},
+        'search_analysis': {'queries': []},
+        'category_analysis': {'categories': by_category}
+    })
+
+
+def test_archived_day_rollup():
+    """아카이브된 날짜 재통합 테스트 - 주간/월간 롤업이 아카이브 전과 같은지"""
+    print("\n🧪 아카이브된 날짜 재통합 테스트 시작...")
+
+    try:
+        root = Path(tempfile.mkdtemp())
+        browser_dir = root / "browser-collector" / "output"
+        _browser_day(browser_dir, '2025-01-06', [
+            {'domain': 'github.com', 'category': 'developer'},
+            {'domain': 'github.com', 'category': 'developer'},
+            {'domain': 'docs.python.org', 'category': 'education'},
+            {'domain': 'x.com', 'category': 'social'},
+        ])
+        keys = period_keys('2025-01-06')
+
+        integrator = DataIntegrator(str(root))
+        integrator.save_integrated_data(integrator.integrate_daily_data('2025-01-06'))
+        before = {kind: integrator.rollups.get(kind, keys[kind])['totals'] for kind in PERIOD_KINDS}
+        assert before['weekly']['domain_counts'] == {'github.com': 2, 'docs.python.org': 1, 'x.com': 1}, before
+
+        RetentionJob(str(root), keep_days=10).run(today='2025-01-31')
+        assert not list(browser_dir.glob('browser_complete_*.json'))
+
+        # 아카이브된 날짜를 다시 통합 (main.py --date 2025-01-06)
+        integrator = DataIntegrator(str(root))
+        integrated = integrator.integrate_daily_data('2025-01-06')
+        assert integrated['browser_data']['complete'] is None and integrated['browser_data']['aggregates']
+        integrator.save_integrated_data(integrated)
+        after = {kind: integrator.rollups.get(kind, keys[kind])['totals'] for kind in PERIOD_KINDS}
+        assert after == before, (before, after)
+
+        print(f"   ✅ 재통합 후에도 주간/월간 도메인 {len(after['weekly']['domain_counts'])}개 합계 유지")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 아카이브된 날짜 재통합 테스트 실패: {e}")
+        return False
+
+
+def test_archived_day_fingerprint():
+    """아카이브된 날짜의 입력 해시 테스트 - 같은 달의 다른 날이 아카이브돼도 그대로인지"""
+    print("\n🧪 아카이브된 날짜 입력 해시 테스트 시작...")
+
+    try:
+        root = Path(tempfile.mkdtemp())
+        browser_dir = root / "browser-collector" / "output"
+        _browser_day(browser_dir, '2025-01-06', [{'domain': 'github.com', 'category': 'developer'}])
+        RetentionJob(str(root), keep_days=10).run(today='2025-01-31')
+        catalog = OutputCatalog(str(root))
+        archive_sha = catalog.archive_for('2025-01-06', 'browser')['sha256']
+        before = DataIntegrator(str(root)).source_fingerprint('2025-01-06')
+        assert list(before['inputs']) == ['browser/archive'], before
+
+        # 같은 달의 다른 날이 월간 아카이브에 추가됨
+        _browser_day(browser_dir, '2025-01-07', [{'domain': 'x.com', 'category': 'social'}])
+        RetentionJob(str(root), keep_days=10).run(today='2025-02-01')
+        catalog = OutputCatalog(str(root))
+        assert catalog.archive_for('2025-01-06', 'browser')['sha256'] != archive_sha
+        assert DataIntegrator(str(root)).source_fingerprint('2025-01-06') == before
+        assert DataIntegrator(str(root)).source_fingerprint('2025-01-07') != before
+
+        print("   ✅ 월간 아카이브가 바뀌어도 그 날의 기록이 같으면 입력 해시 유지")
+        return True
+
+    except Exception as e:
+        print(f"   ❌ 아카이브된 날짜 입력 해시 테스트 실패: {e}")
+        return False
+
+
+def main():
+    """메인 테스트 실행"""
+    print("🚀 Data Aggregator 저장/카탈로그 테스트 시작")
+    print("=" * 40)
+
+    tests = [
+        ("지연 로딩 JSON", test_lazy_json_file),
+        ("통합 파일 중복 저장 건너뛰기", test_identical_integration_skip),
+        ("단계 캐시", test_stage_cache),
+        ("보존 기간 정리", test_retention_job),
+        ("아카이브된 날짜 재통합", test_archived_day_rollup),
+        ("아카이브된 날짜 입력 해시", test_archived_day_fingerprint)
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        try:
+            if test_func():
+                passed += 1
+            else:
+                print(f"❌ {test_name} 테스트 실패")
+        except Exception as e:
+            print(f"❌ {test_name} 테스트 중 예외 발생: {e}")
+
+    print("\n" + "=" * 40)
+    print(f"🏁 테스트 결과: {passed}/{total} 통과")
+
+    if passed == total:
+        print("✅ 모든 테스트 통과!")
+    else:
+        print("⚠️ 일부 테스트 실패.")
+
+    return passed == total
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)